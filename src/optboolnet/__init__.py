@@ -1,4 +1,34 @@
 import os
 
 DIR_PATH = os.path.dirname(__file__)
-from optboolnet.boolnet import *
+
+# The names of optboolnet.boolnet are loaded on first access,
+# so that importing optboolnet (e.g., optboolnet.config) does not import colomoto and boolean.py.
+# The solver layer (optboolnet.model and optboolnet.algorithm) imports pyomo when it is imported.
+_BOOLNET_NAMES = [
+    "Attractor",
+    "CNFBooleanNetwork",
+    "Control",
+    "ControlConfig",
+    "Hypercube",
+    "ORClause",
+    "PermanentPerturbation",
+    "contains_and",
+    "iter_bnet_lines",
+    "parse_cnf_formula",
+]
+__all__ = list(_BOOLNET_NAMES)
+
+
+def __getattr__(name: str):
+    if name in _BOOLNET_NAMES:
+        from optboolnet import boolnet
+
+        value = getattr(boolnet, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'optboolnet' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()).union(_BOOLNET_NAMES))
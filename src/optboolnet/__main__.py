@@ -0,0 +1,4 @@
+import sys
+from optboolnet.cli import main
+
+sys.exit(main())
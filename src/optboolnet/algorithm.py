@@ -1,7 +1,10 @@
+import asyncio
 import time
-from typing import Dict, List, Callable, Optional
+from collections import Counter
+from typing import AsyncIterator, Dict, Hashable, Iterator, List, Callable, Optional, Tuple, Union
 from optboolnet import CNFBooleanNetwork, Control
 from optboolnet.boolnet import Attractor
+from optboolnet.budget import ThreadBudgetScheduler, TimeBudget
 from optboolnet.exception import InvalidConfigError
 from optboolnet.model import (
     Model,
@@ -9,11 +12,20 @@ from optboolnet.model import (
     AttractorDetectionIP,
     ExtendedAttractorDetectionIP,
     MasterControlIP,
+    ReducedAttractorDetectionIP,
     TrapSpaceDetectionIP,
 )
 from optboolnet.config import LoggingConfig, SolverConfig
 from algorecell_types import ReprogrammingStrategies, FromCondition
-from optboolnet.log import EnumBendersStep, BendersLogger
+from optboolnet.log import EnumBendersStep, EnumCutType, BendersLogger, make_logger
+from optboolnet.sink import ResultSink, make_control_record
+from optboolnet.profiling import PhaseProfiler
+from optboolnet.sat import SATAttractorDetection
+from optboolnet.schedule import LENGTH_SCHEDULES, AdaptiveLengthScheduler, schedule_lengths
+from optboolnet.template import _MODEL_CACHE, ModelTemplateCache
+
+
+LLP_ENGINES = ["mip", "sat"]
 
 
 class AttractorControl:
@@ -35,7 +47,34 @@ class AttractorControl:
         self.allow_empty_attractor: bool = True
         """If true, a no good cut removes the controls that induces no attractor
         Otherwise, an Exception is raised"""
-        self.logger = BendersLogger(logging_config)
+        self.logger = make_logger(logging_config)
+        self.logger.bind(self)
+        self.result_sink: Optional[ResultSink] = self.logger.make_result_sink()
+        """The streaming sink that receives every control as soon as it is found.
+        It is closed when a search finishes and reopened by the next search of the object"""
+        self.cut_count: Dict[EnumCutType, int] = Counter()
+        """(key) cut type (value) the number of cuts generated so far"""
+        self.profile: bool = False
+        """If true, the time of each phase and the solver statistics of each model are recorded"""
+        self.external_profiler: str = ""
+        """'cprofile' or 'pyinstrument' to profile the whole search"""
+        self.profiler = PhaseProfiler()
+        self.is_cancelled: bool = False
+        """If true, the search stops as soon as possible (see cancel)"""
+        self._current_problem: Optional[CoreIP] = None
+        self.use_model_cache: bool = False
+        """If true, the models built by a former search on the same network are reused
+        and the models are returned to the process-level cache when the search finishes
+        (see optboolnet.template). They should not be used after the search"""
+        self.model_cache: Optional[ModelTemplateCache] = None
+        self._cached_models: List[Tuple[Hashable, CoreIP]] = list()
+        self.thread_budget: int = 0
+        """If positive, the total number of threads of the solves, where the threads of each solve
+        are assigned by the model size and the recent solve times and override SolverConfig.threads
+        (see optboolnet.budget)"""
+        self.thread_scheduler: Optional[ThreadBudgetScheduler] = None
+        self.time_budget = TimeBudget()
+        """The time limits of the phases (see optboolnet.budget)"""
 
     @property
     def elapsed_time(self):
@@ -54,6 +93,19 @@ class AttractorControl:
         else:
             return self.elapsed_time > self.total_time_limit
 
+    @property
+    def is_stopped(self) -> bool:
+        return self.is_cancelled or self.is_timeout
+
+    def cancel(self):
+        """Stops the search, which may be called from another thread.
+        The solve in progress is interrupted by the terminate hook of the solver (if supported),
+        and no control is reported after the cancellation."""
+        self.is_cancelled = True
+        _problem = self._current_problem
+        if _problem is not None:
+            _problem.terminate()
+
     @property
     def remaining_time(self) -> Optional[float]:
         if self.total_time_limit == None:
@@ -65,9 +117,63 @@ class AttractorControl:
         for target_size in range(max_control_size + 1):
             yield target_size
 
+    def model_label(self, problem: CoreIP) -> str:
+        """The label of a model used for profiling"""
+        if problem is getattr(self, "model_master", None):
+            return "master"
+        elif problem is getattr(self, "model_separation", None):
+            return "separation"
+        else:
+            return f"LLP_{problem.length}"
+
     @BendersLogger.wrap_model_build
-    def _build_model(self, cls: type[Model], *args):
-        return cls(*args)
+    def _build_model(self, cls: type[Model], *args, **kwargs):
+        with self.profiler.timer("build", cls.__name__):
+            return cls(*args, **kwargs)
+
+    def _get_model(
+        self,
+        cls: type[Model],
+        name: str,
+        length: Optional[int],
+        solver_config: SolverConfig,
+        recipe: Callable[[Model], None],
+        **kwargs,
+    ) -> Model:
+        """Takes a model from the model cache (if enabled) and resets it,
+        or builds a new one and applies the recipe to it
+
+        Args:
+            cls (type[Model]): the class of the model
+            name (str): the name of the model
+            length (Optional[int]): the length of attractors (None if cls has no length)
+            solver_config (SolverConfig): the solver config
+            recipe (Callable[[Model], None]): the constraints and the objective given to a new model
+            kwargs: the other arguments of the constructor
+        """
+        if self.model_cache is not None:
+            key = self.model_cache.make_key(self.bn, cls, length, solver_config, **kwargs)
+            problem = self.model_cache.take(key)
+            if problem is not None:
+                with self.profiler.timer("reset", cls.__name__):
+                    problem.reset(solver_config)
+                self._cached_models.append((key, problem))
+                return problem
+        if length is None:
+            problem = self._build_model(cls, name, self.bn, solver_config, **kwargs)
+        else:
+            problem = self._build_model(cls, name, self.bn, length, solver_config, **kwargs)
+        recipe(problem)
+        if self.model_cache is not None:
+            self._cached_models.append((key, problem))
+        return problem
+
+    def _release_models(self):
+        """Returns the models of the search to the model cache"""
+        if self.model_cache is not None:
+            for key, problem in self._cached_models:
+                self.model_cache.put(key, problem)
+        self._cached_models = list()
 
     @BendersLogger.wrap_model_optimize
     def _optimize(self, problem: CoreIP):
@@ -76,21 +182,54 @@ class AttractorControl:
         Args:
             problem (CoreIP): A problem to solve
         """
+        _label = self.model_label(problem)
         _time_limit = min(
             [
                 tl
-                for tl in [self.remaining_time, problem.solver_config.time_limit]
+                for tl in [
+                    self.remaining_time,
+                    problem.solver_config.time_limit,
+                    self.time_budget.time_limit(_label.partition("_")[0]),
+                ]
                 if tl != None
             ],
             default=None,
         )
         # update_options_time_limit
         if _time_limit != None:
-            if (_time_limit != None) and (_time_limit < 0):
+            if (_time_limit != None) and (_time_limit <= 0):
+                problem.mark_time_limit_reached()
                 return False
             else:
                 problem.update_options_time_limit(_time_limit)
-        return problem.optimize()
+        self._current_problem = problem
+        _threads = None
+        if self.thread_scheduler is not None:  # the threads assigned by the thread scheduler
+            _nnz = (
+                problem.get_model_size()["nnz"]
+                if _label not in self.thread_scheduler.sizes
+                else None
+            )
+            _threads = self.thread_scheduler.acquire(_label, _nnz)
+            problem.update_options_threads(_threads)
+        _st = time.perf_counter()
+        try:
+            if self.is_cancelled:
+                return False
+            result = problem.optimize()
+            if self.profiler.enabled:
+                self.profiler.add_solve(
+                    _label, time.perf_counter() - _st, problem.get_solver_statistics()
+                )
+                if _threads is not None:
+                    self.profiler.count("threads", _label, _threads)
+            return result
+        finally:
+            if _threads is not None:
+                self.thread_scheduler.release(
+                    _label, _threads, time.perf_counter() - _st
+                )
+            self._current_problem = None
 
     @BendersLogger.wrap_cut
     def _append_cut(self, func: Callable, *args):
@@ -99,7 +238,27 @@ class AttractorControl:
         Args:
             func (Callable): a method of CoreIP that returns Tuple[BendersCutType,int]
         """
-        return func(*args)
+        with self.profiler.timer("cut", func.__name__):
+            result = func(*args)
+        self.cut_count[result[0]] += 1
+        return result
+
+    def write_solution(self, ctrl: Control):
+        """Passes a discovered control to the result sink (if any)
+
+        Args:
+            ctrl (Control): a control that is just found
+        """
+        if self.result_sink is not None:
+            self.result_sink.append(
+                make_control_record(
+                    self.name,
+                    self.target_size,
+                    ctrl,
+                    self.elapsed_time,
+                    {_type.name: _count for _type, _count in self.cut_count.items()},
+                )
+            )
 
     @property
     def solution_count(self) -> int:
@@ -128,12 +287,89 @@ class BendersAttractorControl(AttractorControl):
         self.use_high_point_relaxation: bool = False
         """Use the high point relaxation for the master problem.
         Only valid if the max_length is 1"""
+        self.trap_space_pool_size: int = 100
+        """The number of trap spaces collected by a single solve in preprocess_max_forbidden_trap_space
+        with the solution pool of the solver (gurobi only), where only the non-dominated cuts are added to the master problem.
+        One at a time if 0"""
+        self.separation_warmstart: bool = False
+        """If true, the last trap space is given to the separation problem as a warm start"""
+        self.preprocessing_time: float = 0.0
+        """The time spent by preprocess_max_forbidden_trap_space in seconds"""
+        self.LLP_formulation: str = "standard"
+        """The formulation of the lower level problems, 'standard' or 'compact' (see AttractorDetectionIP)"""
+        self.reduced_LLP: bool = False
+        """If true, the lower level problems have no control variables d,
+        and a control is applied by fixing x and removing the transition constraints (see ReducedAttractorDetectionIP)"""
+        self.LLP_engine: str = "mip"
+        """The engine of the lower level problems, 'mip' or 'sat' (an incremental SAT solver, see optboolnet.sat).
+        A pysat solver can be given as 'sat:<solver name>' (e.g., 'sat:glucose4').
+        The SAT engine requires pysat, which is installed by `pip install optboolnet[sat]`"""
+        self.LLP_length_schedule: str = "all"
+        """The lengths of the lower level problems, 'all' (1 to max_length) or 'divisor'
+        (the lengths from max_length // 2 + 1 to max_length, which find the attractors of every period up to max_length,
+        see optboolnet.schedule)"""
+        self.adaptive_LLP_order: bool = False
+        """If true, the lower level problems are reordered by the cuts found per second during the search
+        (see AdaptiveLengthScheduler), and the statistics are written by the logger"""
+        self.length_scheduler: Optional[AdaptiveLengthScheduler] = None
+        self.strengthen_attractor_cuts: bool = False
+        """If true, the attractor of a logical Benders cut is replaced by one that remains an attractor
+        under more controls, so that the cut dominates (see SATAttractorDetection.strengthen, requires `pip install optboolnet[sat]`)"""
+        self.model_strengthening_dict: Dict[int, SATAttractorDetection] = dict()
+        self.use_percolation: bool = False
+        """If true, the values fixed by a candidate are propagated (see CNFBooleanNetwork.percolate).
+        The candidate is accepted without solving if the phenotype is fixed to 1 (only if allow_empty_attractor),
+        and otherwise the fixed values are given to the lower level problems"""
+        self.percolated_values: Dict[str, int] = dict()
+        """The values fixed by the percolation of the current candidate except the controlled ones"""
+        self.cut_pool_max_age: int = 0
+        """If positive, the cuts of the master problem slack at this number of consecutive solves
+        are removed from the solver until a candidate violates them (see optboolnet.cutpool)"""
+        self.LLP_time_limit: Optional[float] = None
+        """If given, the time limit of the first attempt of each lower level problem.
+        A candidate is never accepted if a lower level problem reaches its time limit:
+        it is excluded from the master problem as unknown and retried after its target size
+        with LLP_time_limit_growth times more time at each retry (see TimeBudget)"""
+        self.LLP_time_limit_growth: float = 4.0
+        """The factor of the time limit of the lower level problems at each retry of an unknown candidate"""
+        self.LLP_max_retries: int = 2
+        """The number of retries of an unknown candidate"""
+        self.is_LLP_unknown: bool = False
+        """True if no lower level problem of the last candidate found a forbidden attractor
+        and some reached the time limit"""
+        self.unknown_dict: Dict[int, List[Control]] = dict()
+        """(key) target size (value) the candidates that remain unknown after the retries.
+        An unknown candidate may be a control, so the minimality of the larger controls
+        that contain it is not guaranteed (see conditional_dict)"""
+        self.conditional_dict: Dict[int, List[Control]] = dict()
+        """(key) target size (value) the controls that may contain an undecided candidate of a smaller target size
+        (see contains_unknown), which are minimal only if the undecided candidates are not controls.
+        They are neither yielded nor added to solution_dict"""
+        self.incomplete_target_sizes: List[int] = list()
+        """The target sizes whose master problem reached the deadline of the target size (see TimeBudget)
+        before all candidates were found"""
 
     def validate_config(self):
         if (self.max_length != 1) and self.use_high_point_relaxation:
             raise InvalidConfigError(
                 "The high point relaxation can be only used for is when the length of attractor is 1"
             )
+        if self.LLP_formulation not in AttractorDetectionIP.FORMULATIONS:
+            raise InvalidConfigError(
+                f"Unknown LLP_formulation '{self.LLP_formulation}'. Try one of the following: {AttractorDetectionIP.FORMULATIONS}"
+            )
+        if self.LLP_engine.partition(":")[0] not in LLP_ENGINES:
+            raise InvalidConfigError(
+                f"Unknown LLP_engine '{self.LLP_engine}'. Try one of the following: {LLP_ENGINES}"
+            )
+        if self.LLP_time_limit_growth < 1 or self.LLP_max_retries < 0:
+            raise InvalidConfigError(
+                "LLP_time_limit_growth must be at least 1 and LLP_max_retries must be nonnegative"
+            )
+        if self.LLP_length_schedule not in LENGTH_SCHEDULES:
+            raise InvalidConfigError(
+                f"Unknown LLP_length_schedule '{self.LLP_length_schedule}'. Try one of the following: {LENGTH_SCHEDULES}"
+            )
         if (not self.solve_separation) and (
             self.preprocess_max_forbidden_trap_space or self.separation_heuristic
         ):
@@ -150,71 +386,190 @@ class BendersAttractorControl(AttractorControl):
         separation_solver_config: SolverConfig = SolverConfig(),
         **kwargs,
     ):
-        """Finds all minimal controls that induces the given phenotype at all states of every attractor
+        """Finds all minimal controls that induces the given phenotype at all states of every attractor.
+        If a candidate remains unknown (see LLP_time_limit), the controls that contain it are not yielded
+        since they are not proven to be minimal, and they are kept in conditional_dict instead.
+        If total_time_limit is given, each target size stops at its share of the time (see TimeBudget),
+        and the controls found after an incomplete target size are kept in conditional_dict as well.
+        The cancellation flag is reset when this method is called, not when the iteration starts,
+        so that a search cancelled before its first control (e.g., by the consumer of aiter) stays cancelled
 
         Returns:
             _type_: _description_
         """
+        self.is_cancelled = False
+        return self._iter_exhaustive_search(
+            max_control_size,
+            max_length,
+            master_solver_config,
+            LLP_solver_config,
+            separation_solver_config,
+            **kwargs,
+        )
+
+    def _iter_exhaustive_search(
+        self,
+        max_control_size: int,
+        max_length: int,
+        master_solver_config: SolverConfig,
+        LLP_solver_config: SolverConfig,
+        separation_solver_config: SolverConfig,
+        **kwargs,
+    ):
+        """The generator of iter_exhaustive_search"""
         self.max_control_size = max_control_size
         self.max_length = max_length
         for k, v in kwargs.items():
             setattr(self, k, v)
         self.validate_config()
+        if self.result_sink is not None:
+            self.result_sink.reopen()
+        self.thread_scheduler = (
+            ThreadBudgetScheduler(self.thread_budget) if self.thread_budget > 0 else None
+        )
+        self.time_budget = TimeBudget(
+            self.LLP_time_limit, self.LLP_time_limit_growth, self.LLP_max_retries
+        )
+        self.unknown_dict = dict()
+        self.conditional_dict = dict()
+        self.incomplete_target_sizes = list()
+        self.profiler = PhaseProfiler(self.profile, self.external_profiler)
+        self.profiler.start_external()
+        self.model_cache = _MODEL_CACHE if self.use_model_cache else None
+        self._cached_models = list()
         # model building
         if self.use_high_point_relaxation:
-            self.model_master = self._build_model(
-                AttractorDetectionIP, "0", self.bn, 1, master_solver_config
+            self.model_master = self._get_model(
+                AttractorDetectionIP, "0", 1, master_solver_config, _make_HPR_master
             )
-            self.model_master.make_constr_phenotype_at_all_t()
-            self.model_master.fix_phenotype(1)
         else:
-            self.model_master = self._build_model(
-                MasterControlIP, "0", self.bn, master_solver_config
+            self.model_master = self._get_model(
+                MasterControlIP, "0", None, master_solver_config, lambda model: None
             )
+        self.model_master.set_cut_pool(self.cut_pool_max_age)
         if self.solve_separation:
-            self.model_separation = self._build_model(
-                TrapSpaceDetectionIP, f"0", self.bn, separation_solver_config
+            self.model_separation = self._get_model(
+                TrapSpaceDetectionIP, "0", None, separation_solver_config, _make_separation
             )
-            self.model_separation.fix_phenotype(0)
-            self.model_separation.set_objective_sparse_cut()
+            if self.separation_warmstart:
+                self.model_separation.warmstart = True
         else:
             self.model_separation = None
-        self.model_LLP_list: List[ExtendedAttractorDetectionIP] = list()
-        for length in range(1, self.max_length + 1):
-            model_LLP = self._build_model(
-                ExtendedAttractorDetectionIP,
-                f"{length}",
-                self.bn,
-                length,
-                LLP_solver_config,
-            )
-            model_LLP.fix_var(model_LLP.v, 0)
-            model_LLP.make_constr_stability_condition()
-            model_LLP.make_constr_phenotype_at_all_t()
-            model_LLP.set_phenotype_obj()
+        self.model_LLP_list: List[Union[ExtendedAttractorDetectionIP, SATAttractorDetection]] = list()
+        self.model_strengthening_dict = dict()
+        for length in schedule_lengths(self.max_length, self.LLP_length_schedule):
+            if self.is_cancelled:  # the search stops before the main step
+                break
+            engine, _, sat_solver = self.LLP_engine.partition(":")
+            if engine == "sat":
+                model_LLP = self._get_model(
+                    SATAttractorDetection,
+                    f"{length}",
+                    length,
+                    LLP_solver_config,
+                    lambda model: None,
+                    **({"sat_solver": sat_solver} if sat_solver else {}),
+                )
+            else:
+                model_LLP = self._get_model(
+                    ReducedAttractorDetectionIP if self.reduced_LLP else ExtendedAttractorDetectionIP,
+                    f"{length}",
+                    length,
+                    LLP_solver_config,
+                    _make_LLP,
+                    formulation=self.LLP_formulation,
+                )
+            if self.profiler.enabled:
+                for _key, _value in model_LLP.get_model_size().items():
+                    self.profiler.count(_key, f"LLP_{length}", _value)
             self.model_LLP_list.append(model_LLP)
+            if self.strengthen_attractor_cuts:
+                self.model_strengthening_dict[length] = (
+                    model_LLP
+                    if engine == "sat"
+                    else self._get_model(
+                        SATAttractorDetection,
+                        f"{length}",
+                        length,
+                        LLP_solver_config,
+                        lambda model: None,
+                    )
+                )
+        self.length_scheduler = (
+            AdaptiveLengthScheduler([model.length for model in self.model_LLP_list])
+            if self.adaptive_LLP_order
+            else None
+        )
 
         # preprocessing
         if self.preprocess_max_forbidden_trap_space:
             self.add_all_max_forbidden_trap_space_cuts()
         # main step
-        for self.target_size in self.iter_target_size(max_control_size):
-            _solution_list = list()
-            self.model_master.set_constr_target_size(self.target_size)
-            while not self.is_timeout and self.find_candidate():
-                ctrl = self.model_master.get_control()
-                if not self.is_separation_violated(ctrl) and not self.is_LLP_violated(
-                    ctrl
-                ):
-                    yield ctrl
-                    _solution_list.append(ctrl)
+        try:
+            for self.target_size in self.iter_target_size(max_control_size):
+                _solution_list = list()
+                _unknown_list: List[Control] = list()
+                _conditional_list: List[Control] = list()
+                self.time_budget.start_target_size(
+                    self.target_size, max_control_size, self.remaining_time
+                )
+                self.model_master.set_constr_target_size(self.target_size)
+                while not self.is_stopped and self.find_candidate():
+                    with self.profiler.timer("get_control", "master"):
+                        ctrl = self.model_master.get_control()
+                    self.is_LLP_unknown = False
+                    if self.is_phenotype_percolated(ctrl) or (
+                        not self.is_separation_violated(ctrl)
+                        and not self.is_LLP_violated(ctrl)
+                    ):
+                        if self.is_cancelled:  # the checks may be interrupted
+                            break
+                        if self.is_LLP_unknown:  # retried after the target size
+                            self._append_cut(self.model_master.append_no_good_cut_d, ctrl)
+                            _unknown_list.append(ctrl)
+                            continue
+                        if self.contains_unknown(ctrl):
+                            _conditional_list.append(ctrl)
+                        else:
+                            self.write_solution(ctrl)
+                            yield ctrl
+                            _solution_list.append(ctrl)
+                        self._append_cut(self.model_master.append_minimality_cut, ctrl)
+                for ctrl in self.retry_unknown_controls(_unknown_list):
+                    if self.contains_unknown(ctrl):
+                        _conditional_list.append(ctrl)
+                    else:
+                        self.write_solution(ctrl)
+                        yield ctrl
+                        _solution_list.append(ctrl)
                     self._append_cut(self.model_master.append_minimality_cut, ctrl)
-            self.solution_dict[self.target_size] = _solution_list
-            if self.is_timeout:
-                break
-            self.step = EnumBendersStep.FINISHED
-            self.logger.solve_logger_info(self.log_signature)
-        self.logger.write_controls_to_json(self.solution_dict)
+                if _unknown_list:
+                    self.unknown_dict[self.target_size] = _unknown_list
+                if _conditional_list:
+                    self.conditional_dict[self.target_size] = _conditional_list
+                if not self.is_stopped and self.model_master.is_time_limit_reached():
+                    self.incomplete_target_sizes.append(self.target_size)
+                self.solution_dict[self.target_size] = _solution_list
+                if self.result_sink is not None:
+                    self.result_sink.flush()
+                if self.is_stopped:
+                    break
+                self.step = EnumBendersStep.FINISHED
+                self.logger.log_step(self)
+            self.logger.write_controls_to_json(self.solution_dict)
+        finally:
+            if self.result_sink is not None:
+                self.result_sink.close()
+            self._release_models()
+            self.profiler.stop_external()
+            if self.profiler.enabled:
+                if self.model_master.cut_pool is not None:
+                    self.profiler.count("purged_cuts", "master", self.model_master.cut_pool.num_purged)
+                    self.profiler.count("reactivated_cuts", "master", self.model_master.cut_pool.num_reactivated)
+                self.logger.write_profile(self.profiler)
+            if self.length_scheduler is not None:
+                self.logger.write_length_statistics(self.length_scheduler.to_records())
+            self.logger.close()
         # return self.solution_dict
 
     def get_control_strategies(self, max_control_size: int, max_length: int, **kwargs):
@@ -224,6 +579,62 @@ class BendersAttractorControl(AttractorControl):
             strategies.add(FromCondition("input", ctrl))
         return strategies
 
+    def aiter(
+        self, max_control_size: int, max_length: int, max_pending: int = 16, **kwargs
+    ) -> AsyncIterator[Control]:
+        """The asynchronous version of iter_exhaustive_search for `async for`.
+        The search runs in a worker thread, so the event loop is not blocked by the solvers.
+        If the iteration is stopped (aclose or the cancellation of the task),
+        the search is cancelled (see cancel) and the worker is joined.
+        Use contextlib.aclosing to stop the search at `break`.
+
+        Args:
+            max_control_size (int): the upper limit to the size of controls
+            max_length (int): the upper limit of the length of attractors
+            max_pending (int, optional): the number of controls kept until consumed.
+            The worker waits if the number is reached. Defaults to 16.
+        """
+        # the search is created (and its cancellation flag is reset) by this call,
+        # so that a cancel before the worker starts is not overwritten
+        return self._aiter(
+            self.iter_exhaustive_search(max_control_size, max_length, **kwargs),
+            max_pending,
+        )
+
+    async def _aiter(self, controls: Iterator[Control], max_pending: int):
+        """The asynchronous generator of aiter"""
+        loop = asyncio.get_running_loop()
+        results: asyncio.Queue = asyncio.Queue(max_pending)
+        _finished = object()
+
+        def _put(item):
+            asyncio.run_coroutine_threadsafe(results.put(item), loop).result()
+
+        def _search():
+            try:
+                for ctrl in controls:
+                    _put(ctrl)
+                _put(_finished)
+            except BaseException as e:
+                _put(e)
+
+        worker = loop.run_in_executor(None, _search)
+        try:
+            while True:
+                item = await results.get()
+                if item is _finished:
+                    break
+                elif isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            if not worker.done():
+                self.cancel()
+            while not worker.done():  # unblocks the worker waiting for a free slot
+                while not results.empty():
+                    results.get_nowait()
+                await asyncio.wait([worker], timeout=0.05)
+
     def find_candidate(self) -> bool:
         """Solves the master problem to find a solution candidate
 
@@ -231,8 +642,30 @@ class BendersAttractorControl(AttractorControl):
             bool: _description_
         """
         self.step = EnumBendersStep.BENDERS_MASTER
+        self.profiler.count("iterations", "master")
         return self._optimize(self.model_master)
 
+    def is_phenotype_percolated(self, ctrl: Control) -> bool:
+        """Propagates the values fixed by the candidate if use_percolation
+
+        Args:
+            ctrl (Control): the control candidate discovered by a master
+
+        Returns:
+            bool: True if the phenotype is fixed to 1, i.e., every attractor satisfies the phenotype
+        """
+        if not self.use_percolation:
+            return False
+        with self.profiler.timer("percolate", "master"):
+            trap_space = self.bn.percolate(ctrl)
+        self.percolated_values = {
+            i: value for i, value in trap_space.items() if i not in ctrl
+        }
+        if trap_space.get(self.bn.phenotype, None) == 1 and self.allow_empty_attractor:
+            self.profiler.count("percolated", "master")
+            return True
+        return False
+
     def is_separation_violated(self, ctrl: Control) -> bool:
         """Finds a forbidden trap space and adds a constraint that cuts off the candidate if one exists
 
@@ -248,16 +681,17 @@ class BendersAttractorControl(AttractorControl):
         self.step = EnumBendersStep.SEPARATION_PROBLEM
 
         # applying the heuristic may save the time but weaken the cut
-        if self.separation_heuristic:
-            self.model_separation.fix_control(ctrl)
-        else:
-            self.model_separation.add_constr_separation(ctrl)
-            self.model_separation.fix_phenotype(0)
+        with self.profiler.timer("fix_control", "separation"):
+            if self.separation_heuristic:
+                self.model_separation.fix_control(ctrl)
+            else:  # only the bounds different from the last candidate are updated
+                self.model_separation.add_constr_separation(ctrl)
 
         # solve the separation closure and possibly add a forbidden trap space cut
         if self._optimize(self.model_separation):
-            forbidden_ctrl = self.model_separation.get_control()
-            forbidden_ts = self.model_separation.get_trap_space()
+            with self.profiler.timer("get_trap_space", "separation"):
+                forbidden_ctrl = self.model_separation.get_control()
+                forbidden_ts = self.model_separation.get_trap_space()
             self._append_cut(
                 self.model_master.append_forbidden_trap_space_cut,
                 forbidden_ctrl,
@@ -267,6 +701,47 @@ class BendersAttractorControl(AttractorControl):
         else:
             return False
 
+    def retry_unknown_controls(self, unknown_list: List[Control]):
+        """Checks the unknown candidates again with the escalated time limits of the lower level problems
+        while the time allocated to the target size is left.
+        The candidates are already excluded from the master problem by no good cuts
+
+        Args:
+            unknown_list (List[Control]): the unknown candidates, where the resolved ones are removed
+
+        Yields:
+            Control: the candidates verified to be controls
+        """
+        try:
+            for attempt in range(1, self.time_budget.max_retries + 1):
+                self.time_budget.attempt = attempt
+                for ctrl in list(unknown_list):
+                    if self.is_stopped or not self.time_budget.can_retry:
+                        return
+                    self.is_LLP_unknown = False
+                    self.is_phenotype_percolated(ctrl)  # the fixed values given to the lower level problems
+                    is_violated = self.is_LLP_violated(ctrl)
+                    if self.is_cancelled:
+                        return
+                    if is_violated or not self.is_LLP_unknown:
+                        unknown_list.remove(ctrl)
+                        self.profiler.count("resolved_unknown", "LLP")
+                        if not is_violated:
+                            yield ctrl
+        finally:
+            self.time_budget.attempt = 0
+
+    def contains_unknown(self, ctrl: Control) -> bool:
+        """True if the control contains a candidate of a smaller target size that remains unknown,
+        or if a smaller target size is incomplete (any of its candidates may be an undecided control)"""
+        if self.incomplete_target_sizes:
+            return True
+        return any(
+            unknown.items() <= ctrl.items()
+            for _unknown_list in self.unknown_dict.values()
+            for unknown in _unknown_list
+        )
+
     def is_LLP_violated(self, ctrl: Control) -> bool:
         """Finds a forbidden attractor and adds a constraint that cuts off the candidate if one exists
 
@@ -279,15 +754,43 @@ class BendersAttractorControl(AttractorControl):
 
         self.step = EnumBendersStep.LOWER_LEVEL_PROBLEM
         is_feasible = False
+        if self.length_scheduler is not None:
+            _models = {model.length: model for model in self.model_LLP_list}
+            self.model_LLP_list = [
+                _models[length] for length in self.length_scheduler.order(list(_models))
+            ]
         for LLP_model in self.model_LLP_list:
-            LLP_model.fix_control(ctrl)
-            if self._optimize(LLP_model):
+            _label = f"LLP_{LLP_model.length}"
+            with self.profiler.timer("fix_control", _label):
+                LLP_model.fix_control(ctrl)
+                if self.use_percolation:
+                    LLP_model.fix_percolated_values(self.percolated_values)
+            _st = time.perf_counter()
+            _is_solved = self._optimize(LLP_model)
+            if not _is_solved and (self.is_timeout or LLP_model.is_time_limit_reached()):
+                self.is_LLP_unknown = True
+                self.profiler.count("time_limit_reached", _label)
+            _is_violated = _is_solved and LLP_model.is_phenotype_violated()
+            if self.length_scheduler is not None:
+                self.length_scheduler.record(
+                    LLP_model.length, time.perf_counter() - _st, _is_violated
+                )
+            if _is_solved:
                 is_feasible = True
-                if LLP_model.p.value == 0:
-                    attr = LLP_model.get_attractor()
-                    self._append_cut(self.model_master.append_logical_benders_cut, attr)
+                if _is_violated:
+                    with self.profiler.timer("get_attractor", _label):
+                        attr = LLP_model.get_attractor()
+                    strengthened = False
+                    if self.strengthen_attractor_cuts:
+                        with self.profiler.timer("strengthen", _label):
+                            _attr = self.model_strengthening_dict[LLP_model.length].strengthen(attr)
+                        if _attr is not None:
+                            attr, strengthened = _attr, True
+                    self._append_cut(
+                        self.model_master.append_logical_benders_cut, attr, strengthened
+                    )
                     return True
-        if is_feasible or self.allow_empty_attractor:
+        if is_feasible or self.allow_empty_attractor or self.is_LLP_unknown:
             return False
         else:
             self._append_cut(self.model_master.append_no_good_cut_d, ctrl)
@@ -298,16 +801,56 @@ class BendersAttractorControl(AttractorControl):
         if not self.solve_separation:
             return
         self.step = EnumBendersStep.FORBIDDEN_TRAP_SPACE_CUT
+        _st = time.perf_counter()
         self.model_separation.set_constr_target_size(0)
+        use_pool = self.trap_space_pool_size > 0 and self.model_separation.set_solution_pool(
+            self.trap_space_pool_size
+        )
         while self._optimize(self.model_separation):
-            ctrl = self.model_separation.get_control()
-            ts = self.model_separation.get_trap_space()
-            self.model_separation.add_trap_space_maximality_cut(ctrl, ts)
-            self._append_cut(
-                self.model_master.append_forbidden_trap_space_cut, ctrl, ts
-            )
+            if use_pool:  # every maximal trap space in the pool at once
+                with self.profiler.timer("get_trap_space", "separation"):
+                    trap_space_list = self.model_separation.get_trap_space_pool()
+            else:
+                trap_space_list = [
+                    (
+                        self.model_separation.get_control(),
+                        self.model_separation.get_trap_space(),
+                    )
+                ]
+            for ctrl, ts in trap_space_list:
+                self.model_separation.add_trap_space_maximality_cut(ctrl, ts)
+            if use_pool:  # without the weaker cuts of the near-optimal trap spaces
+                trap_space_list = self.model_master.filter_forbidden_trap_space_cuts(
+                    trap_space_list
+                )
+            for ctrl, ts in trap_space_list:
+                self._append_cut(
+                    self.model_master.append_forbidden_trap_space_cut, ctrl, ts
+                )
+        if use_pool:
+            self.model_separation.set_solution_pool(0)
         self.model_separation.set_constr_target_size(None)
         self.model_separation.clear_constr_list(self.model_separation.constrs_benders)
+        self.preprocessing_time = time.perf_counter() - _st
+        if self.profiler.enabled:
+            self.profiler.add_time(("preprocess", "separation"), self.preprocessing_time)
+
+
+def _make_HPR_master(model: AttractorDetectionIP):
+    model.make_constr_phenotype_at_all_t()
+    model.fix_phenotype(1)
+
+
+def _make_separation(model: TrapSpaceDetectionIP):
+    model.fix_phenotype(0)
+    model.set_objective_sparse_cut()
+
+
+def _make_LLP(model: ExtendedAttractorDetectionIP):
+    model.fix_var(model.v, 0)
+    model.make_constr_stability_condition()
+    model.make_constr_phenotype_at_all_t()
+    model.set_phenotype_obj()
 
 
 class BendersFixPointControl(BendersAttractorControl):
@@ -0,0 +1,349 @@
+"""The benchmark harness over the instances in optboolnet.instances
+
+Runs a matrix of (instance group x BendersConfig flags x solver x max_control_size)
+with repetitions, each job in a fresh process, and writes one JSON record per job.
+
+Example:
+    python -m optboolnet.bench --synthetic 50 200 1000 --groups
+    python -m optboolnet.bench --groups small --max-control-size 1 2 \\
+        --flags '{}' '{"solve_separation": true}' --repeat 3 \\
+        --output bench.jsonl --baseline bench_baseline.jsonl
+    python -m optboolnet.bench --groups medium --trap-space-pool 0 100
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+_DEFAULT_SOLVER = "gurobi_persistent"
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    _rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return _rss / (1024 * 1024) if sys.platform == "darwin" else _rss / 1024
+
+
+def job_key(job: Dict[str, Any]) -> str:
+    """The identifier of a job without the repetition index"""
+    return "|".join(
+        [
+            job["instance"],
+            job["solver"],
+            str(job["max_control_size"]),
+            str(job["max_length"]),
+            json.dumps(job["flags"], sort_keys=True),
+        ]
+    )
+
+
+def iter_jobs(
+    groups: List[str],
+    solvers: List[str],
+    max_control_sizes: List[int],
+    flag_sets: List[Dict[str, Any]],
+    repeat: int = 1,
+    max_length: int = 1,
+    time_limit: Optional[float] = None,
+    instances: List[str] = list(),
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over the jobs of the benchmark matrix
+
+    Args:
+        groups (List[str]): the names of instance groups ('small', 'medium' or 'large')
+        solvers (List[str]): the names of pyomo solvers
+        max_control_sizes (List[int]): the values of max_control_size
+        flag_sets (List[Dict[str, Any]]): keyword arguments of BendersAttractorControl (e.g., BendersConfig flags)
+        repeat (int, optional): the number of repetitions. Defaults to 1.
+        max_length (int, optional): the maximum length of attractors. Defaults to 1.
+        time_limit (Optional[float], optional): the total time limit of each job. Defaults to None.
+        instances (List[str], optional): the instances to run in addition to the groups,
+        including synthetic ones named 'syn_<num_nodes>_<seed>'. Defaults to list().
+    """
+    from optboolnet.instances import _INSTANCE_GROUPS
+
+    _instances = [inst for group in groups for inst in _INSTANCE_GROUPS[group]]
+    _instances += [inst for inst in instances if inst not in _instances]
+    for inst, solver, max_control_size, flags, rep in itertools.product(
+        _instances, solvers, max_control_sizes, flag_sets, range(repeat)
+    ):
+        yield {
+            "instance": inst,
+            "solver": solver,
+            "max_control_size": max_control_size,
+            "max_length": max_length,
+            "flags": flags,
+            "time_limit": time_limit,
+            "repetition": rep,
+        }
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs a job in the current process and returns its record"""
+    from optboolnet.algorithm import BendersAttractorControl
+    from optboolnet.config import SolverConfig
+    from optboolnet.runner import load_instance
+
+    record = dict(job)
+    record["key"] = job_key(job)
+    _st = time.perf_counter()
+    try:
+        bn = load_instance(job["instance"])
+        _solver_config = SolverConfig(solver_name=job["solver"], threads=1)
+        alg = BendersAttractorControl(job["instance"], bn)
+        for _ in alg.iter_exhaustive_search(
+            job["max_control_size"],
+            job["max_length"],
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=job["time_limit"],
+            profile=True,
+            **job["flags"],
+        ):
+            pass
+        profiler = alg.profiler
+        record["status"] = "timeout" if alg.is_timeout else "finished"
+        record["build_time"] = sum(
+            _time for (phase, _), _time in profiler.times.items() if phase == "build"
+        )
+        record["solve_time"] = sum(
+            _stats["wall_time"] for _stats in profiler.solver_stats.values()
+        )
+        record["preprocess_time"] = alg.preprocessing_time
+        record["separation_time"] = sum(
+            _stats["wall_time"]
+            for model, _stats in profiler.solver_stats.items()
+            if model == "separation"
+        )
+        record["iterations"] = profiler.counters[("iterations", "master")]
+        record["cuts"] = {
+            _type.name: _count for _type, _count in alg.cut_count.items()
+        }
+        record["solutions"] = alg.solution_count
+    except Exception as e:
+        record["status"] = f"error: {type(e).__name__}: {e}"
+    record["total_time"] = time.perf_counter() - _st
+    record["peak_rss_mb"] = _peak_rss_mb()
+    return record
+
+
+def run_benchmark(
+    jobs: List[Dict[str, Any]], output: str = "", processes: int = 1
+) -> List[Dict[str, Any]]:
+    """Runs the jobs, each in a fresh process so that the peak RSS is measured per job
+
+    Args:
+        jobs (List[Dict[str, Any]]): the jobs given by iter_jobs
+        output (str, optional): the path of a JSON-lines file to append the records. Defaults to "".
+        processes (int, optional): the number of jobs running at the same time. Defaults to 1.
+
+    Returns:
+        List[Dict[str, Any]]: the records of the jobs
+    """
+    records = list()
+    _ctx = multiprocessing.get_context("spawn")
+    pool = _ctx.Pool(processes, maxtasksperchild=1)
+    _f = open(output, "a") if output else None
+    try:
+        for record in pool.imap(run_job, jobs):
+            records.append(record)
+            if _f is not None:
+                _f.write(json.dumps(record) + "\n")
+                _f.flush()
+    finally:
+        pool.close()
+        pool.join()
+        if _f is not None:
+            _f.close()
+    return records
+
+
+def trap_space_pool_flag_sets(
+    pool_sizes: List[int], flags: Dict[str, Any] = dict()
+) -> List[Dict[str, Any]]:
+    """The flags of the preprocessing of maximal forbidden trap spaces with each size of the solution pool
+
+    Args:
+        pool_sizes (List[int]): the values of trap_space_pool_size (one at a time if 0)
+        flags (Dict[str, Any], optional): other keyword arguments of BendersAttractorControl. Defaults to dict().
+    """
+    return [
+        dict(
+            flags,
+            solve_separation=True,
+            preprocess_max_forbidden_trap_space=True,
+            trap_space_pool_size=pool_size,
+        )
+        for pool_size in pool_sizes
+    ]
+
+
+def summarize_trap_space_pool(records: List[Dict[str, Any]]) -> List[str]:
+    """Summarizes the records of the jobs given by trap_space_pool_flag_sets
+
+    Returns:
+        List[str]: a line per instance and pool size with the median preprocessing and separation times
+        and the number of forbidden trap space cuts
+    """
+    _groups: Dict[tuple, List[Dict[str, Any]]] = dict()
+    for record in records:
+        if record["status"] != "finished":
+            continue
+        _key = (record["instance"], record["flags"].get("trap_space_pool_size", 0))
+        _groups.setdefault(_key, list()).append(record)
+    return [
+        f"{inst} pool {pool_size}: "
+        f"preprocess {statistics.median(record['preprocess_time'] for record in _records):.3f}s, "
+        f"separation {statistics.median(record['separation_time'] for record in _records):.3f}s, "
+        f"{_records[0]['cuts'].get('TRAP_SPACE_CUT', 0)} trap space cuts"
+        for (inst, pool_size), _records in sorted(_groups.items())
+    ]
+
+
+def load_records(fname: str) -> List[Dict[str, Any]]:
+    with open(fname, "r") as _f:
+        return [json.loads(line) for line in _f if line.strip()]
+
+
+def compare_with_baseline(
+    records: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float = 0.2,
+    min_difference: float = 0.05,
+) -> List[str]:
+    """Compares the median times of the records with those of a baseline
+
+    Args:
+        records (List[Dict[str, Any]]): the records of the current run
+        baseline (List[Dict[str, Any]]): the records of the baseline
+        tolerance (float, optional): the allowed relative slowdown. Defaults to 0.2.
+        min_difference (float, optional): slowdowns below this value (in seconds) are ignored. Defaults to 0.05.
+
+    Returns:
+        List[str]: the messages describing the regressions (empty if there is none)
+    """
+
+    def _group(_records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        _groups: Dict[str, List[Dict[str, Any]]] = dict()
+        for record in _records:
+            _groups.setdefault(record.get("key", job_key(record)), list()).append(
+                record
+            )
+        return _groups
+
+    regressions = list()
+    _baseline = _group(baseline)
+    for key, _records in _group(records).items():
+        if key not in _baseline:
+            continue
+        if any(record["status"] != "finished" for record in _records):
+            regressions.append(f"{key}: status {_records[0]['status']}")
+            continue
+        _base_records = [
+            record for record in _baseline[key] if record["status"] == "finished"
+        ]
+        if not _base_records:
+            continue
+        if _records[0]["solutions"] != _base_records[0]["solutions"]:
+            regressions.append(
+                f"{key}: {_records[0]['solutions']} solutions (baseline {_base_records[0]['solutions']})"
+            )
+        for metric in ["build_time", "solve_time", "total_time"]:
+            _value = statistics.median(record[metric] for record in _records)
+            _base = statistics.median(record[metric] for record in _base_records)
+            if _value > _base * (1 + tolerance) and _value - _base > min_difference:
+                regressions.append(f"{key}: {metric} {_value:.3f}s (baseline {_base:.3f}s)")
+    return regressions
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m optboolnet.bench",
+        description="Benchmarks BendersAttractorControl over the instances in optboolnet.instances",
+    )
+    parser.add_argument("--groups", nargs="*", default=["small"])
+    parser.add_argument("--instances", nargs="*", default=list())
+    parser.add_argument(
+        "--synthetic",
+        nargs="*",
+        type=int,
+        default=list(),
+        help="the numbers of nodes of synthetic networks (see optboolnet.instances.synthetic)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solvers", nargs="*", default=[_DEFAULT_SOLVER])
+    parser.add_argument("--max-control-size", nargs="*", type=int, default=[1])
+    parser.add_argument("--max-length", type=int, default=1)
+    parser.add_argument(
+        "--flags",
+        nargs="*",
+        type=json.loads,
+        default=[dict()],
+        help="JSON objects of the options of BendersAttractorControl",
+    )
+    parser.add_argument(
+        "--trap-space-pool",
+        nargs="*",
+        type=int,
+        default=None,
+        help="the sizes of the solution pool to compare in the preprocessing of forbidden trap spaces (replaces the flags)",
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--output", default="", help="a JSON-lines file to append the records")
+    parser.add_argument("--baseline", default="", help="a JSON-lines file of baseline records")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from optboolnet.instances.synthetic import synthetic_name
+
+    args = make_parser().parse_args(argv)
+    jobs = list(
+        iter_jobs(
+            args.groups,
+            args.solvers,
+            args.max_control_size,
+            args.flags
+            if args.trap_space_pool is None
+            else trap_space_pool_flag_sets(args.trap_space_pool),
+            args.repeat,
+            args.max_length,
+            args.time_limit,
+            args.instances
+            + [synthetic_name(num_nodes, args.seed) for num_nodes in args.synthetic],
+        )
+    )
+    records = run_benchmark(jobs, args.output, args.processes)
+    for record in records:
+        print(
+            f"{record['key']} #{record['repetition']}: {record['status']}, "
+            f"{record['total_time']:.3f}s, {record.get('solutions')} solutions"
+        )
+    if args.trap_space_pool is not None:
+        for line in summarize_trap_space_pool(records):
+            print(line)
+    if args.baseline:
+        regressions = compare_with_baseline(
+            records, load_records(args.baseline), args.tolerance
+        )
+        for msg in regressions:
+            print("REGRESSION", msg)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
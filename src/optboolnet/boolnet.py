@@ -1,4 +1,7 @@
-from typing import Dict, List, Tuple
+import functools
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import boolean
 from colomoto.minibn import _TRUE, _FALSE
 from colomoto import minibn
@@ -22,6 +25,76 @@ def contains_and(expr) -> bool:
     return False
 
 
+_KEYWORDS = {"and", "or", "not", "true", "false", "none"}
+
+
+@functools.lru_cache(maxsize=None)
+def _literal_pattern(allowed_in_name: Tuple[str, ...]):
+    _chars = re.escape("".join(allowed_in_name))
+    return re.compile(rf"\s*([!~]?)\s*([A-Za-z_][A-Za-z0-9_{_chars}]*)\s*$")
+
+
+def parse_cnf_formula(
+    formula: str, allowed_in_name: Tuple[str, ...] = (".", "_", ":", "-")
+) -> Optional[List[Tuple[List[str], List[str]]]]:
+    """Parses a formula of the form '(a | !b) & c' without building boolean.py expressions
+
+    Args:
+        formula (str): the right-hand side of a bnet line
+        allowed_in_name (Tuple[str, ...], optional): the characters allowed in names besides letters, digits and '_'
+
+    Returns:
+        Optional[List[Tuple[List[str], List[str]]]]: the (positive literals, negative literals) of each clause,
+        or None if the formula is not written as a flat CNF (e.g., nested parentheses),
+        in which case it should be parsed by boolean.py
+    """
+    formula = formula.strip()
+    if formula.lower() in ("1", "true"):
+        return [(list(), list())]
+    if formula.lower() in ("0", "false", "none"):
+        return list()
+    _pattern = _literal_pattern(tuple(allowed_in_name))
+    terms = formula.split("&")
+    clauses = list()
+    for term in terms:
+        term = term.strip()
+        if term.startswith("(") and term.endswith(")"):
+            term = term[1:-1]
+        elif len(terms) > 1 and "|" in term:  # e.g., 'a | b & c'
+            return None
+        pos_literals: Dict[str, None] = dict()
+        neg_literals: Dict[str, None] = dict()
+        for literal in term.split("|"):
+            match = _pattern.match(literal)
+            if match is None or match.group(2).lower() in _KEYWORDS:
+                return None
+            if match.group(1):
+                neg_literals[match.group(2)] = None
+            else:
+                pos_literals[match.group(2)] = None
+        clauses.append((list(pos_literals), list(neg_literals)))
+    return clauses
+
+
+def iter_bnet_lines(data: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Iterates over (variable, formula) of the lines of a bnet file in the same way as minibn"""
+    header = None
+    for line in data:
+        line = line.split("#")[0].strip()
+        if not line:
+            continue
+        sep = line.find("<-")
+        if sep < 0:
+            comma = line.index(",")
+            left, right = line[:comma].strip(), line[comma + 1 :].strip()
+        else:
+            left, right = line[:sep].strip(), line[sep + 2 :].strip()
+        if header is None and (left, right) == ("targets", "factors"):
+            header = True
+            continue
+        yield left, right
+
+
 class ORClause(boolean.Expression):
     """
 
@@ -65,31 +138,31 @@ class CNFBooleanNetwork(minibn.BooleanNetwork):
         to_cnf: bool = False,
         **kwargs,
     ):
-        super().__init__(data, Symbol_class, allowed_in_name)
-
-        _control_config = control_config
-        self._control_config = _control_config
-        self.vars_list = list(self.keys())
-        self.controllable_vars = [
-            var for var in _control_config.controllable_vars if var in self.vars_list
-        ]
-        self.uncontrollable_vars = [
-            var for var in _control_config.uncontrollable_vars if var in self.vars_list
-        ]
-
-        self.fixed_values = _control_config.fixed_values
-        self.phenotype = _control_config.phenotype
+        if isinstance(data, str) and not to_cnf:
+            super().__init__(None, Symbol_class, allowed_in_name)
+            self.__clause_dict: Dict[str, List[ORClause]] = dict()
+            if "\n" in data or not os.path.exists(data):
+                self._import_cnf_data(data.splitlines(), allowed_in_name)
+            else:
+                with open(data) as _f:
+                    self._import_cnf_data(_f, allowed_in_name)
+        else:
+            super().__init__(data, Symbol_class, allowed_in_name)
+            self.__clause_dict = dict()
+        self._set_control_config(control_config)
 
         if (self.phenotype not in self) and ("phenotype_formula" in kwargs):
             self[self.phenotype] = kwargs.pop("phenotype_formula")
         for var_name, value in self.fixed_values.items():
             self[var_name] = value
+            self.__clause_dict.pop(var_name, None)
         assert set(self.controllable_vars).union(set(self.uncontrollable_vars)) == set(
             self.vars_list
         )
 
-        self.__clause_dict: Dict[str, List[ORClause]] = dict()
         for var_name, CNF_formula in self.items():
+            if var_name in self.__clause_dict:  # parsed by _import_cnf_data
+                continue
             CNF_formula = self.ba.cnf(CNF_formula) if to_cnf else CNF_formula
             if isinstance(CNF_formula, _FALSE):
                 self.__clause_dict[var_name] = list()
@@ -107,6 +180,113 @@ class CNFBooleanNetwork(minibn.BooleanNetwork):
             else:
                 raise TypeError()
 
+    def _import_cnf_data(self, data: Iterable[str], allowed_in_name: Tuple[str, ...]):
+        """Reads bnet lines straight into the clauses by parse_cnf_formula.
+        A formula that is not a flat CNF is parsed by boolean.py and its clauses are extracted later.
+        """
+        symbols: Dict[str, boolean.Symbol] = dict()
+        for var_name, formula in iter_bnet_lines(data):
+            clauses = parse_cnf_formula(formula, allowed_in_name)
+            if clauses is None:
+                self[var_name] = self.ba.parse(formula)
+                self.__clause_dict.pop(var_name, None)
+                continue
+            or_clauses = [
+                self._make_or_clause(pos_literals, neg_literals, symbols)
+                for pos_literals, neg_literals in clauses
+            ]
+            self.__clause_dict[var_name] = or_clauses
+            dict.__setitem__(self, var_name, self._clauses_to_formula(or_clauses))
+
+    def _make_or_clause(
+        self,
+        pos_literals: List[str],
+        neg_literals: List[str],
+        symbols: Dict[str, boolean.Symbol],
+    ) -> ORClause:
+        for name in pos_literals + neg_literals:
+            if name not in symbols:
+                symbols[name] = self.ba.Symbol(name)
+        or_clause = ORClause.__new__(ORClause)
+        boolean.Expression.__init__(or_clause)
+        or_clause.args = tuple(
+            [symbols[name] for name in pos_literals]
+            + [self.ba.NOT(symbols[name]) for name in neg_literals]
+        )
+        or_clause.pos_literals = list(pos_literals)
+        or_clause.neg_literals = list(neg_literals)
+        return or_clause
+
+    def _set_control_config(self, control_config: ControlConfig):
+        _control_config = control_config
+        self._control_config = _control_config
+        self.vars_list = list(self.keys())
+        self.controllable_vars = [
+            var for var in _control_config.controllable_vars if var in self
+        ]
+        self.uncontrollable_vars = [
+            var for var in _control_config.uncontrollable_vars if var in self
+        ]
+
+        self.fixed_values = _control_config.fixed_values
+        self.phenotype = _control_config.phenotype
+
+    def to_clause_table(self) -> Dict[str, List[List[List[str]]]]:
+        """The compact representation of the clauses
+
+        Returns:
+            Dict[str, List[List[List[str]]]]: (key) variable (value) the list of [positive literals, negative literals] of each clause.
+            A constant TRUE formula is a single clause without literals and a constant FALSE formula has no clause.
+        """
+        return {
+            var_name: [
+                [list(clause.pos_literals), list(clause.neg_literals)]
+                for clause in self.__clause_dict[var_name]
+            ]
+            for var_name in self.keys()
+        }
+
+    @classmethod
+    def from_clause_table(
+        cls,
+        clause_table: Dict[str, List[List[List[str]]]],
+        control_config: ControlConfig,
+        Symbol_class=boolean.Symbol,
+        allowed_in_name=(".", "_", ":", "-"),
+    ):
+        """Constructs a network from the output of to_clause_table without parsing any formula
+
+        Args:
+            clause_table (Dict[str, List[List[List[str]]]]): (key) variable (value) the list of [positive literals, negative literals]
+            control_config (ControlConfig): the control config
+        """
+        bn = cls.__new__(cls)
+        minibn.BooleanNetwork.__init__(bn, None, Symbol_class, allowed_in_name)
+        symbols: Dict[str, boolean.Symbol] = dict()
+        bn.__clause_dict = dict()
+        for var_name, clauses in clause_table.items():
+            or_clauses = [
+                bn._make_or_clause(pos_literals, neg_literals, symbols)
+                for pos_literals, neg_literals in clauses
+            ]
+            bn.__clause_dict[var_name] = or_clauses
+            dict.__setitem__(bn, var_name, bn._clauses_to_formula(or_clauses))
+        bn._set_control_config(control_config)
+        return bn
+
+    def _clauses_to_formula(self, or_clauses: List[ORClause]) -> boolean.Expression:
+        if not or_clauses:
+            return self.ba.FALSE
+        terms = list()
+        for or_clause in or_clauses:
+            if len(or_clause.args) == 0:
+                terms.append(self.ba.TRUE)
+            elif len(or_clause.args) == 1:
+                terms.append(or_clause.args[0])
+            else:
+                terms.append(self.ba.OR(*or_clause.args))
+        return terms[0] if len(terms) == 1 else self.ba.AND(*terms)
+
     def items(self) -> Tuple[str, boolean.Expression]:
         return super().items()
 
@@ -130,6 +310,76 @@ class CNFBooleanNetwork(minibn.BooleanNetwork):
             i: [idx for idx, _ in enumerate(self.__clause_dict[i])] for i in self.keys()
         }
 
+    def _get_watch_list(self) -> Dict[str, List[Tuple[str, int, bool]]]:
+        """(key) a variable (value) the clauses (var_name, clause_idx, is_positive) with the variable as a literal"""
+        if getattr(self, "_watch_list", None) is None:
+            watch_list: Dict[str, List[Tuple[str, int, bool]]] = {
+                var_name: list() for var_name in self.keys()
+            }
+            for (var_name, clause_idx), or_clause in self.iter_clauses():
+                for literal in or_clause.pos_literals:
+                    watch_list[literal].append((var_name, clause_idx, True))
+                for literal in or_clause.neg_literals:
+                    watch_list[literal].append((var_name, clause_idx, False))
+            self._watch_list = watch_list
+        return self._watch_list
+
+    def percolate(self, ctrl: Dict[str, int] = dict()) -> "Hypercube":
+        """The trap space of the controlled network given by the constant propagation from the control
+        (in linear time of the number of literals), which contains every attractor under the control.
+        A variable without clauses is constant 1 and a variable with an empty clause is constant 0.
+
+        Args:
+            ctrl (Dict[str, int], optional): the control. Defaults to dict().
+
+        Returns:
+            Hypercube: the fixed values of the trap space including the control
+        """
+        values: Dict[str, int] = dict(ctrl)
+        queue: List[str] = list(values)
+        num_false_literals: Dict[Tuple[str, int], int] = dict()
+        is_true_clause: Dict[Tuple[str, int], bool] = dict()
+        num_open_clauses: Dict[str, int] = dict()
+
+        def _fix(var_name: str, value: int):
+            values[var_name] = value
+            queue.append(var_name)
+
+        for var_name in self.keys():
+            or_clauses = self.__clause_dict[var_name]
+            num_open_clauses[var_name] = len(or_clauses)
+            if var_name in values:
+                continue
+            if not or_clauses:
+                _fix(var_name, 1)
+            elif any(
+                not (or_clause.pos_literals or or_clause.neg_literals)
+                for or_clause in or_clauses
+            ):
+                _fix(var_name, 0)
+
+        watch_list = self._get_watch_list()
+        while queue:
+            literal = queue.pop()
+            value = values[literal]
+            for var_name, clause_idx, is_positive in watch_list[literal]:
+                key = (var_name, clause_idx)
+                if var_name in values or is_true_clause.get(key, False):
+                    continue
+                if is_positive == (value == 1):  # the clause is true
+                    is_true_clause[key] = True
+                    num_open_clauses[var_name] -= 1
+                    if num_open_clauses[var_name] == 0:
+                        _fix(var_name, 1)
+                else:
+                    num_false_literals[key] = num_false_literals.get(key, 0) + 1
+                    or_clause = self.__clause_dict[var_name][clause_idx]
+                    if num_false_literals[key] == len(or_clause.pos_literals) + len(
+                        or_clause.neg_literals
+                    ):
+                        _fix(var_name, 0)
+        return Hypercube(values)
+
     def get_summary(self):
         return {
             "num_vars": len(self),
@@ -0,0 +1,164 @@
+"""The budgets of the threads and the time of the solves
+
+ThreadBudgetScheduler assigns the threads of the solves from a total budget of cores.
+SolverConfig.threads is fixed per model, while the master problem is small and solved in milliseconds
+and the lower level problems of some lengths take most of the search time.
+A solver spends more time on synchronization than on the search of a small model with many threads,
+so ThreadBudgetScheduler gives a single thread to the fast models (or the small ones before their first solve,
+since the size of a model such as the master problem grows with the cuts)
+and doubles the threads of a model each time its recent solve time doubles,
+up to the budget of a worker (the total budget divided by the number of workers).
+The threads of the solves in progress are reserved, so concurrent solves
+(e.g., the searches of several threads sharing a scheduler) do not exceed the total budget,
+except that every solve is given at least one thread.
+
+TimeBudget splits the time of a search into the target sizes and the phases.
+Every solve of a target size (master, separation and lower level problems) stops at the deadline
+of the target size, so that a hard target size does not take the time of the following ones.
+A lower level problem that reaches its time limit proves nothing about the candidate,
+so the candidate is deferred as unknown instead of being accepted,
+and it is retried after the master problem of its target size is exhausted
+with the time limit multiplied by the growth factor at each retry,
+as long as the time allocated to the target size is left.
+"""
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+_SINGLE_THREAD_NNZ = 2000
+"""The models with fewer nonzeros are solved by a single thread at their first solve"""
+_SINGLE_THREAD_TIME = 0.05
+"""The models solved faster (in seconds, on average) are solved by a single thread"""
+_SMOOTHING = 0.5
+"""The weight of the last solve time in the moving average"""
+
+
+class ThreadBudgetScheduler:
+    """Assigns the threads of each solve by the size of the model and its recent solve times"""
+
+    def __init__(self, total_threads: int, num_workers: int = 1) -> None:
+        """
+
+        Args:
+            total_threads (int): the number of threads shared by all solves
+            num_workers (int, optional): the number of solves that may run at the same time. Defaults to 1.
+        """
+        if total_threads < 1 or num_workers < 1:
+            raise ValueError("total_threads and num_workers must be positive")
+        self.total_threads = total_threads
+        self.num_workers = num_workers
+        self.sizes: Dict[str, int] = dict()
+        """(key) the label of a model (value) the number of nonzeros at the first solve (used until it is solved)"""
+        self.solve_times: Dict[str, float] = dict()
+        """(key) the label of a model (value) the moving average of the solve times in seconds"""
+        self.in_use: int = 0
+        """The number of threads reserved by the solves in progress"""
+        self._lock = threading.Lock()
+
+    @property
+    def worker_threads(self) -> int:
+        """The maximum number of threads of a single solve"""
+        return max(1, self.total_threads // self.num_workers)
+
+    def desired_threads(self, label: str) -> int:
+        """The number of threads of the next solve of a model if the budget is not in use"""
+        solve_time = self.solve_times.get(label)
+        if solve_time is None:  # the size is the only estimate before the first solve
+            if self.sizes.get(label, 0) < _SINGLE_THREAD_NNZ:
+                return 1
+            return max(1, self.worker_threads // 2)
+        if solve_time < _SINGLE_THREAD_TIME:
+            return 1
+        return min(
+            self.worker_threads,
+            2 ** int(math.log2(solve_time / _SINGLE_THREAD_TIME)),
+        )
+
+    def acquire(self, label: str, nnz: Optional[int] = None) -> int:
+        """Reserves the threads of a solve
+
+        Args:
+            label (str): the label of the model (e.g., 'master' or 'LLP_3')
+            nnz (Optional[int], optional): the number of nonzeros of the model,
+                which is recorded at the first solve of the label. Defaults to None.
+
+        Returns:
+            int: the number of threads, at least 1 even if the budget is in use
+        """
+        with self._lock:
+            if nnz is not None:
+                self.sizes.setdefault(label, nnz)
+            threads = max(
+                1, min(self.desired_threads(label), self.total_threads - self.in_use)
+            )
+            self.in_use += threads
+            return threads
+
+    def release(self, label: str, threads: int, solve_time: float):
+        """Frees the threads of a finished solve and records its solve time"""
+        with self._lock:
+            self.in_use -= threads
+            _last = self.solve_times.get(label)
+            self.solve_times[label] = (
+                solve_time
+                if _last is None
+                else _SMOOTHING * solve_time + (1 - _SMOOTHING) * _last
+            )
+
+
+class TimeBudget:
+    """The time limits of the lower level problems with escalating retries,
+    and the time allocated to each target size"""
+
+    def __init__(
+        self,
+        LLP_time_limit: Optional[float] = None,
+        growth: float = 4.0,
+        max_retries: int = 2,
+    ) -> None:
+        """
+
+        Args:
+            LLP_time_limit (Optional[float], optional): the time limit of the first attempt of a lower level problem
+                (only the other limits apply if None). Defaults to None.
+            growth (float, optional): the factor of the time limit at each retry. Defaults to 4.0.
+            max_retries (int, optional): the number of retries of an unknown candidate. Defaults to 2.
+        """
+        if growth < 1 or max_retries < 0:
+            raise ValueError("growth must be at least 1 and max_retries must be nonnegative")
+        self.LLP_time_limit = LLP_time_limit
+        self.growth = growth
+        self.max_retries = max_retries
+        self.attempt: int = 0
+        """The number of retries of the current candidate (0 at the first attempt)"""
+        self.size_deadline: Optional[float] = None
+        """The time (time.time) until which the current target size may retry unknown candidates"""
+
+    def start_target_size(
+        self, target_size: int, max_control_size: int, remaining_time: Optional[float]
+    ):
+        """Allocates an equal share of the remaining time to each of the remaining target sizes,
+        where the time left by a target size is shared by the following ones"""
+        self.attempt = 0
+        if remaining_time is None:
+            self.size_deadline = None
+        else:
+            self.size_deadline = time.time() + remaining_time / (
+                max_control_size - target_size + 1
+            )
+
+    @property
+    def can_retry(self) -> bool:
+        """True if the time allocated to the current target size is left"""
+        return self.size_deadline is None or time.time() < self.size_deadline
+
+    def time_limit(self, phase: str) -> Optional[float]:
+        """The time limit of a solve of the phase ('master', 'separation' or 'LLP') at the current attempt,
+        which is at most the time left until the deadline of the target size (None if not limited)"""
+        _limits = list()
+        if phase == "LLP" and self.LLP_time_limit is not None:
+            _limits.append(self.LLP_time_limit * self.growth**self.attempt)
+        if self.size_deadline is not None:
+            _limits.append(self.size_deadline - time.time())
+        return min(_limits, default=None)
@@ -0,0 +1,100 @@
+"""The command-line interface
+
+Example:
+    optboolnet run tests/test_instance/benders_config.json --groups small \\
+        --processes 4 --time-limit 600 --memory-limit 4096 --output results
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+from typing import List, Optional
+from optboolnet.config import TotalConfig
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="optboolnet",
+        description="The optimization toolbox for control problems of a Boolean network",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    parser_run = subparsers.add_parser(
+        "run", help="runs BendersAttractorControl over instances and configs"
+    )
+    parser_run.add_argument(
+        "configs",
+        nargs="+",
+        help="JSON files of TotalConfig (or of BendersConfig with the solver configs at the top level)",
+    )
+    parser_run.add_argument(
+        "--instances",
+        nargs="*",
+        default=list(),
+        help="the names of instances in the repository, 'syn_<num_nodes>_<seed>', or directories",
+    )
+    parser_run.add_argument(
+        "--groups",
+        nargs="*",
+        default=list(),
+        help="the groups of instances in the repository ('small', 'medium' or 'large')",
+    )
+    parser_run.add_argument("--processes", type=int, default=1)
+    parser_run.add_argument(
+        "--time-limit", type=float, default=None, help="the time limit of each job in seconds"
+    )
+    parser_run.add_argument(
+        "--memory-limit", type=float, default=None, help="the memory limit of each job in megabytes"
+    )
+    parser_run.add_argument(
+        "--output",
+        default="results",
+        help="the path without extension of the controls and of the job records (<output>_jobs.jsonl)",
+    )
+    parser_run.add_argument(
+        "--sink-format", default="jsonl", help="'jsonl', 'sqlite' or 'parquet'"
+    )
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    from optboolnet.instances import _INSTANCE_GROUPS
+    from optboolnet.runner import instance_name, make_job, run as run_jobs
+    from optboolnet.sink import make_result_sink
+
+    instances = [inst for group in args.groups for inst in _INSTANCE_GROUPS[group]]
+    instances += [inst for inst in args.instances if inst not in instances]
+    if not instances:
+        print("No instance is given (see --instances and --groups)", file=sys.stderr)
+        return 2
+    jobs = list()
+    for config_fname in args.configs:
+        config = TotalConfig.from_json(config_fname)
+        config_name = os.path.splitext(os.path.basename(config_fname))[0]
+        for inst in instances:
+            jobs.append(
+                make_job(
+                    inst,
+                    config,
+                    f"{config_name}:{instance_name(inst)}" if len(args.configs) > 1 else "",
+                    args.time_limit,
+                    args.memory_limit,
+                )
+            )
+    records = run_jobs(
+        jobs,
+        make_result_sink(args.sink_format, args.output),
+        f"{args.output}_jobs.jsonl",
+        args.processes,
+    )
+    return 0 if all(record["status"] in ("finished", "timeout") for record in records) else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
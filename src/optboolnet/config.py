@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, List, Optional, TypeVar
 import json
 
 _DEFAULT_SOLVER = "gurobi_persistent"
@@ -78,6 +78,22 @@ class Config:
     #     else:
     #         raise TypeError(f"Config {cls} does not support type {type(_data)}")
 
+    def to_kwargs(self) -> Dict[str, Any]:
+        """The values of the fields declared by the subclasses of Config,
+        where a field not given to the instance has the default value of its class
+
+        Returns:
+            Dict[str, Any]: (key) the name of a field (value) its value
+        """
+        _kwargs = dict()
+        for _cls in reversed(type(self).__mro__):
+            if not issubclass(_cls, Config) or _cls is Config:
+                continue
+            for _key in vars(_cls).get("__annotations__", dict()):
+                if hasattr(self, _key):
+                    _kwargs[_key] = getattr(self, _key)
+        return _kwargs
+
     def to_dict(self):
         _config_dict = dict()
         _config_dict["__name__"] = self.__class__.__name__
@@ -109,6 +125,12 @@ class LoggingConfig(Config):
     fpath: str = ""
     """The list of uncontrollable variables"""
     fname: str = ""
+    sink_format: str = ""
+    """The format of the streaming result sink ('jsonl', 'sqlite' or 'parquet'), disabled if empty"""
+    backend: str = "text"
+    """The logging backend: 'text' (logging handlers) or 'csv'/'parquet' (columnar buffers)"""
+    buffer_size: int = 4096
+    """The number of events kept in a columnar buffer before it is written"""
 
 
 class SolverConfig(Config):
@@ -167,6 +189,14 @@ class AttractorControlConfig(Config):
     max_length: int = 1
     allow_empty_attractor: bool = True
     total_time_limit: Optional[float] = 600
+    profile: bool = False
+    """If true, the time of each phase and the solver statistics of each model are recorded"""
+    external_profiler: str = ""
+    """'cprofile' or 'pyinstrument' to profile the whole search (empty if not used)"""
+    use_model_cache: bool = False
+    """If true, the models built by a former search on the same network in the process are reused"""
+    thread_budget: int = 0
+    """If positive, the total number of threads assigned to each solve by the model size and the recent solve times"""
 
 
 class BendersConfig(AttractorControlConfig):
@@ -174,6 +204,32 @@ class BendersConfig(AttractorControlConfig):
     preprocess_max_forbidden_trap_space: bool = False
     separation_heuristic: bool = False
     use_high_point_relaxation: bool = False
+    separation_warmstart: bool = False
+    """If true, the last trap space is given to the separation problem as a warm start"""
+    trap_space_pool_size: int = 100
+    """The number of trap spaces collected by a single solve in the preprocessing (gurobi only, one at a time if 0)"""
+    LLP_formulation: str = "standard"
+    """The formulation of the lower level problems, 'standard' or 'compact' (fewer rows and columns)"""
+    reduced_LLP: bool = False
+    """If true, the lower level problems have no control variables and a control fixes the states of the controlled variables"""
+    LLP_engine: str = "mip"
+    """The engine of the lower level problems, 'mip' or 'sat' (requires pysat, see `pip install optboolnet[sat]`), or 'sat:<pysat solver name>'"""
+    LLP_length_schedule: str = "all"
+    """The lengths of the lower level problems, 'all' (1 to max_length) or 'divisor' (max_length // 2 + 1 to max_length)"""
+    adaptive_LLP_order: bool = False
+    """If true, the lower level problems are reordered by the cuts found per second during the search"""
+    strengthen_attractor_cuts: bool = False
+    """If true, the logical Benders cuts are replaced by dominating ones found by a SAT solver (requires pysat, see `pip install optboolnet[sat]`)"""
+    use_percolation: bool = False
+    """If true, a candidate whose phenotype is fixed to 1 by percolation is accepted without solving"""
+    cut_pool_max_age: int = 0
+    """If positive, the cuts of the master problem slack at this number of consecutive solves are kept out of the solver"""
+    LLP_time_limit: Optional[float] = None
+    """If given, the time limit of the first attempt of each lower level problem, where a timed-out candidate is retried later"""
+    LLP_time_limit_growth: float = 4.0
+    """The factor of the time limit of the lower level problems at each retry"""
+    LLP_max_retries: int = 2
+    """The number of retries of a candidate whose lower level problem reached the time limit"""
 
 
 class MibSBilevelConfig(AttractorControlConfig):
@@ -187,9 +243,48 @@ class MibSBilevelConfig(AttractorControlConfig):
         ), "MibS does not allow time limit in SolverConfig"
 
 
+def _as_config(cls: type[Config], value) -> Config:
+    if isinstance(value, Config):
+        return value
+    _value = dict(value)
+    _value.pop("__name__", None)
+    return cls.from_dict(_value)
+
+
 class TotalConfig(Config, Generic[_C]):
     alg_config: _C
     master_solver_config: SolverConfig
     LLP_solver_config: SolverConfig
     separation_solver_config: SolverConfig
     logging_config: LoggingConfig
+
+    _SOLVER_CONFIG_KEYS = [
+        "master_solver_config",
+        "LLP_solver_config",
+        "separation_solver_config",
+    ]
+
+    @classmethod
+    def from_dict(cls, data: Dict, alg_config_cls: type[_C] = BendersConfig):
+        """Converts a dict into the config. The sub-configs are converted by their keys
+        regardless of '__name__', and missing ones are set to the defaults.
+        The parameters of the algorithm are given either by 'alg_config'
+        or at the top level (e.g., tests/test_instance/benders_config.json)
+
+        Args:
+            data (Dict): the dict
+            alg_config_cls (type[_C], optional): the class of alg_config. Defaults to BendersConfig.
+        """
+        _data = dict(data)
+        _data.pop("__name__", None)
+        kwargs = {
+            _key: _as_config(SolverConfig, _data.pop(_key, dict()))
+            for _key in cls._SOLVER_CONFIG_KEYS
+        }
+        kwargs["logging_config"] = _as_config(
+            LoggingConfig, _data.pop("logging_config", dict())
+        )
+        kwargs["alg_config"] = _as_config(
+            alg_config_cls, _data.pop("alg_config", _data)
+        )
+        return cls(**kwargs)
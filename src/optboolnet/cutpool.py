@@ -0,0 +1,110 @@
+"""The pool of the cuts of a master problem with aging
+
+The cuts of a master problem (e.g., logical Benders cuts) are added in every iteration,
+while most of them are slack at the candidates of the current target size.
+A cut that is slack at max_age consecutive solves is removed from the solver and kept in the pool,
+where the max_age of a cut is multiplied by _AGE_GROWTH whenever it is added back
+to avoid removing and adding it repeatedly (each addition costs a solve).
+After a solve, the cuts in the pool are checked against the candidate in Python,
+and the violated ones are added back and the master problem is solved again
+(see MasterControlIP.optimize), so the candidates are the same as without the pool.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from pyomo.repn import generate_standard_repn
+
+if TYPE_CHECKING:
+    from pyomo.core.base.constraint import ConstraintData
+    from pyomo.core.base.var import VarData
+
+_TOLERANCE = 1e-6
+_AGE_GROWTH = 8
+
+
+class _Cut:
+    __slots__ = ["constr", "constant", "terms", "lower", "upper", "age", "max_age"]
+
+    def __init__(self, constr: ConstraintData, max_age: int) -> None:
+        repn = generate_standard_repn(constr.body, compute_values=True)
+        self.constr = constr
+        self.constant: float = repn.constant
+        self.terms: List[Tuple[VarData, float]] = list(zip(repn.linear_vars, repn.linear_coefs))
+        self.lower: Optional[float] = constr.lb
+        self.upper: Optional[float] = constr.ub
+        self.age: int = 0
+        self.max_age = max_age
+
+    def slack(self) -> float:
+        """The slack of the cut at the values of the variables (negative if violated)"""
+        value = self.constant + sum(coef * var.value for var, coef in self.terms)
+        slack = float("inf")
+        if self.lower is not None:
+            slack = value - self.lower
+        if self.upper is not None:
+            slack = min(slack, self.upper - value)
+        return slack
+
+
+class CutPool:
+    """The active cuts of a master problem with their ages, and the inactive cuts removed from the solver"""
+
+    def __init__(self, max_age: int) -> None:
+        """
+
+        Args:
+            max_age (int): the number of consecutive solves at which a new cut is slack before it is removed
+        """
+        self.max_age = max_age
+        self.active: Dict[int, _Cut] = dict()
+        """The cuts in the solver keyed on id of the constraints"""
+        self.inactive: Dict[int, _Cut] = dict()
+        """The cuts in the pool keyed on id of the constraints"""
+        self.num_purged: int = 0
+        """The number of removals"""
+        self.num_reactivated: int = 0
+        """The number of additions of the cuts in the pool"""
+
+    def __len__(self) -> int:
+        return len(self.active) + len(self.inactive)
+
+    def add(self, constr: ConstraintData):
+        """Tracks a new cut in the solver"""
+        self.active[id(constr)] = _Cut(constr, self.max_age)
+
+    def update(self) -> List[ConstraintData]:
+        """Ages the active cuts at the current solution
+
+        Returns:
+            List[ConstraintData]: the cuts to remove from the solver (moved to the pool)
+        """
+        purged = list()
+        for key, cut in list(self.active.items()):
+            if cut.slack() > _TOLERANCE:
+                cut.age += 1
+                if cut.age >= cut.max_age:
+                    cut.age = 0
+                    self.inactive[key] = self.active.pop(key)
+                    purged.append(cut.constr)
+            else:
+                cut.age = 0
+        self.num_purged += len(purged)
+        return purged
+
+    def pop_violated(self) -> List[ConstraintData]:
+        """Checks the cuts in the pool at the current solution
+
+        Returns:
+            List[ConstraintData]: the violated cuts to add back to the solver
+        """
+        violated = list()
+        for key, cut in list(self.inactive.items()):
+            if cut.slack() < -_TOLERANCE:
+                cut.max_age *= _AGE_GROWTH
+                self.active[key] = self.inactive.pop(key)
+                violated.append(cut.constr)
+        self.num_reactivated += len(violated)
+        return violated
+
+    def clear(self):
+        self.active.clear()
+        self.inactive.clear()
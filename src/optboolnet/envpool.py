@@ -0,0 +1,33 @@
+"""The gurobi environment shared by the models of a process
+
+A gurobi environment checks out a license when it starts (a token of the web license service
+for the WLS license of the README). The gurobi solvers of pyomo (gurobi_persistent and gurobi_direct)
+are created with manage_env=False, so all models of all searches in a process already share
+the default environment of gurobipy, which is started by the first model.
+CoreIP.close frees the model of a solver and keeps the default environment,
+and close_solver_environments closes the default environment through pyomo,
+after which the models built before must not be solved and the next model starts a new one.
+"""
+from __future__ import annotations
+from typing import Any
+
+
+def _is_gurobi_solver(solver: Any) -> bool:
+    from pyomo.solvers.plugins.solvers.gurobi_direct import GurobiDirect
+
+    return isinstance(solver, GurobiDirect)
+
+
+def release_solver(solver: Any):
+    """Frees the model of a solver, where the shared environment is kept"""
+    if hasattr(solver, "close"):
+        solver.close()
+
+
+def close_solver_environments():
+    """Closes the default gurobi environment shared by the models of the process"""
+    import pyomo.environ as pmoenv
+
+    solver = pmoenv.SolverFactory("gurobi_direct")
+    if _is_gurobi_solver(solver) and solver.available(exception_flag=False):
+        solver.close_global()
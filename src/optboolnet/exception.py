@@ -12,3 +12,7 @@ class EmptySolutionError(Exception):
 
 class EmptyAttractorError(Warning):
     pass
+
+
+class ExternalSolverError(Exception):
+    pass
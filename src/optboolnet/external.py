@@ -0,0 +1,264 @@
+"""Solving models out of process through MPS/LP files
+
+A model is exported by CoreIP.export with the compact names of its variables
+(e.g., x_i_t, y_i_c_t, d_j_k and h_i_k) and a sidecar index,
+and a solution file is read back by CoreIP.load_solution.
+ExternalSolver runs a command on the exported file in a subprocess,
+so that it can replace a pyomo solver (e.g., SolverConfig(solver_name="external:highs")).
+
+A solution file has a line '<name> <value>' for each variable (the format of gurobi),
+and the status of the solve is given by the comment '# Status <termination condition>'.
+A solve stopped by a limit keeps its status (e.g., maxTimeLimit) even if it has an incumbent,
+which is given by the number of solutions of the results (see CoreIP.has_incumbent).
+
+Example:
+    python -m optboolnet.external model.mps model.sol --solver highs time_limit=60
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from pyomo.opt import SolverResults, TerminationCondition
+from optboolnet.exception import ExternalSolverError
+
+if TYPE_CHECKING:
+    from optboolnet.model import CoreIP
+
+_logger = logging.getLogger("optboolnet.external")
+
+_BACKENDS = ["gurobi", "highs"]
+
+
+def read_solution_file(fname: str) -> Tuple[TerminationCondition, Dict[str, float]]:
+    """Reads a solution file
+
+    Args:
+        fname (str): the path of the file
+
+    Returns:
+        Tuple[TerminationCondition, Dict[str, float]]: the status (optimal if the file has values but no status,
+        and infeasible otherwise) and the values of the variables
+    """
+    status = None
+    values: Dict[str, float] = dict()
+    with open(fname, "r") as _f:
+        for line in _f:
+            tokens = line.split()
+            if not tokens:
+                continue
+            elif tokens[0] == "#":
+                if len(tokens) == 3 and tokens[1] == "Status":
+                    status = TerminationCondition(tokens[2])
+            elif len(tokens) == 2:
+                values[tokens[0]] = float(tokens[1])
+    if status is None:
+        status = TerminationCondition.optimal if values else TerminationCondition.infeasible
+    return status, values
+
+
+def write_solution_file(
+    fname: str,
+    status: TerminationCondition,
+    values: Iterable[Tuple[str, float]],
+    objective: Optional[float] = None,
+):
+    """Writes a solution file (see read_solution_file)"""
+    with open(fname, "w") as _f:
+        _f.write(f"# Status {status.value}\n")
+        if objective is not None:
+            _f.write(f"# Objective value = {objective!r}\n")
+        for name, value in values:
+            _f.write(f"{name} {value!r}\n")
+
+
+class ExternalSolver:
+    """Solves a model by a command in a subprocess, which can be used as the solver of CoreIP.
+    The arguments of the command may have the placeholders {model} and {solution} (the paths of the files),
+    and the argument '{options}' is replaced by the options in the form of 'key=value'"""
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        file_format: str = "mps",
+        workdir: Optional[str] = None,
+    ) -> None:
+        self.command: List[str] = (
+            command
+            if command is not None
+            else [sys.executable, "-m", "optboolnet.external", "{model}", "{solution}", "{options}"]
+        )
+        """The command to solve a model, where the built-in one solves it by gurobi (or HiGHS if gurobi is not available)"""
+        self.file_format = file_format
+        """'mps' or 'lp'"""
+        self.workdir = workdir
+        """The directory of the temporary files (the default temporary directory if None)"""
+        self.options: Dict = dict()
+        self.keepfiles: bool = False
+        """If true, the files of the last solve are not removed (see keepfiles_dir)"""
+        self.keepfiles_dir: Optional[str] = None
+        """The directory of the files kept by the last solve (logged to the 'optboolnet.external' logger)"""
+        self._process: Optional[subprocess.Popen] = None
+
+    @classmethod
+    def from_name(cls, solver_name: str) -> ExternalSolver:
+        """Makes the solver for a solver name 'external' or 'external:<backend>' (e.g., 'external:highs')"""
+        _, _, backend = solver_name.partition(":")
+        solver = cls()
+        if backend:
+            if backend not in _BACKENDS:
+                raise ValueError(
+                    f"Unknown backend '{backend}' of the external solver. Try one of the following: {_BACKENDS}"
+                )
+            solver.command += ["--solver", backend]
+        return solver
+
+    def terminate(self):
+        """Kills the command in progress, which may be called from another thread"""
+        _process = self._process
+        if _process is not None and _process.poll() is None:
+            _process.kill()
+
+    def solve(self, model: CoreIP, tee: bool = False, **kwargs) -> SolverResults:
+        """Solves the model and loads the solution into the model (the other keyword arguments are ignored)"""
+        _tmp_dir = tempfile.mkdtemp(prefix="optboolnet_", dir=self.workdir)
+        model_fname = os.path.join(_tmp_dir, f"model.{self.file_format}")
+        sol_fname = os.path.join(_tmp_dir, "model.sol")
+        _options = [f"{_key}={_value}" for _key, _value in self.options.items() if _value is not None]
+        command = list()
+        for arg in self.command:
+            if arg == "{options}":
+                command += _options
+            else:
+                command.append(arg.format(model=model_fname, solution=sol_fname))
+        _st = time.perf_counter()
+        num_solutions = 0
+        try:
+            model.export(model_fname, index=False)
+            self._process = subprocess.Popen(
+                command,
+                stdout=None if tee else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            _, stderr = self._process.communicate()
+            returncode = self._process.returncode
+            self._process = None
+            if os.path.exists(sol_fname):
+                status, values = read_solution_file(sol_fname)
+                model.set_values(values)
+                num_solutions = 1 if values else 0
+            elif returncode < 0:  # killed by terminate
+                status = TerminationCondition.userInterrupt
+            elif returncode != 0:
+                raise ExternalSolverError(
+                    f"'{' '.join(command)}' failed with exit code {returncode}: {stderr.strip()}"
+                )
+            else:  # e.g., gurobi_cl writes no solution if infeasible
+                status = TerminationCondition.infeasible
+        finally:
+            self._process = None
+            if self.keepfiles:
+                self.keepfiles_dir = _tmp_dir
+                _logger.info(f"Files of the external solver: {_tmp_dir}")
+            else:
+                shutil.rmtree(_tmp_dir, ignore_errors=True)
+        results = SolverResults()
+        results.solver.termination_condition = status
+        results.problem.number_of_solutions = num_solutions
+        results.solver.wallclock_time = time.perf_counter() - _st
+        return results
+
+
+def _parse_option(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _solve_gurobi(model_fname: str, options: Dict):
+    import gurobipy as gp
+
+    _status_dict = {
+        gp.GRB.OPTIMAL: TerminationCondition.optimal,
+        gp.GRB.INFEASIBLE: TerminationCondition.infeasible,
+        gp.GRB.INF_OR_UNBD: TerminationCondition.infeasibleOrUnbounded,
+        gp.GRB.UNBOUNDED: TerminationCondition.unbounded,
+        gp.GRB.TIME_LIMIT: TerminationCondition.maxTimeLimit,
+    }
+    with gp.Env(params={"OutputFlag": 0}) as env, gp.read(model_fname, env) as model:
+        for _key, _value in options.items():
+            model.setParam(_key, _value)
+        model.optimize()
+        status = _status_dict.get(model.Status, TerminationCondition.unknown)
+        if model.SolCount == 0:
+            return status, None, list()
+        if status == TerminationCondition.unknown:  # e.g., a solution limit
+            status = TerminationCondition.feasible
+        _vars = model.getVars()
+        return status, model.ObjVal, list(zip(model.getAttr("VarName", _vars), model.getAttr("X", _vars)))
+
+
+def _solve_highs(model_fname: str, options: Dict):
+    import highspy
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.readModel(model_fname)  # before the options, since the time limit of HiGHS counts the reading
+    for _key, _value in options.items():
+        h.setOptionValue(_key, _value)
+    h.run()
+    _status = h.getModelStatus()
+    _status_dict = {
+        highspy.HighsModelStatus.kOptimal: TerminationCondition.optimal,
+        highspy.HighsModelStatus.kInfeasible: TerminationCondition.infeasible,
+        highspy.HighsModelStatus.kUnboundedOrInfeasible: TerminationCondition.infeasibleOrUnbounded,
+        highspy.HighsModelStatus.kUnbounded: TerminationCondition.unbounded,
+        highspy.HighsModelStatus.kTimeLimit: TerminationCondition.maxTimeLimit,
+    }
+    status = _status_dict.get(_status, TerminationCondition.unknown)
+    info = h.getInfo()
+    if info.primal_solution_status != 2:  # no feasible solution
+        return status, None, list()
+    if status == TerminationCondition.unknown:  # e.g., a solution limit
+        status = TerminationCondition.feasible
+    col_values = h.getSolution().col_value
+    names = [h.getColName(idx)[1] for idx in range(len(col_values))]
+    return status, info.objective_function_value, list(zip(names, col_values))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Solves an MPS/LP file and writes the solution file (the built-in command of ExternalSolver)"""
+    parser = argparse.ArgumentParser(prog="python -m optboolnet.external")
+    parser.add_argument("model", help="the path of an MPS or LP file")
+    parser.add_argument("solution", help="the path of the solution file to write")
+    parser.add_argument("options", nargs="*", help="the options of the solver in the form of 'key=value'")
+    parser.add_argument("--solver", choices=_BACKENDS, default=None, help="gurobi by default if available, otherwise highs")
+    args = parser.parse_args(argv)
+    options = {
+        _key: _parse_option(_value)
+        for _key, _, _value in (option.partition("=") for option in args.options)
+    }
+    backend = args.solver
+    if backend is None:
+        try:
+            import gurobipy
+            backend = "gurobi"
+        except ImportError:
+            backend = "highs"
+    status, objective, values = (_solve_gurobi if backend == "gurobi" else _solve_highs)(
+        args.model, options
+    )
+    write_solution_file(args.solution, status, values, objective)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
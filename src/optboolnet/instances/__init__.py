@@ -1,6 +1,11 @@
+from __future__ import annotations
+import hashlib
+import json
 import os
+from collections import OrderedDict
 import optboolnet as optbn
 from optboolnet.config import ControlConfig
+from optboolnet.version import __version__
 from typing import Dict, List
 
 _INSTANCE_PATH = os.path.dirname(__file__)
@@ -13,39 +18,114 @@ _INSTANCE_LIST_FULL: List = [
     inst for inst_list in _INSTANCE_GROUPS.values() for inst in inst_list
 ]
 
+_CACHE_SIZE = 64
+"""The number of networks kept in the process-level cache"""
+_BN_CACHE: "OrderedDict[str, optbn.CNFBooleanNetwork]" = OrderedDict()
 
-def load_bn(fpath: str):
-    return optbn.CNFBooleanNetwork(
-        data=f"{fpath}/transition_formula.bnet",
-        control_config=ControlConfig.from_json(f"{fpath}/control_setting.json"),
-    )
 
+def get_cache_dir() -> str:
+    """The directory of the on-disk cache of parsed networks.
+    It is given by the environment variable OPTBOOLNET_CACHE_DIR (e.g., ~/.cache/optboolnet),
+    and the on-disk cache is disabled if it is not set"""
+    return os.environ.get("OPTBOOLNET_CACHE_DIR", "")
 
-def iter_bn(path_name: str):
-    for fpath in os.listdir(path_name):
-        yield fpath, optbn.CNFBooleanNetwork(
-            data=f"{path_name}/{fpath}/transition_formula.bnet",
-            control_config=ControlConfig.from_json(
-                f"{path_name}/{fpath}/control_setting.json"
-            ),
+
+def clear_cache(disk: bool = False):
+    """Clears the process-level cache (and the on-disk cache if disk is true)"""
+    _BN_CACHE.clear()
+    _cache_dir = get_cache_dir()
+    if disk and _cache_dir and os.path.exists(_cache_dir):
+        for fname in os.listdir(_cache_dir):
+            if fname.endswith(".json"):
+                os.remove(os.path.join(_cache_dir, fname))
+
+
+def _read_cache_file(fname: str):
+    try:
+        with open(fname, "r") as _f:
+            data = json.load(_f)
+        return optbn.CNFBooleanNetwork.from_clause_table(
+            data["clause_table"], ControlConfig.from_dict(data["control_config"])
+        )
+    except (OSError, ValueError, KeyError):  # missing or corrupted
+        return None
+
+
+def _write_cache_file(fname: str, bn: optbn.CNFBooleanNetwork, config_dict: Dict):
+    try:
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        _tmp_fname = f"{fname}.{os.getpid()}.tmp"
+        with open(_tmp_fname, "w") as _f:
+            json.dump(
+                {"clause_table": bn.to_clause_table(), "control_config": config_dict},
+                _f,
+            )
+        os.replace(_tmp_fname, fname)
+    except OSError:  # e.g., a read-only file system
+        pass
+
+
+def load_bn(fpath: str, use_cache: bool = False):
+    """Loads the network in a directory with transition_formula.bnet and control_setting.json
+
+    Args:
+        fpath (str): the path of the directory
+        use_cache (bool, optional): If true, a parsed network is reused as long as the files are not changed.
+        The networks are kept in a process-level LRU cache and in the on-disk cache (if enabled, see get_cache_dir),
+        and the same object is returned for the same files, which should not be modified.
+        Defaults to False (a new network at every call).
+    """
+    if not use_cache:
+        return optbn.CNFBooleanNetwork(
+            data=f"{fpath}/transition_formula.bnet",
+            control_config=ControlConfig.from_json(f"{fpath}/control_setting.json"),
+        )
+    with open(f"{fpath}/transition_formula.bnet", "rb") as _f:
+        bnet_data = _f.read()
+    with open(f"{fpath}/control_setting.json", "rb") as _f:
+        config_data = _f.read()
+    key = hashlib.sha256(
+        b"\0".join([__version__.encode(), bnet_data, config_data])
+    ).hexdigest()
+    if key in _BN_CACHE:
+        _BN_CACHE.move_to_end(key)
+        return _BN_CACHE[key]
+
+    _cache_dir = get_cache_dir()
+    _cache_fname = os.path.join(_cache_dir, f"{key}.json") if _cache_dir else ""
+    bn = _read_cache_file(_cache_fname) if _cache_fname else None
+    if bn is None:
+        config_dict = json.loads(config_data)
+        bn = optbn.CNFBooleanNetwork(
+            data=bnet_data.decode(),
+            control_config=ControlConfig.from_dict(dict(config_dict)),
         )
+        if _cache_fname:
+            _write_cache_file(_cache_fname, bn, config_dict)
+
+    _BN_CACHE[key] = bn
+    if len(_BN_CACHE) > _CACHE_SIZE:
+        _BN_CACHE.popitem(last=False)
+    return bn
+
+
+def iter_bn(path_name: str, use_cache: bool = False):
+    for fpath in os.listdir(path_name):
+        yield fpath, load_bn(f"{path_name}/{fpath}", use_cache)
 
 
-def load_bn_in_repo(name: str):
+def load_bn_in_repo(name: str, use_cache: bool = False):
     if name not in _INSTANCE_LIST_FULL:
         raise FileNotFoundError(
             f"Instance '{name}' is not in the repository. Try one of the following: {_INSTANCE_LIST_FULL}"
         )
 
-    return optbn.CNFBooleanNetwork(
-        data=f"{_INSTANCE_PATH}/{name}/transition_formula.bnet",
-        control_config=ControlConfig.from_json(
-            f"{_INSTANCE_PATH}/{name}/control_setting.json"
-        ),
-    )
+    return load_bn(f"{_INSTANCE_PATH}/{name}", use_cache)
 
 
-def iter_bn_in_repo(group_name_list: List[str] = ["small", "medium", "large"]):
+def iter_bn_in_repo(
+    group_name_list: List[str] = ["small", "medium", "large"], use_cache: bool = False
+):
     for inst_group_name in group_name_list:
         for inst in _INSTANCE_GROUPS[inst_group_name]:
-            yield inst, load_bn_in_repo(inst)
+            yield inst, load_bn_in_repo(inst, use_cache)
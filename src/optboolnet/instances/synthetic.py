@@ -0,0 +1,167 @@
+from __future__ import annotations
+import json
+import math
+import os
+import random
+from typing import Dict, List, Tuple
+import optboolnet as optbn
+from optboolnet.config import ControlConfig
+
+_PHENOTYPE = "p"
+
+
+def _sample_in_degree(
+    rng: random.Random, distribution: str, mean_in_degree: float, max_in_degree: int
+) -> int:
+    if distribution == "fixed":
+        degree = round(mean_in_degree)
+    elif distribution == "poisson":  # Knuth's algorithm
+        threshold, degree, prod = math.exp(-mean_in_degree), 0, 1.0
+        while True:
+            prod *= rng.random()
+            if prod <= threshold:
+                break
+            degree += 1
+    elif distribution == "powerlaw":  # P(k) ~ k^(-2.5), a scale-free in-degree
+        _max = min(max_in_degree, 64)
+        weights = [k**-2.5 for k in range(1, _max + 1)]
+        degree = rng.choices(range(1, _max + 1), weights=weights)[0]
+    else:
+        raise ValueError(f"Unknown in-degree distribution '{distribution}'")
+    return min(max(degree, 1), max_in_degree)
+
+
+def _cnf_formula(
+    rng: random.Random, regulators: List[str], clause_width: int, negation_prob: float
+) -> str:
+    literals = [
+        f"!{reg}" if rng.random() < negation_prob else reg for reg in regulators
+    ]
+    clauses = [
+        literals[idx : idx + clause_width]
+        for idx in range(0, len(literals), clause_width)
+    ]
+    return " & ".join(
+        f"({' | '.join(clause)})" if len(clause) > 1 else clause[0]
+        for clause in clauses
+    )
+
+
+def generate_bnet(
+    num_nodes: int,
+    seed: int = 0,
+    in_degree: str = "poisson",
+    mean_in_degree: float = 2.0,
+    clause_width: int = 2,
+    num_sccs: int = 1,
+    input_ratio: float = 0.05,
+    readout_ratio: float = 0.05,
+    phenotype_size: int = 2,
+    negation_prob: float = 0.3,
+    intra_scc_prob: float = 0.8,
+) -> Tuple[str, ControlConfig]:
+    """Generates a random Boolean network in CNF with a phenotype node 'p'
+
+    The nodes are split into inputs (constant up to the initial state, e.g., 'i0, i0'),
+    core nodes and read-outs. The core nodes are partitioned into num_sccs modules,
+    each of which is strongly connected by a ring, and the other regulators of a core node
+    are drawn from its own module or from the inputs and the preceding modules,
+    so that the modules are exactly the nontrivial strongly connected components.
+    A read-out only regulates the phenotype 'p', which is the conjunction of phenotype_size literals of read-outs.
+
+    Args:
+        num_nodes (int): the number of nodes except the phenotype
+        seed (int, optional): the random seed. Defaults to 0.
+        in_degree (str, optional): 'poisson', 'powerlaw' or 'fixed'. Defaults to "poisson".
+        mean_in_degree (float, optional): the mean in-degree of core nodes (ignored for 'powerlaw'). Defaults to 2.0.
+        clause_width (int, optional): the maximum number of literals in a clause. Defaults to 2.
+        num_sccs (int, optional): the number of strongly connected modules. Defaults to 1.
+        input_ratio (float, optional): the ratio of input nodes. Defaults to 0.05.
+        readout_ratio (float, optional): the ratio of read-out nodes. Defaults to 0.05.
+        phenotype_size (int, optional): the number of read-outs in the phenotype. Defaults to 2.
+        negation_prob (float, optional): the probability that a literal is negative. Defaults to 0.3.
+        intra_scc_prob (float, optional): the probability that a regulator is in the same module. Defaults to 0.8.
+
+    Returns:
+        Tuple[str, ControlConfig]: the bnet text and the control config
+    """
+    rng = random.Random(seed)
+    num_inputs = max(1, round(num_nodes * input_ratio))
+    num_readouts = max(phenotype_size, round(num_nodes * readout_ratio))
+    num_core = num_nodes - num_inputs - num_readouts
+    if num_core < num_sccs:
+        raise ValueError(
+            f"{num_nodes} nodes are not enough for {num_sccs} modules, {num_inputs} inputs and {num_readouts} read-outs"
+        )
+    inputs = [f"i{idx}" for idx in range(num_inputs)]
+    core = [f"x{idx}" for idx in range(num_core)]
+    readouts = [f"r{idx}" for idx in range(num_readouts)]
+    bounds = [round(num_core * k / num_sccs) for k in range(num_sccs + 1)]
+    modules = [core[bounds[k] : bounds[k + 1]] for k in range(num_sccs)]
+
+    formulas: Dict[str, str] = {inp: inp for inp in inputs}
+    upstream: List[str] = list(inputs)
+    for module in modules:
+        for pos, node in enumerate(module):
+            ring_pred = module[pos - 1]
+            candidates_intra = [n for n in module if n != ring_pred]
+            max_degree = 1 + len(candidates_intra) + len(upstream)
+            degree = _sample_in_degree(rng, in_degree, mean_in_degree, max_degree)
+            regulators = [ring_pred]
+            while len(regulators) < degree:
+                pool = (
+                    candidates_intra
+                    if (rng.random() < intra_scc_prob or not upstream)
+                    and candidates_intra
+                    else upstream
+                )
+                reg = rng.choice(pool)
+                if reg not in regulators:
+                    regulators.append(reg)
+            rng.shuffle(regulators)
+            formulas[node] = _cnf_formula(rng, regulators, clause_width, negation_prob)
+        upstream += module
+    for readout in readouts:
+        regulators = rng.sample(core, min(len(core), rng.randint(1, clause_width)))
+        formulas[readout] = _cnf_formula(rng, regulators, clause_width, negation_prob)
+    formulas[_PHENOTYPE] = _cnf_formula(
+        rng, rng.sample(readouts, phenotype_size), 1, negation_prob
+    )
+
+    config = ControlConfig()
+    config.controllable_vars = inputs + core
+    config.uncontrollable_vars = readouts + [_PHENOTYPE]
+    config.fixed_values = dict()
+    config.phenotype = _PHENOTYPE
+    bnet = "\n".join(f"{node}, {formula}" for node, formula in formulas.items())
+    return bnet, config
+
+
+def generate_bn(num_nodes: int, seed: int = 0, **kwargs) -> optbn.CNFBooleanNetwork:
+    """Generates a random CNFBooleanNetwork (see generate_bnet for the arguments)"""
+    bnet, config = generate_bnet(num_nodes, seed, **kwargs)
+    return optbn.CNFBooleanNetwork(data=bnet, control_config=config)
+
+
+def write_instance(fpath: str, num_nodes: int, seed: int = 0, **kwargs):
+    """Writes a random network in the layout of the bundled instances,
+    so that it can be loaded by optboolnet.instances.load_bn"""
+    bnet, config = generate_bnet(num_nodes, seed, **kwargs)
+    if not os.path.exists(fpath):
+        os.makedirs(fpath)
+    with open(f"{fpath}/transition_formula.bnet", "w") as _f:
+        _f.write(bnet + "\n")
+    _config_dict = config.to_dict()
+    _config_dict["__name__"] = "control"
+    with open(f"{fpath}/control_setting.json", "w") as _f:
+        json.dump(_config_dict, _f, indent=4)
+
+
+def synthetic_name(num_nodes: int, seed: int = 0) -> str:
+    return f"syn_{num_nodes}_{seed}"
+
+
+def load_synthetic_bn(name: str) -> optbn.CNFBooleanNetwork:
+    """Generates the network of a name 'syn_<num_nodes>_<seed>' with the default parameters"""
+    _, num_nodes, seed = name.split("_")
+    return generate_bn(int(num_nodes), int(seed))
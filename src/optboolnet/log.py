@@ -1,17 +1,22 @@
 from __future__ import annotations
 import json
 import os
-from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 import logging
 import enum
+import functools
+import inspect
+import types
 from typing import Callable
 import time
-from optboolnet.boolnet import Control
 from optboolnet.config import LoggingConfig
+from optboolnet.sink import ResultSink, make_result_sink
 
 if TYPE_CHECKING:
+    from optboolnet.boolnet import Control
     from optboolnet.model import CoreIP, Model
-    from optboolnet.algorithm import BendersAttractorControl
+    from optboolnet.algorithm import AttractorControl
+    from optboolnet.profiling import PhaseProfiler
 
 
 class EnumCutType(enum.Enum):
@@ -26,6 +31,7 @@ class EnumCutType(enum.Enum):
     NO_GOOD_LOWER_LEVEL = 2
     ATTRACTOR_CUT = 3
     TRAP_SPACE_CUT = 4
+    STRENGTHENED_ATTRACTOR_CUT = 5
 
 
 class EnumBendersStep(enum.Enum):
@@ -89,18 +95,37 @@ class BendersLogger:
         if self.config.fpath != "":
             if not os.path.exists(self.config.fpath):  # making a directory
                 os.makedirs(self.config.fpath)
-            for log_type in ["build", "solve", "cut"]:
-                _logger = logging.getLogger(f"optboolnet.benders.{log_type}")
-                _logger.setLevel(logging.INFO)
-                for _old_handler in _logger.handlers:
-                    _logger.removeHandler(_old_handler)
-                self.__setattr__(f"{log_type}_logger", _logger)
-                fhdler = logging.FileHandler(
-                    f"{self.config.fpath}/log_{self.config.fname}_{log_type}.txt"
+            self.open()
+
+    def open(self):
+        for log_type in ["build", "solve", "cut"]:
+            _logger = logging.getLogger(f"optboolnet.benders.{log_type}")
+            _logger.setLevel(logging.INFO)
+            for _old_handler in _logger.handlers:
+                _logger.removeHandler(_old_handler)
+            self.__setattr__(f"{log_type}_logger", _logger)
+            fhdler = logging.FileHandler(
+                f"{self.config.fpath}/log_{self.config.fname}_{log_type}.txt"
+            )
+            fhdler.setFormatter(logging.Formatter(f"%(levelname)s,%(message)s"))
+            _logger.addHandler(fhdler)
+        self.write_header()
+
+    def close(self):
+        """Writes any pending records (nothing to do for the text backend)"""
+        pass
+
+    def bind(self, _model: AttractorControl):
+        """Replaces the logging wrappers of the model with the bare methods if logging is off,
+        so that a disabled logger costs nothing in the hot path"""
+        if self.is_on:
+            return
+        for _name in ["_build_model", "_optimize", "_append_cut"]:
+            _method = getattr(type(_model), _name)
+            if hasattr(_method, "__wrapped__"):
+                _model.__dict__[_name] = types.MethodType(
+                    inspect.unwrap(_method), _model
                 )
-                fhdler.setFormatter(logging.Formatter(f"%(levelname)s,%(message)s"))
-                _logger.addHandler(fhdler)
-            self.write_header()
 
     def write_header(self):
         self.build_logger.info(",".join(self.build_log_columns))
@@ -116,18 +141,63 @@ class BendersLogger:
             with open(f"{self.config.fpath}/sol.json", "w") as _f:
                 json.dump(sol_dict, _f)
 
+    def make_result_sink(self) -> Optional[ResultSink]:
+        """Creates the streaming result sink given by the config (None if not specified)"""
+        if self.is_on:
+            return make_result_sink(
+                self.config.sink_format,
+                f"{self.config.fpath}/sol_{self.config.fname}",
+            )
+        return None
+
+    def write_profile(self, profiler: PhaseProfiler):
+        """Writes the summary table of a profiler (and the report of an external profiler)"""
+        if self.is_on:
+            with open(f"{self.config.fpath}/profile_{self.config.fname}.txt", "w") as _f:
+                _f.write(profiler.summary() + "\n")
+                _f.write(profiler.external_report())
+
+    def write_length_statistics(self, records: List[Dict]):
+        """Writes the statistics of the lengths of the lower level problems (see AdaptiveLengthScheduler)"""
+        if self.is_on and records:
+            with open(f"{self.config.fpath}/length_stats_{self.config.fname}.csv", "w") as _f:
+                _f.write(",".join(records[0].keys()) + "\n")
+                for _record in records:
+                    _f.write(",".join(str(_value) for _value in _record.values()) + "\n")
+
     def solve_logger_info(self, msg: str):
         if self.is_on:
             self.solve_logger.info(msg)
 
+    def log_step(self, _model: AttractorControl):
+        """Records the current step of the model (e.g., the end of a target size)"""
+        if self.is_on:
+            self.solve_logger.info(_model.log_signature)
+
+    def log_build(self, _model: AttractorControl, model_name: str, build_time: float):
+        self.build_logger.info(f"{_model.log_signature},{model_name},{build_time:.3f}")
+
+    def log_solve(
+        self,
+        _model: AttractorControl,
+        model_name: str,
+        solve_time: float,
+        feasible: bool,
+    ):
+        self.solve_logger.info(
+            f"{_model.log_signature},{model_name},{solve_time:.3f},{feasible}"
+        )
+
+    def log_cut(self, _model: AttractorControl, cut_type: EnumCutType, strength: int):
+        self.cut_logger.info(f"{_model.log_signature},{cut_type.name},{strength}")
+
     @staticmethod
     def wrap_cut(func: Callable):
-        def wrapper(_model: BendersAttractorControl, *args):
+        @functools.wraps(func)
+        def wrapper(_model: AttractorControl, *args):
             result: Tuple[EnumCutType, int] = func(_model, *args)
             if _model.logger.is_on:
-                _model.logger.cut_logger.info(
-                    f"{_model.log_signature},{result[0].name},{result[1]}"
-                )
+                _model.logger.log_cut(_model, result[0], result[1])
 
             return result
 
@@ -135,28 +205,234 @@ class BendersLogger:
 
     @staticmethod
     def wrap_model_build(
-        func: Callable[[BendersAttractorControl, type[Model], Any], type[Model]]
+        func: Callable[[AttractorControl, type[Model], Any], type[Model]]
     ):
-        def wrapper(_model: BendersAttractorControl, *args):
+        @functools.wraps(func)
+        def wrapper(_model: AttractorControl, *args, **kwargs):
             _st = time.time()
-            result = func(_model, *args)
+            result = func(_model, *args, **kwargs)
             if _model.logger.is_on:
-                _model.logger.build_logger.info(
-                    f"{_model.log_signature},{result.name},{time.time()-_st:.3f}"
-                )
+                _model.logger.log_build(_model, result.name, time.time() - _st)
             return result
 
         return wrapper
 
     @staticmethod
     def wrap_model_optimize(func: Callable):
-        def wrapper(_model: BendersAttractorControl, problem: CoreIP):
+        @functools.wraps(func)
+        def wrapper(_model: AttractorControl, problem: CoreIP):
             _st = time.time()
             result: CoreIP = func(_model, problem)
             if _model.logger.is_on:
-                _model.logger.solve_logger.info(
-                    f"{_model.log_signature},{problem.name},{time.time()-_st:.3f},{result}"
+                _model.logger.log_solve(
+                    _model, problem.name, time.time() - _st, result
                 )
             return result
 
         return wrapper
+
+
+class _ColumnBuffer:
+    """A preallocated NumPy structured array that is flushed to a file when it is full
+    (the columns of strings are object columns)"""
+
+    def __init__(
+        self,
+        fname: str,
+        dtype: List[Tuple[str, str]],
+        size: int,
+        fmt: str,
+        converters: Dict[str, Callable] = dict(),
+    ):
+        import numpy
+
+        self.fname = fname
+        self.converters = converters
+        """(key) the name of a column (value) the function converting its values when they are written"""
+        self.data = numpy.zeros(size, dtype=dtype)
+        self.size = size
+        self.idx = 0
+        self.fmt = fmt
+        self._writer = None
+        self._is_written = False
+        if self.fmt == "csv":
+            with open(self.fname, "w") as _f:
+                _f.write(",".join(self.data.dtype.names) + "\n")
+
+    def append(self, row: Tuple):
+        self.data[self.idx] = row
+        self.idx += 1
+        if self.idx == self.size:
+            self.flush()
+
+    def columns(self) -> Dict[str, List]:
+        return {
+            _name: self.data[_name][: self.idx].tolist()
+            for _name in self.data.dtype.names
+        }
+
+    def flush(self):
+        if self.idx == 0:
+            return
+        _columns = self.columns()
+        for _name, _conv in self.converters.items():
+            if _name in _columns:
+                _columns[_name] = [_conv(_value) for _value in _columns[_name]]
+        if self.fmt == "csv":
+            with open(self.fname, "a") as _f:
+                _f.writelines(
+                    ",".join(str(_value) for _value in _row) + "\n"
+                    for _row in zip(*_columns.values())
+                )
+        else:
+            import pyarrow
+            import pyarrow.parquet
+
+            table = pyarrow.Table.from_pydict(_columns)
+            if self._writer is None:
+                # a Parquet file closed by a former search cannot be appended, so its rows are written again
+                _old = pyarrow.parquet.read_table(self.fname) if self._is_written else None
+                self._writer = pyarrow.parquet.ParquetWriter(self.fname, table.schema)
+                self._is_written = True
+                if _old is not None:
+                    self._writer.write_table(_old.cast(table.schema))
+            self._writer.write_table(table)
+        self.idx = 0
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ColumnarBendersLogger(BendersLogger):
+    """The logging backend that records build/solve/cut/step events into preallocated columnar buffers.
+    Each buffer is written to a CSV or a Parquet file in a batch when it is full and on close.
+    The columns are the same as the ones of BendersLogger, and the steps have the columns common to all events"""
+
+    def open(self):
+        _size = self.config.buffer_size
+        _fmt = self.config.backend
+        _prefix = f"{self.config.fpath}/log_{self.config.fname}"
+        _converters = {
+            "step": lambda _value: EnumBendersStep(_value).name,
+            "cut_type": lambda _value: EnumCutType(_value).name,
+        }
+        # the names are kept as objects since a fixed-width string would truncate the long ones
+        _common = [
+            ("timestamp", "f8"),
+            ("experiment", "O"),
+            ("level", "i4"),
+            ("step", "i1"),
+        ]
+        self._buffers = {
+            "build": _ColumnBuffer(
+                f"{_prefix}_build.{_fmt}",
+                _common + [("model", "O"), ("build_time", "f8")],
+                _size,
+                _fmt,
+                _converters,
+            ),
+            "solve": _ColumnBuffer(
+                f"{_prefix}_solve.{_fmt}",
+                _common + [("model", "O"), ("solve_time", "f8"), ("feasible", "?")],
+                _size,
+                _fmt,
+                _converters,
+            ),
+            "cut": _ColumnBuffer(
+                f"{_prefix}_cut.{_fmt}",
+                _common + [("cut_type", "i1"), ("cut_strength", "i4")],
+                _size,
+                _fmt,
+                _converters,
+            ),
+            "step": _ColumnBuffer(
+                f"{_prefix}_step.{_fmt}", _common, _size, _fmt, _converters
+            ),
+        }
+
+    def flush(self):
+        if self.is_on:
+            for _buffer in self._buffers.values():
+                _buffer.flush()
+
+    def close(self):
+        if self.is_on:
+            for _buffer in self._buffers.values():
+                _buffer.close()
+
+    def solve_logger_info(self, msg: str):
+        pass
+
+    def log_step(self, _model: AttractorControl):
+        if self.is_on:
+            self._buffers["step"].append(
+                (
+                    time.time() - _model.start_time,
+                    _model.name,
+                    _model.target_size,
+                    _model.step.value,
+                )
+            )
+
+    def log_build(self, _model: AttractorControl, model_name: str, build_time: float):
+        self._buffers["build"].append(
+            (
+                time.time() - _model.start_time,
+                _model.name,
+                _model.target_size,
+                _model.step.value,
+                model_name,
+                build_time,
+            )
+        )
+
+    def log_solve(
+        self,
+        _model: AttractorControl,
+        model_name: str,
+        solve_time: float,
+        feasible: bool,
+    ):
+        self._buffers["solve"].append(
+            (
+                time.time() - _model.start_time,
+                _model.name,
+                _model.target_size,
+                _model.step.value,
+                model_name,
+                solve_time,
+                feasible,
+            )
+        )
+
+    def log_cut(self, _model: AttractorControl, cut_type: EnumCutType, strength: int):
+        self._buffers["cut"].append(
+            (
+                time.time() - _model.start_time,
+                _model.name,
+                _model.target_size,
+                _model.step.value,
+                cut_type.value,
+                strength,
+            )
+        )
+
+
+def make_logger(_config: LoggingConfig) -> BendersLogger:
+    """Creates the logger of the backend given by the config
+
+    Args:
+        _config (LoggingConfig): the logging config
+
+    Returns:
+        BendersLogger: the text logger ('text') or the columnar logger ('csv' or 'parquet')
+    """
+    if _config.backend == "text":
+        return BendersLogger(_config)
+    elif _config.backend in ["csv", "parquet"]:
+        return ColumnarBendersLogger(_config)
+    else:
+        raise ValueError(f"Unknown logging backend '{_config.backend}'")
@@ -1,13 +1,19 @@
+import json
+import os
+import re
 import sys
-from typing import Dict, Generator, Iterator, List, Optional, TypeVar
-from optboolnet import CNFBooleanNetwork, Attractor, Control, Hypercube
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple, TypeVar
+from optboolnet import CNFBooleanNetwork, Attractor, Control, Hypercube, ORClause
 from optboolnet.config import SolverConfig
+from optboolnet.cutpool import CutPool
+from optboolnet.envpool import release_solver
 from optboolnet.log import EnumCutType
 from pyomo.solvers.plugins.solvers.direct_or_persistent_solver import (
     DirectOrPersistentSolver,
 )
 from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
-from pyomo.opt import TerminationCondition, SolverResults
+from pyomo.opt import TerminationCondition, SolverResults, WriterFactory
+from pyomo.repn import generate_standard_repn
 import pyomo.environ as pmoenv
 
 # TODO: lazy cut implementation for persistent solvers
@@ -29,6 +35,17 @@ class LiteralCounter(Iterator):
     __next__ = next
 
 
+def _compact_name(component_name: str, index: Any) -> str:
+    """The name of a variable or a constraint in MPS/LP files (e.g., x_i_t for x[i,t])"""
+    if index is None:
+        name = component_name
+    elif isinstance(index, tuple):
+        name = "_".join([component_name] + [str(_idx) for _idx in index])
+    else:
+        name = f"{component_name}_{index}"
+    return re.sub(r"[^A-Za-z0-9_.]", "_", name)
+
+
 class CoreIP(pmoenv.ConcreteModel):
     """The basic extension for handling a Boolean network
     and iterative problem solving with both direct and persitent solver"""
@@ -81,9 +98,14 @@ class CoreIP(pmoenv.ConcreteModel):
         self.neg_lit = pmoenv.Set(dimen=3, initialize=neg_lit_init)
         """"""
         ### ======== solver
-        self.solver: DirectOrPersistentSolver = pmoenv.SolverFactory(
-            self.solver_config.solver_name
-        )
+        if self.solver_config.solver_name.startswith("external"):
+            from optboolnet.external import ExternalSolver
+
+            self.solver = ExternalSolver.from_name(self.solver_config.solver_name)
+        else:
+            self.solver: DirectOrPersistentSolver = pmoenv.SolverFactory(
+                self.solver_config.solver_name
+            )
         self.solver.options = solver_config.options
         # self.solver._max_constraint_degree = 1  # for efficienct parsing
         if isinstance(self.solver, PersistentSolver):
@@ -95,18 +117,235 @@ class CoreIP(pmoenv.ConcreteModel):
         self.set_objective(1)
         self.dummy_zero = pmoenv.ScalarVar(domain=[0, 0])
         self.append_vars_to_solvers([self.dummy_zero])
+        self.results: Optional[SolverResults] = None
+        """The results of the last solve"""
+        self.warmstart: Optional[bool] = None
+        """If not None, overrides the warmstart of the solver config,
+        which gives the current values of the variables (e.g., the last solution) to the solver"""
+
+    def get_solver_statistics(self) -> Dict[str, Optional[float]]:
+        """The statistics of the last solve reported by the solver
+
+        Returns:
+            Dict[str, Optional[float]]: runtime, node_count and mip_gap (None if not available)
+        """
+        stats = {"runtime": None, "node_count": None, "mip_gap": None}
+        _solver_model = getattr(self.solver, "_solver_model", None)
+        if _solver_model is not None and hasattr(_solver_model, "Runtime"):  # gurobi
+            for _key, _attr in [
+                ("runtime", "Runtime"),
+                ("node_count", "NodeCount"),
+                ("mip_gap", "MIPGap"),
+            ]:
+                try:
+                    stats[_key] = float(getattr(_solver_model, _attr))
+                except Exception:  # not available for the current status
+                    pass
+        elif self.results is not None:
+            stats["runtime"] = getattr(self.results.solver, "wallclock_time", None)
+        return stats
+
+    def terminate(self):
+        """Interrupts the solve in progress, which may be called from another thread.
+        Only supported by the solvers with a terminate hook (e.g., gurobi)"""
+        _solver_model = getattr(self.solver, "_solver_model", None)
+        if _solver_model is not None and hasattr(_solver_model, "terminate"):
+            _solver_model.terminate()
+        elif hasattr(self.solver, "terminate"):  # e.g., ExternalSolver
+            self.solver.terminate()
+
+    def reset(self, solver_config: SolverConfig):
+        """Restores the state of the model right after it is built (see optboolnet.template)
+        and applies a solver config with the same solver name.
+        The subclasses clear the cuts and relax the bounds changed by a search
+
+        Args:
+            solver_config (SolverConfig): the solver config of the next search
+        """
+        self.solver_config = solver_config
+        self.solver.options = solver_config.options
+        _solver_model = getattr(self.solver, "_solver_model", None)
+        if self.results is not None and hasattr(_solver_model, "resetParams"):
+            # gurobi keeps the parameters given by the options of the former solves
+            _solver_model.resetParams()
+        self.warmstart = None
+        self.results = None
+
+    def close(self):
+        """Frees the model of the solver, where the shared solver environment is kept (see optboolnet.envpool).
+        The model cannot be solved afterwards"""
+        release_solver(self.solver)
+
+    def get_model_size(self) -> Dict[str, int]:
+        """The size of the model
+
+        Returns:
+            Dict[str, int]: rows (the constraints), cols (the variables) and nnz (the nonzeros of the constraints)
+        """
+        _solver_model = getattr(self.solver, "_solver_model", None)
+        if isinstance(self.solver, PersistentSolver) and hasattr(_solver_model, "NumNZs"):
+            _solver_model.update()
+            return {
+                "rows": _solver_model.NumConstrs,
+                "cols": _solver_model.NumVars,
+                "nnz": _solver_model.NumNZs,
+            }
+        rows, nnz = 0, 0
+        for con in self.component_data_objects(pmoenv.Constraint, active=True):
+            rows += 1
+            nnz += len(generate_standard_repn(con.body, compute_values=False).linear_vars)
+        cols = sum(1 for _ in self.component_data_objects(pmoenv.Var))
+        return {"rows": rows, "cols": cols, "nnz": nnz}
+
+    def get_name_map(self) -> Dict[str, pmoenv.Var]:
+        """The compact names of the variables in MPS/LP files (e.g., x_i_t, y_i_c_t, d_j_k and h_i_k),
+        which only depend on the network and the class of the model
+
+        Returns:
+            Dict[str, pmoenv.Var]: (key) name (value) variable in the order of declaration
+        """
+        name_map: Dict[str, pmoenv.Var] = dict()
+        for component in self.component_objects(pmoenv.Var, descend_into=False):
+            for index, var in component.items():
+                base_name = _compact_name(component.local_name, index)
+                name, k = base_name, 0
+                while name in name_map:  # e.g., the variables 'a-b' and 'a_b'
+                    k += 1
+                    name = f"{base_name}_{k}"
+                name_map[name] = var
+        return name_map
+
+    def export(self, fname: str, file_format: Optional[str] = None, index: bool = True) -> Dict:
+        """Writes the model with the current bounds into an MPS or LP file,
+        where the variables are named by get_name_map.
+        The copy of the gurobi model is written if the solver is gurobi_persistent (much faster than the pyomo writers)
+
+        Args:
+            fname (str): the path of the file
+            file_format (Optional[str], optional): 'mps' or 'lp'. Defaults to the extension of fname.
+            index (bool, optional): If true, the sidecar index <fname>.json is written,
+            which has the name and the index of the pyomo variable for each name. Defaults to True.
+
+        Returns:
+            Dict: the index
+        """
+        if file_format is None:
+            file_format = os.path.splitext(fname)[1][1:]
+        if file_format not in ("mps", "lp"):
+            raise ValueError(f"Unsupported file format '{file_format}' (mps or lp)")
+        name_map = self.get_name_map()
+        var_names = {id(var): name for name, var in name_map.items()}
+        _solver_model = getattr(self.solver, "_solver_model", None)
+        if isinstance(self.solver, PersistentSolver) and hasattr(_solver_model, "copy"):
+            _solver_model.update()
+            _model = _solver_model.copy()
+            _var_map = self.solver._solver_var_to_pyomo_var_map
+            _model.setAttr(
+                "VarName",
+                _model.getVars(),
+                [var_names[id(_var_map[var])] for var in _solver_model.getVars()],
+            )
+            _con_map = self.solver._solver_con_to_pyomo_con_map
+            _model.setAttr(
+                "ConstrName",
+                _model.getConstrs(),
+                [
+                    _compact_name(_con_map[con].parent_component().local_name, _con_map[con].index())
+                    for con in _solver_model.getConstrs()
+                ],
+            )
+            # gurobi finds the format by the extension
+            _fname = fname if fname.endswith(f".{file_format}") else f"{fname}.{file_format}"
+            _model.write(_fname)
+            _model.dispose()
+            if _fname != fname:
+                os.replace(_fname, fname)
+        else:
+
+            def labeler(obj):
+                if id(obj) in var_names:
+                    return var_names[id(obj)]
+                return _compact_name(obj.parent_component().local_name, obj.index())
+
+            WriterFactory("mps" if file_format == "mps" else "lp_v1")(
+                self, fname, lambda x: True, {"labeler": labeler}
+            )
+        _index = {
+            "name": self.local_name,
+            "class": type(self).__name__,
+            "length": getattr(self, "length", None),
+            "variables": [
+                [name, var.parent_component().local_name, var.index()]
+                for name, var in name_map.items()
+            ],
+        }
+        if index:
+            with open(f"{fname}.json", "w") as _f:
+                json.dump(_index, _f)
+        return _index
+
+    def load_solution(self, fname: str) -> TerminationCondition:
+        """Reads a solution file (see optboolnet.external) into the values of the variables,
+        so that the solution is given by get_control, get_attractor or get_trap_space
+
+        Args:
+            fname (str): the path of the file
+
+        Returns:
+            TerminationCondition: the status of the solve
+        """
+        from optboolnet.external import read_solution_file
+
+        status, values = read_solution_file(fname)
+        self.set_values(values)
+        return status
+
+    def set_values(self, values: Dict[str, float]):
+        """Sets the values of the variables by their names (see get_name_map)"""
+        for name, var in self.get_name_map().items():
+            if name in values:
+                value = values[name]
+                var.set_value(round(value) if var.is_integer() else value, skip_validation=True)
 
     def update_options_time_limit(self, time_limit: Optional[float]):
         self.solver.options["time_limit"] = time_limit
 
+    def update_options_threads(self, threads: int):
+        self.solver.options["threads"] = threads
+
+    def is_time_limit_reached(self) -> bool:
+        """True if the last solve stopped at the time limit (with or without an incumbent)"""
+        return (
+            self.results is not None
+            and self.results.solver.termination_condition == TerminationCondition.maxTimeLimit
+        )
+
+    def mark_time_limit_reached(self):
+        """Records a solve that is not started since no time is left as a solve stopped at the time limit"""
+        self.results = SolverResults()
+        self.results.solver.termination_condition = TerminationCondition.maxTimeLimit
+
+    def has_incumbent(self) -> bool:
+        """True if the last solve found a solution, which may be not optimal (e.g., at the time limit)"""
+        if self.results is None:
+            return False
+        try:
+            return (self.results.problem.number_of_solutions or 0) > 0
+        except AttributeError:  # not given by the solver
+            return False
+
     def fix_var(self, var: pmoenv.ScalarVar, value: int):
         # var.fix(value)
+        if var.lb == value and var.ub == value:  # the solver is not updated
+            return
         var.setlb(value)
         var.setub(value)
         if isinstance(self.solver, PersistentSolver):
             self.solver.update_var(var)
 
     def relax_var(self, var: pmoenv.ScalarVar):
+        if var.lb == 0 and var.ub == 1:  # the solver is not updated
+            return
         var.setlb(0)
         var.setub(1)
         if isinstance(self.solver, PersistentSolver):
@@ -141,13 +380,26 @@ class CoreIP(pmoenv.ConcreteModel):
         new_constr = target_list.add(expr)
         if isinstance(self.solver, PersistentSolver):
             self.solver.add_constraint(new_constr)
+        return new_constr
 
     def clear_constr_list(self, target_list: pmoenv.ConstraintList):
         for _, constr in target_list.items():
-            if isinstance(self.solver, PersistentSolver):
+            if constr.active and isinstance(self.solver, PersistentSolver):
                 self.solver.remove_constraint(constr)
         target_list.clear()
 
+    def activate_constr(self, constr):
+        """Adds a deactivated constraint back to the model and the solver"""
+        constr.activate()
+        if isinstance(self.solver, PersistentSolver):
+            self.solver.add_constraint(constr)
+
+    def deactivate_constr(self, constr):
+        """Removes a constraint from the solver and deactivates it, where it is kept in its list"""
+        if isinstance(self.solver, PersistentSolver):
+            self.solver.remove_constraint(constr)
+        constr.deactivate()
+
     def optimize(self, to_optimum: bool = True) -> bool:
         """Find an attractor by optimization
 
@@ -159,10 +411,14 @@ class CoreIP(pmoenv.ConcreteModel):
         Returns:
             bool: the indicator for the termination condition
         """
+        _kwgs = self.solver_config.kwgs
+        if self.warmstart is not None:
+            _kwgs["warmstart"] = self.warmstart
         if isinstance(self.solver, PersistentSolver):
-            results: SolverResults = self.solver.solve(**self.solver_config.kwgs)
+            results: SolverResults = self.solver.solve(**_kwgs)
         else:
-            results = self.solver.solve(self, **self.solver_config.kwgs)
+            results = self.solver.solve(self, **_kwgs)
+        self.results = results
 
         if to_optimum:  # check the optimality
             return results.solver.termination_condition == TerminationCondition.optimal
@@ -176,6 +432,9 @@ class CoreIP(pmoenv.ConcreteModel):
 class MasterControlIP(CoreIP):
     """The extension of IP model for handling control variables d"""
 
+    CONTROL_VARS: bool = True
+    """If false, the model has no variables d and fix_control changes the other variables and constraints"""
+
     def __init__(
         self,
         name: str,
@@ -187,9 +446,10 @@ class MasterControlIP(CoreIP):
         super().__init__(name, bn, solver_setting, *args, **kwds)
 
         ### ======== variables
-        self.d = pmoenv.Var(self.J * self.B, domain=pmoenv.Binary)
-        """d[j,k]=1 iff variable j is controlled to be k for all j in J, k in [0,1]"""
-        self.append_vars_to_solvers([self.d])
+        if self.CONTROL_VARS:
+            self.d = pmoenv.Var(self.J * self.B, domain=pmoenv.Binary)
+            """d[j,k]=1 iff variable j is controlled to be k for all j in J, k in [0,1]"""
+            self.append_vars_to_solvers([self.d])
 
         ### ======== constraints
 
@@ -201,8 +461,64 @@ class MasterControlIP(CoreIP):
         """"""
         self.constrs_benders = pmoenv.ConstraintList()
         """"""
+        self.cut_pool: Optional[CutPool] = None
+        """The pool of the cuts in constrs_benders (see set_cut_pool)"""
+
+        if self.CONTROL_VARS:
+            self.make_constr_exclusivity()
+
+    def set_cut_pool(self, max_age: int):
+        """Manages the cuts in constrs_benders by a cut pool, where a cut slack at max_age consecutive solves
+        is removed from the solver until a solution violates it (see optboolnet.cutpool)
+
+        Args:
+            max_age (int): the age of the cuts to remove (the pool is disabled if 0)
+        """
+        if self.cut_pool is not None:
+            for _, constr in self.constrs_benders.items():
+                if not constr.active:
+                    self.activate_constr(constr)
+        if max_age > 0:
+            self.cut_pool = CutPool(max_age)
+            for _, constr in self.constrs_benders.items():
+                self.cut_pool.add(constr)
+        else:
+            self.cut_pool = None
+
+    def add_constr_to_list(
+        self, expr: pmoenv.Expression, target_list: pmoenv.ConstraintList
+    ):
+        new_constr = super().add_constr_to_list(expr, target_list)
+        if self.cut_pool is not None and target_list is self.constrs_benders:
+            self.cut_pool.add(new_constr)
+        return new_constr
+
+    def optimize(self, to_optimum: bool = True) -> bool:
+        """Solves the model, where the violated cuts in the cut pool (if any) are added back
+        and the model is solved again until no cut in the pool is violated
+
+        Args:
+            to_optimum (bool, optional):
+            Whether to check the solution is optimal or feasible.
+            Defaults to True.
 
-        self.make_constr_exclusivity()
+        Returns:
+            bool: the indicator for the termination condition
+        """
+        result = super().optimize(to_optimum)
+        if self.cut_pool is None:
+            return result
+        while result:
+            violated = self.cut_pool.pop_violated()
+            if not violated:
+                break
+            for constr in violated:
+                self.activate_constr(constr)
+            result = super().optimize(to_optimum)
+        if result:
+            for constr in self.cut_pool.update():
+                self.deactivate_constr(constr)
+        return result
 
     def set_constr_target_size(self, control_size: int):
         self.clear_constr_list(self.constrs_target_size)
@@ -217,6 +533,17 @@ class MasterControlIP(CoreIP):
                 self.constrs_target_size,
             )
 
+    def reset(self, solver_config: SolverConfig):
+        super().reset(solver_config)
+        self.clear_constr_list(self.constrs_target_size)
+        self.clear_constr_list(self.constrs_minimality)
+        self.clear_constr_list(self.constrs_benders)
+        if self.cut_pool is not None:
+            self.cut_pool.clear()
+        if self.CONTROL_VARS:
+            for var in self.d.values():
+                self.relax_var(var)
+
     def get_control(self) -> Control:
         ctrl_dict = dict()
         for j in self.J:
@@ -273,7 +600,7 @@ class MasterControlIP(CoreIP):
         )
         return (EnumCutType.MINIMALITY, len(ctrl))
 
-    def append_logical_benders_cut(self, attr: Attractor):
+    def append_logical_benders_cut(self, attr: Attractor, strengthened: bool = False):
         # Build the list of cut‐terms in two passes:
         #  1) for each j,k,alpha_j,beta_j yield (d[j,1-k] if beta_j==1 else 1 - d[j,k])
         #  2) for each where alpha_j==0 yield d[j,k]
@@ -292,6 +619,8 @@ class MasterControlIP(CoreIP):
 
         # Add the Benders cut
         self.add_constr_to_list(expr >= 1, self.constrs_benders)
+        if strengthened:
+            return (EnumCutType.STRENGTHENED_ATTRACTOR_CUT, len(terms))
         return (EnumCutType.ATTRACTOR_CUT, len(terms))
 
     def append_forbidden_trap_space_cut(
@@ -314,6 +643,40 @@ class MasterControlIP(CoreIP):
 
         return (EnumCutType.TRAP_SPACE_CUT, len(terms))
 
+    def filter_forbidden_trap_space_cuts(
+        self, trap_space_list: List[Tuple[Control, Hypercube]]
+    ) -> List[Tuple[Control, Hypercube]]:
+        """The controls and the trap spaces whose forbidden trap space cuts are not dominated
+        by the cut of another one in the list (see append_forbidden_trap_space_cut).
+        The cut of (ctrl, ts) forbids a control if it contains ctrl and agrees with ts on its other variables,
+        so it dominates the cut of (ctrl', ts') if ctrl is a subset of ctrl' and
+        ctrl + ts (on the controllable variables not in ctrl) is a subset of ctrl' + ts' (likewise)
+
+        Args:
+            trap_space_list (List[Tuple[Control, Hypercube]]): the controls and the trap spaces (e.g., by get_trap_space_pool)
+
+        Returns:
+            List[Tuple[Control, Hypercube]]: the ones of the non-dominated cuts (the first one of duplicates)
+        """
+        keys = list()
+        for ctrl, trap_space in trap_space_list:
+            forbidden = set(ctrl.items())
+            for j in ctrl.unfixed_vars(self.bn.controllable_vars):
+                if j in trap_space:
+                    forbidden.add((j, trap_space[j]))
+            keys.append((frozenset(ctrl.items()), frozenset(forbidden)))
+
+        return [
+            trap_space_list[idx]
+            for idx, (d_fixed, forbidden) in enumerate(keys)
+            if not any(
+                _d_fixed <= d_fixed
+                and _forbidden <= forbidden
+                and (_d_fixed != d_fixed or _forbidden != forbidden or _idx < idx)
+                for _idx, (_d_fixed, _forbidden) in enumerate(keys)
+            )
+        ]
+
     def set_objective_min_control(self):
         return super().set_objective(sum(self.d.values()), True)
 
@@ -321,6 +684,8 @@ class MasterControlIP(CoreIP):
 class AttractorDetectionIP(MasterControlIP):
     """The Pyomo integer programming model for finding an attractor of a given length under a control."""
 
+    FORMULATIONS = ["standard", "compact"]
+
     def __init__(
         self,
         name: str,
@@ -328,6 +693,7 @@ class AttractorDetectionIP(MasterControlIP):
         length: int,
         solver_setting: SolverConfig,
         *args,
+        formulation: str = "standard",
         **kwds
     ):
         """
@@ -335,9 +701,18 @@ class AttractorDetectionIP(MasterControlIP):
         Args:
             bn (CNFBooleanNetwork): CNF Boolean network with control settings
             length (int): the length of the target attractor
+            formulation (str, optional): the formulation of the stability condition.
+            'compact' eliminates the clause variables y that have a single literal or
+            belong to a variable with a single clause (see make_constr_compact_stability_condition).
+            Defaults to "standard".
         """
+        if formulation not in self.FORMULATIONS:
+            raise ValueError(
+                f"Unknown formulation '{formulation}'. Try one of the following: {self.FORMULATIONS}"
+            )
         super().__init__(name, bn, solver_setting, *args, **kwds)
         self.length = length
+        self.formulation = formulation
 
         ### ======== index sets
 
@@ -346,11 +721,22 @@ class AttractorDetectionIP(MasterControlIP):
         )
         """The list of all positions of an attractor"""
 
+        def C_y_init(model: AttractorDetectionIP):
+            for (i, c), clause in model.bn.iter_clauses():
+                if model.formulation == "standard" or not (
+                    len(model.C_i[i]) == 1
+                    or len(clause.pos_literals) + len(clause.neg_literals) == 1
+                ):
+                    yield (i, c)
+
+        self.C_y = pmoenv.Set(dimen=2, initialize=C_y_init)
+        """The set of clauses with the variables y (all clauses in the standard formulation)"""
+
         ### ======== variables
 
         self.x = pmoenv.Var(self.I * self.T_range, domain=pmoenv.Binary)
         """x[i,t] denotes the value of variable i at position t for all i in I,  t in [T]"""
-        self.y = pmoenv.Var(self.C * self.T_range, domain=pmoenv.Binary)
+        self.y = pmoenv.Var(self.C_y * self.T_range, domain=pmoenv.Binary)
         """y[i,c,t] denotes the value of c-th clause of variable i at position t for all i in I, k in [0,1], t in [T]"""
         self.p = pmoenv.ScalarVar(domain=pmoenv.Binary)
         """p = 1 iff the desired property is satisfied"""
@@ -365,6 +751,36 @@ class AttractorDetectionIP(MasterControlIP):
         self.constrs_no_good_x = pmoenv.ConstraintList()
         """"""
         self._constrs_stability: List[pmoenv.Constraint] = list()
+        self._percolated_vars: List[str] = list()
+
+    def reset(self, solver_config: SolverConfig):
+        super().reset(solver_config)
+        self.clear_constr_list(self.constrs_no_good_x)
+        self.fix_percolated_values(dict())
+
+    def control_relaxation(self, i: str):
+        """The term that relaxes the transition of variable i if it is controlled (d[i,0] + d[i,1], or 0)"""
+        return self.d[i, 0] + self.d[i, 1] if i in self.J else 0
+
+    def add_transition_constr(self, i: str, expr: pmoenv.Expression):
+        """Appends a constraint of the transition of variable i to constrs_stability"""
+        self.add_constr_to_list(expr, self.constrs_stability)
+
+    def fix_percolated_values(self, values: Dict[str, int]):
+        """Fixes x[i,t] for all t to the values fixed by percolation (see CNFBooleanNetwork.percolate),
+        where the variables fixed by the last call and not in the given values are relaxed
+
+        Args:
+            values (Dict[str, int]): the fixed values of the trap space of the current control
+        """
+        for i in self._percolated_vars:
+            if i not in values:
+                for t in self.T_range:
+                    self.relax_var(self.x[i, t])
+        for i, value in values.items():
+            for t in self.T_range:
+                self.fix_var(self.x[i, t], value)
+        self._percolated_vars = list(values)
 
     def prev(self, t: int):
         if t == 1:
@@ -393,8 +809,10 @@ class AttractorDetectionIP(MasterControlIP):
         """A variable must be fixed if the control is active.
         Otherwise, transition formulas must be satisfied
         """
+        if self.formulation == "compact":
+            return self.make_constr_compact_stability_condition()
         self.clear_constr_list(self.constrs_stability)
-        for j, t in self.J * self.T_range:
+        for j, t in (self.J * self.T_range) if self.CONTROL_VARS else []:
             self.add_constr_to_list(
                 self.d[j, 1] <= self.x[j, t],
                 self.constrs_stability,
@@ -405,20 +823,19 @@ class AttractorDetectionIP(MasterControlIP):
             )
 
         for i in self.I:
-            (d_0, d_1) = (self.d[i, 0], self.d[i, 1]) if i in self.J else (0, 0)
+            d_sum = self.control_relaxation(i)
             for t in self.T_range:
                 x_i_t = self.x[i, t]
                 for c in self.C_i[i]:
-                    self.add_constr_to_list(
-                        x_i_t <= self.y[i, c, self.prev(t)] + (d_0 + d_1),
-                        self.constrs_stability,
+                    self.add_transition_constr(
+                        i, x_i_t <= self.y[i, c, self.prev(t)] + d_sum
                     )
-                self.add_constr_to_list(
+                self.add_transition_constr(
+                    i,
                     x_i_t
                     >= (1 - len(self.C_i[i]))
                     + sum(self.y[i, c, self.prev(t)] for c in self.C_i[i])
-                    - (d_0 + d_1),
-                    self.constrs_stability,
+                    - d_sum,
                 )
 
         for (i, c), clause in self.bn.iter_clauses():
@@ -436,9 +853,102 @@ class AttractorDetectionIP(MasterControlIP):
                     self.constrs_stability,
                 )
 
+    def negative_literal_slack(self):
+        """The relaxation of the lower bounds given by negative literals (nothing by default)"""
+        return 0
+
+    def make_constr_compact_stability_condition(self):
+        """The stability condition where the clause variables y are eliminated
+        (Fourier-Motzkin) if a clause has a single literal, or if a variable has a single clause.
+        The projection of the LP relaxation onto the other variables is the same as the standard one,
+        and a variable with a single clause of a single literal is given by an equality if it is not controllable
+        """
+        self.clear_constr_list(self.constrs_stability)
+        slack = self.negative_literal_slack()
+        no_slack = isinstance(slack, int) and slack == 0
+        for j, t in (self.J * self.T_range) if self.CONTROL_VARS else []:
+            self.add_constr_to_list(
+                self.d[j, 1] <= self.x[j, t],
+                self.constrs_stability,
+            )
+            self.add_constr_to_list(
+                self.d[j, 0] - slack <= 1 - self.x[j, t],
+                self.constrs_stability,
+            )
+
+        def literal_bounds(clause: ORClause, t: int):
+            """The upper and lower bounds of the literals of a clause at t"""
+            bounds = [(self.x[i_, t], self.x[i_, t]) for i_ in clause.pos_literals]
+            for i_ in clause.neg_literals:
+                _literal = 1 - self.x[i_, t]
+                bounds.append((_literal, _literal if no_slack else _literal - slack))
+            return bounds
+
+        for i in self.I:
+            is_controllable = i in self.J
+            d_sum = self.control_relaxation(i)
+            clauses = self.bn.items_clause(i)
+            for t in self.T_range:
+                x_i_t = self.x[i, t]
+                if len(clauses) == 1:  # x[i,t] is the clause at prev(t) unless controlled
+                    bounds = literal_bounds(clauses[0], self.prev(t))
+                    if len(bounds) == 1 and not is_controllable and bounds[0][1] is bounds[0][0]:
+                        self.add_constr_to_list(
+                            x_i_t == bounds[0][0], self.constrs_stability
+                        )
+                        continue
+                    for _, lower in bounds:
+                        self.add_transition_constr(i, x_i_t >= lower - d_sum)
+                    self.add_transition_constr(
+                        i, x_i_t <= sum(upper for upper, _ in bounds) + d_sum
+                    )
+                    continue
+                y_bounds = list()
+                for c, clause in enumerate(clauses):
+                    if (i, c) in self.C_y:
+                        y = self.y[i, c, self.prev(t)]
+                        y_bounds.append((y, y))
+                    else:  # a single literal
+                        y_bounds.append(literal_bounds(clause, self.prev(t))[0])
+                for upper, _ in y_bounds:
+                    self.add_transition_constr(i, x_i_t <= upper + d_sum)
+                self.add_transition_constr(
+                    i,
+                    x_i_t
+                    >= (1 - len(clauses))
+                    + sum(lower for _, lower in y_bounds)
+                    - d_sum,
+                )
+
+        for i, c in self.C_y:
+            clause = self.bn.get_clause(i, c)
+            for t in self.T_range:
+                bounds = literal_bounds(clause, t)
+                for _, lower in bounds:
+                    self.add_constr_to_list(
+                        self.y[i, c, t] >= lower, self.constrs_stability
+                    )
+                self.add_constr_to_list(
+                    self.y[i, c, t] <= sum(upper for upper, _ in bounds),
+                    self.constrs_stability,
+                )
+
+    def get_clause_value(self, i: str, c: int, t: int) -> bool:
+        """The value of the c-th clause of variable i at position t in the last solution"""
+        if (i, c) in self.C_y:
+            return self.y[i, c, t].value == 1
+        clause = self.bn.get_clause(i, c)
+        return any(self.x[i_, t].value == 1 for i_ in clause.pos_literals) or any(
+            self.x[i_, t].value == 0 for i_ in clause.neg_literals
+        )
+
     def set_phenotype_obj(self, _minimize: bool = True):
         self.set_objective(expr=self.p, _minimize=_minimize)
 
+    def is_phenotype_violated(self) -> bool:
+        """True if the phenotype is not satisfied at some state of the last attractor"""
+        return self.p.value == 0
+
     def add_no_good_x(self, attractor: Attractor):
         """Adds a constraints that removes the current attractor"""
         for t, x_del in attractor.iter_states():
@@ -472,7 +982,7 @@ class AttractorDetectionIP(MasterControlIP):
         beta = [
             all(
                 (self.x[j, t].value == 1)
-                == all(self.y[j, c, self.prev(t)].value == 1 for c in self.C_i[j])
+                == all(self.get_clause_value(j, c, self.prev(t)) for c in self.C_i[j])
                 for t in self.T_range
             )
             for j in self.J
@@ -505,12 +1015,17 @@ class ExtendedAttractorDetectionIP(AttractorDetectionIP):
         self.v = pmoenv.ScalarVar(domain=pmoenv.Binary)
         self.append_vars_to_solvers([self.v])
 
+    def negative_literal_slack(self):
+        return self.v
+
     def make_constr_stability_condition(self):
         """A variable must be fixed if the control is active.
         Otherwise, transition formulas must be satisfied
         """
+        if self.formulation == "compact":
+            return self.make_constr_compact_stability_condition()
         self.clear_constr_list(self.constrs_stability)
-        for j, t in self.J * self.T_range:
+        for j, t in (self.J * self.T_range) if self.CONTROL_VARS else []:
             self.add_constr_to_list(
                 self.d[j, 1] <= self.x[j, t],
                 self.constrs_stability,
@@ -521,20 +1036,19 @@ class ExtendedAttractorDetectionIP(AttractorDetectionIP):
             )
 
         for i in self.I:
-            (d_0, d_1) = (self.d[i, 0], self.d[i, 1]) if i in self.J else (0, 0)
+            d_sum = self.control_relaxation(i)
             for t in self.T_range:
                 x_i_t = self.x[i, t]
                 for c in self.C_i[i]:
-                    self.add_constr_to_list(
-                        x_i_t <= self.y[i, c, self.prev(t)] + (d_0 + d_1),
-                        self.constrs_stability,
+                    self.add_transition_constr(
+                        i, x_i_t <= self.y[i, c, self.prev(t)] + d_sum
                     )
-                self.add_constr_to_list(
+                self.add_transition_constr(
+                    i,
                     x_i_t
                     >= (1 - len(self.C_i[i]))
                     + sum(self.y[i, c, self.prev(t)] for c in self.C_i[i])
-                    - (d_0 + d_1),
-                    self.constrs_stability,
+                    - d_sum,
                 )
 
         for (i, c), clause in self.bn.iter_clauses():
@@ -562,6 +1076,95 @@ class ExtendedAttractorDetectionIP(AttractorDetectionIP):
         self.set_objective(expr=self.p + 2 * self.v, _minimize=_minimize)
 
 
+class ReducedAttractorDetectionIP(ExtendedAttractorDetectionIP):
+    """The lower level problem without the control variables d.
+    A control is applied by fixing x[j,t] for all t to the controlled value
+    and removing the transition constraints of j from the solver (see fix_control),
+    so the model has fewer columns and nonzeros, and the transitions are not relaxed by big-M terms.
+    The model is equivalent to ExtendedAttractorDetectionIP if v is fixed to 0 (see _make_LLP)"""
+
+    CONTROL_VARS = False
+
+    def __init__(
+        self,
+        name: str,
+        bn: CNFBooleanNetwork,
+        length: int,
+        solver_setting: SolverConfig,
+        *args,
+        **kwds
+    ):
+        super().__init__(name, bn, length, solver_setting, *args, **kwds)
+        self.control: Control = Control(dict())
+        """The control applied by the last call of fix_control"""
+        self._transition_constrs: Dict[str, List[pmoenv.Constraint]] = {
+            j: list() for j in self.J
+        }
+
+    def reset(self, solver_config: SolverConfig):
+        self.fix_control(Control(dict()))
+        super().reset(solver_config)
+
+    def control_relaxation(self, i: str):
+        return 0
+
+    def add_transition_constr(self, i: str, expr: pmoenv.Expression):
+        new_constr = self.add_constr_to_list(expr, self.constrs_stability)
+        if i in self.J:
+            self._transition_constrs[i].append(new_constr)
+
+    def make_constr_stability_condition(self):
+        for constrs in self._transition_constrs.values():
+            constrs.clear()
+        super().make_constr_stability_condition()
+        # the control applied before the constraints are made
+        for j in self.control:
+            for constr in self._transition_constrs[j]:
+                self.deactivate_constr(constr)
+
+    def get_control(self) -> Control:
+        return Control(self.control)
+
+    def fix_control(self, ctrl: Control):
+        """Fixes x[j,t] for all t to the controlled values and removes the transition constraints of the controlled variables,
+        where only the variables whose control differs from the last call are updated
+
+        Args:
+            ctrl (Control):
+        """
+        for j in self.J:
+            value, last_value = ctrl.get(j), self.control.get(j)
+            if value == last_value:
+                continue
+            if last_value is None:
+                for constr in self._transition_constrs[j]:
+                    self.deactivate_constr(constr)
+            if value is None:
+                for constr in self._transition_constrs[j]:
+                    self.activate_constr(constr)
+                for t in self.T_range:
+                    self.relax_var(self.x[j, t])
+            else:
+                for t in self.T_range:
+                    self.fix_var(self.x[j, t], value)
+        self.control = Control(ctrl)
+
+    def optimize(self, to_optimum: bool = True) -> bool:
+        result = super().optimize(to_optimum)
+        # x[j,t] of a controlled variable may be in no active constraint, so its value is not loaded
+        for j, value in self.control.items():
+            for t in self.T_range:
+                self.x[j, t].set_value(value)
+        return result
+
+    def fix_percolated_values(self, values: Dict[str, int]):
+        super().fix_percolated_values(values)
+        # a controlled variable fixed by percolation at the last call may have been relaxed
+        for j, value in self.control.items():
+            for t in self.T_range:
+                self.fix_var(self.x[j, t], value)
+
+
 class TrapSpaceDetectionIP(MasterControlIP):
     """The Pyomo integer programming model for finding an attractor of a given length under a control."""
 
@@ -599,6 +1202,8 @@ class TrapSpaceDetectionIP(MasterControlIP):
         """"""
         self.constrs_separation = pmoenv.ConstraintList()
         """"""
+        self.phenotype_value: Optional[int] = None
+        """The value of the phenotype fixed by fix_phenotype"""
 
         self.make_constr_stability_condition()
 
@@ -630,6 +1235,13 @@ class TrapSpaceDetectionIP(MasterControlIP):
                         self.constrs_stability,
                     )
 
+    def reset(self, solver_config: SolverConfig):
+        super().reset(solver_config)
+        self.clear_constr_list(self.constrs_no_good_x)
+        self.clear_constr_list(self.constrs_separation)
+        for var in self.h.values():
+            self.relax_var(var)
+
     def fix_phenotype(self, value: int):
         """fix the phenotype of the trap space to be either 0 or 1
 
@@ -637,10 +1249,14 @@ class TrapSpaceDetectionIP(MasterControlIP):
             value (int): the value to fix
         """
         # self.fix_var(self.h[self.bn.phenotype, value], 1)
+        if self.phenotype_value == value:  # already fixed
+            return
+        self.clear_constr_list(self.constrs_phenotype)
         self.add_constr_to_list(
             self.h[self.bn.phenotype, value] == 1,
             self.constrs_phenotype,
         )
+        self.phenotype_value = value
 
     def add_constr_separation(self, ctrl: Control):
         for j, k in ctrl.items():
@@ -670,6 +1286,69 @@ class TrapSpaceDetectionIP(MasterControlIP):
                 trap_space[i] = 1
         return trap_space
 
+    def set_solution_pool(self, pool_size: int) -> bool:
+        """Makes the solver keep up to pool_size optimal or near-optimal solutions (gurobi only)
+
+        Args:
+            pool_size (int): the size of the pool (the default behavior if 0)
+
+        Returns:
+            bool: True if the solver supports the solution pool
+        """
+        if not hasattr(self.solver, "set_gurobi_param"):
+            return False
+        # applied at the next solve (the defaults of gurobi if 0)
+        self.solver.options["PoolSearchMode"] = 2 if pool_size > 0 else 0
+        self.solver.options["PoolSolutions"] = pool_size if pool_size > 0 else 10
+        return True
+
+    def get_trap_space_pool(self) -> List[Tuple[Control, Hypercube]]:
+        """The controls and the trap spaces of all solutions in the pool of the last solve (see set_solution_pool),
+        except those whose trap space is a subspace of another in the pool
+
+        Returns:
+            List[Tuple[Control, Hypercube]]: the controls and the trap spaces
+        """
+        _solver_model = self.solver._solver_model
+        _var_map = self.solver._pyomo_var_to_solver_var_map
+        d_keys = list(self.J * self.B)
+        h_keys = list(self.I * self.B)
+        d_vars = [_var_map[self.d[key]] for key in d_keys]
+        h_vars = [_var_map[self.h[key]] for key in h_keys]
+        solutions = list()
+        for sol_idx in range(_solver_model.SolCount):
+            _solver_model.Params.SolutionNumber = sol_idx
+            ctrl = Control(
+                {
+                    j: k
+                    for (j, k), value in zip(d_keys, _solver_model.getAttr("Xn", d_vars))
+                    if value > 0.5
+                }
+            )
+            trap_space = Hypercube(
+                {
+                    i: k
+                    for (i, k), value in zip(h_keys, _solver_model.getAttr("Xn", h_vars))
+                    if value > 0.5
+                }
+            )
+            solutions.append(
+                (ctrl, trap_space, frozenset(ctrl.items()), frozenset(trap_space.items()))
+            )
+        _solver_model.Params.SolutionNumber = 0
+
+        pool = list()
+        for idx, (ctrl, trap_space, d_fixed, h_fixed) in enumerate(solutions):
+            if any(  # implied by the maximality cut of another (or a former duplicate) solution
+                _d_fixed <= d_fixed
+                and _h_fixed <= h_fixed
+                and (_d_fixed != d_fixed or _h_fixed != h_fixed or _idx < idx)
+                for _idx, (_, _, _d_fixed, _h_fixed) in enumerate(solutions)
+            ):
+                continue
+            pool.append((ctrl, trap_space))
+        return pool
+
     def add_trap_space_maximality_cut(self, ctrl: Control, trap_space: Hypercube):
         self.add_constr_to_list(
             pmoenv.quicksum(1 - self.d[j, k] for j, k in ctrl.items())
@@ -686,4 +1365,5 @@ Model = TypeVar(
     AttractorDetectionIP,
     TrapSpaceDetectionIP,
     ExtendedAttractorDetectionIP,
+    ReducedAttractorDetectionIP,
 )
@@ -0,0 +1,173 @@
+from __future__ import annotations
+import contextlib
+import io
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class _Timer:
+    def __init__(self, profiler: PhaseProfiler, key: Tuple[str, str]) -> None:
+        self.profiler = profiler
+        self.key = key
+
+    def __enter__(self):
+        self._st = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.add_time(self.key, time.perf_counter() - self._st)
+
+
+class PhaseProfiler:
+    """Named timers and counters for each phase and each model of a control algorithm.
+    The models are labeled as 'master', 'separation' and 'LLP_<length>'.
+    If disabled, every timer is a shared null context and nothing is recorded.
+    """
+
+    EXTERNAL_PROFILERS = ["", "cprofile", "pyinstrument"]
+
+    def __init__(self, enabled: bool = False, external: str = "") -> None:
+        """
+
+        Args:
+            enabled (bool, optional): If true, timers and counters are recorded. Defaults to False.
+            external (str, optional): 'cprofile' or 'pyinstrument' to profile the whole run as well. Defaults to "".
+        """
+        if external not in self.EXTERNAL_PROFILERS:
+            raise ValueError(
+                f"Unknown profiler '{external}'. Try one of the following: {self.EXTERNAL_PROFILERS}"
+            )
+        self.enabled = enabled
+        self.external = external
+        self.times: Dict[Tuple[str, str], float] = defaultdict(float)
+        """(key) (phase, model) (value) the total time in seconds"""
+        self.calls: Dict[Tuple[str, str], int] = Counter()
+        """(key) (phase, model) (value) the number of timed calls"""
+        self.counters: Dict[Tuple[str, str], int] = Counter()
+        """(key) (name, model) (value) a counter"""
+        self.solver_stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        """(key) model (value) the accumulated statistics reported by the solver"""
+        self._external_profiler: Any = None
+
+    def timer(self, phase: str, model: str = ""):
+        """A context manager that adds the elapsed time to (phase, model)"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Timer(self, (phase, model))
+
+    def add_time(self, key: Tuple[str, str], elapsed: float):
+        self.times[key] += elapsed
+        self.calls[key] += 1
+
+    def count(self, name: str, model: str = "", value: int = 1):
+        if self.enabled:
+            self.counters[(name, model)] += value
+
+    def add_solve(self, model: str, wall_time: float, stats: Dict[str, Optional[float]]):
+        """Records a solve with the statistics reported by the solver
+
+        Args:
+            model (str): the label of the model
+            wall_time (float): the wall-clock time measured around the solve
+            stats (Dict[str, Optional[float]]): runtime, node_count and mip_gap (None if not available)
+        """
+        if not self.enabled:
+            return
+        _stats = self.solver_stats[model]
+        _stats["solves"] += 1
+        _stats["wall_time"] += wall_time
+        if stats.get("runtime") is not None:
+            _stats["solver_runtime"] += stats["runtime"]
+            _stats["overhead"] += max(wall_time - stats["runtime"], 0.0)
+        if stats.get("node_count") is not None:
+            _stats["node_count"] += stats["node_count"]
+        if stats.get("mip_gap") is not None and math.isfinite(stats["mip_gap"]):
+            _stats["max_mip_gap"] = max(_stats["max_mip_gap"], stats["mip_gap"])
+
+    def start_external(self):
+        if self.external == "cprofile":
+            import cProfile
+
+            self._external_profiler = cProfile.Profile()
+            self._external_profiler.enable()
+        elif self.external == "pyinstrument":
+            import pyinstrument
+
+            self._external_profiler = pyinstrument.Profiler()
+            self._external_profiler.start()
+
+    def stop_external(self):
+        if self._external_profiler is None:
+            return
+        if self.external == "cprofile":
+            self._external_profiler.disable()
+        elif self.external == "pyinstrument":
+            self._external_profiler.stop()
+
+    def external_report(self, limit: int = 30) -> str:
+        if self._external_profiler is None:
+            return ""
+        if self.external == "cprofile":
+            import pstats
+
+            _stream = io.StringIO()
+            pstats.Stats(self._external_profiler, stream=_stream).sort_stats(
+                "cumulative"
+            ).print_stats(limit)
+            return _stream.getvalue()
+        else:
+            return self._external_profiler.output_text()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": [
+                {
+                    "phase": phase,
+                    "model": model,
+                    "calls": self.calls[(phase, model)],
+                    "time": _time,
+                }
+                for (phase, model), _time in self.times.items()
+            ],
+            "counters": [
+                {"name": name, "model": model, "value": _value}
+                for (name, model), _value in self.counters.items()
+            ],
+            "solvers": {model: dict(_stats) for model, _stats in self.solver_stats.items()},
+        }
+
+    def summary(self) -> str:
+        """The summary table of the timers, the counters and the solver statistics"""
+        lines = [
+            f"{'phase':<16}{'model':<30}{'calls':>8}{'total(s)':>12}{'mean(ms)':>12}"
+        ]
+        for (phase, model), _time in sorted(
+            self.times.items(), key=lambda _item: -_item[1]
+        ):
+            _calls = self.calls[(phase, model)]
+            lines.append(
+                f"{phase:<16}{model:<30}{_calls:>8}{_time:>12.3f}{1000 * _time / _calls:>12.3f}"
+            )
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<16}{'model':<30}{'value':>8}")
+            for (name, model), _value in sorted(self.counters.items()):
+                lines.append(f"{name:<16}{model:<30}{_value:>8}")
+        if self.solver_stats:
+            lines.append("")
+            lines.append(
+                f"{'model':<12}{'solves':>8}{'wall(s)':>10}{'solver(s)':>10}{'overhead(s)':>12}{'nodes':>10}{'max gap':>10}"
+            )
+            for model, _stats in sorted(self.solver_stats.items()):
+                lines.append(
+                    f"{model:<12}{int(_stats['solves']):>8}{_stats['wall_time']:>10.3f}"
+                    f"{_stats['solver_runtime']:>10.3f}{_stats['overhead']:>12.3f}"
+                    f"{int(_stats['node_count']):>10}{_stats['max_mip_gap']:>10.4f}"
+                )
+        return "\n".join(lines)
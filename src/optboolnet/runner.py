@@ -0,0 +1,265 @@
+"""The batch runner of BendersAttractorControl over many instances and configs
+
+Each job runs in a fresh process with a time limit and a memory limit.
+The controls are streamed to the parent process as soon as they are found
+and written through a result sink (see optboolnet.sink).
+"""
+from __future__ import annotations
+import copy
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+from optboolnet.config import TotalConfig
+from optboolnet.sink import JSONLinesSink, ResultSink
+
+if TYPE_CHECKING:
+    from optboolnet.boolnet import CNFBooleanNetwork
+
+_KILL_GRACE = 10.0
+"""The extra seconds given to a job over its time limit before the process is killed"""
+
+
+def load_instance(instance: str) -> CNFBooleanNetwork:
+    """Loads an instance by a name in the repository (e.g., 'S1'),
+    a synthetic name 'syn_<num_nodes>_<seed>', or the path of a directory
+    with transition_formula.bnet and control_setting.json"""
+    from optboolnet.instances import load_bn, load_bn_in_repo
+    from optboolnet.instances.synthetic import load_synthetic_bn
+
+    if os.path.isdir(instance):
+        return load_bn(instance)
+    elif instance.startswith("syn_"):
+        return load_synthetic_bn(instance)
+    else:
+        return load_bn_in_repo(instance)
+
+
+def instance_name(instance: str) -> str:
+    return os.path.basename(os.path.normpath(instance))
+
+
+def make_job(
+    instance: str,
+    config: TotalConfig,
+    name: str = "",
+    time_limit: Optional[float] = None,
+    memory_limit: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Makes a job of the runner
+
+    Args:
+        instance (str): an instance (see load_instance)
+        config (TotalConfig): the config of the algorithm, the solvers and the logger
+        name (str, optional): the name of the job. Defaults to the name of the instance.
+        time_limit (Optional[float], optional): the time limit in seconds. Defaults to None.
+        memory_limit (Optional[float], optional): the memory limit (address space) in megabytes. Defaults to None.
+    """
+    return {
+        "name": name if name else instance_name(instance),
+        "instance": instance,
+        "config": config,
+        "time_limit": time_limit,
+        "memory_limit": memory_limit,
+    }
+
+
+class _QueueSink(ResultSink):
+    """Forwards every record to the parent process"""
+
+    def __init__(self, _queue, job_id: int) -> None:
+        super().__init__("", buffer_size=1)
+        self._queue = _queue
+        self.job_id = job_id
+
+    def _write(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self._queue.put(("control", self.job_id, record))
+
+    def _sync(self):
+        pass
+
+
+def _set_memory_limit(memory_limit: Optional[float]):
+    if memory_limit is None:
+        return
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    _limit = int(memory_limit * 1024 * 1024)
+    resource.setrlimit(resource.RLIMIT_AS, (_limit, _limit))
+
+
+def run_job(job: Dict[str, Any], result_sink: Optional[ResultSink] = None) -> Dict[str, Any]:
+    """Runs a job in the current process
+
+    Args:
+        job (Dict[str, Any]): a job given by make_job
+        result_sink (Optional[ResultSink], optional): the sink receiving the controls. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: the record of the job
+    """
+    from optboolnet.algorithm import BendersAttractorControl
+
+    config: TotalConfig = job["config"]
+    record = {"name": job["name"], "instance": job["instance"]}
+    _st = time.perf_counter()
+    try:
+        _set_memory_limit(job["memory_limit"])
+        bn = load_instance(job["instance"])
+        _logging_config = copy.copy(config.logging_config)
+        _logging_config.sink_format = ""
+        if _logging_config.fpath:
+            _logging_config.fname = job["name"]
+        alg = BendersAttractorControl(job["name"], bn, _logging_config)
+        alg.result_sink = result_sink
+        kwargs = config.alg_config.to_kwargs()
+        _time_limits = [
+            tl for tl in [kwargs.get("total_time_limit"), job["time_limit"]] if tl is not None
+        ]
+        kwargs["total_time_limit"] = min(_time_limits, default=None)
+        for _ in alg.iter_exhaustive_search(
+            master_solver_config=config.master_solver_config,
+            LLP_solver_config=config.LLP_solver_config,
+            separation_solver_config=config.separation_solver_config,
+            **kwargs,
+        ):
+            pass
+        record["status"] = "timeout" if alg.is_timeout else "finished"
+        record["solutions"] = alg.solution_count
+    except MemoryError:
+        record["status"] = "memory limit"
+    except Exception as e:
+        record["status"] = f"error: {type(e).__name__}: {e}"
+    record["total_time"] = time.perf_counter() - _st
+    return record
+
+
+def _worker(job: Dict[str, Any], job_id: int, _queue):
+    # starts the feeder thread of the queue before the memory limit is set
+    _queue.put(("start", job_id, None))
+    record = run_job(job, _QueueSink(_queue, job_id))
+    _queue.put(("done", job_id, record))
+
+
+def iter_run(
+    jobs: List[Dict[str, Any]],
+    result_sink: Optional[ResultSink] = None,
+    processes: int = 1,
+    kill_grace: float = _KILL_GRACE,
+) -> Iterator[Dict[str, Any]]:
+    """Runs the jobs in a local process pool, one fresh process per job,
+    and yields the record of each job as soon as it ends
+
+    A job that exceeds its time limit by kill_grace seconds (e.g., stuck in a solver) is killed.
+    The controls found before are kept in the sink.
+
+    Args:
+        jobs (List[Dict[str, Any]]): the jobs given by make_job
+        result_sink (Optional[ResultSink], optional): the sink receiving the controls of every job. Defaults to None.
+        processes (int, optional): the number of jobs running at the same time. Defaults to 1.
+        kill_grace (float, optional): the extra seconds over the time limit. Defaults to 10.0.
+    """
+    _ctx = multiprocessing.get_context("spawn")
+    _queue = _ctx.Queue()
+    pending = deque(enumerate(jobs))
+    running: Dict[int, Any] = dict()
+    """(key) job id (value) (process, start time)"""
+    records: Dict[int, Dict[str, Any]] = dict()
+
+    def _handle(message):
+        kind, job_id, payload = message
+        if kind == "control":
+            if result_sink is not None:
+                result_sink.append(payload)
+        elif kind == "done":
+            records[job_id] = payload
+
+    try:
+        while pending or running:
+            while pending and len(running) < processes:
+                job_id, job = pending.popleft()
+                process = _ctx.Process(target=_worker, args=(job, job_id, _queue))
+                process.start()
+                running[job_id] = (process, time.perf_counter())
+            try:
+                _handle(_queue.get(timeout=0.1))
+            except queue.Empty:
+                pass
+            for job_id, (process, start_time) in list(running.items()):
+                job = jobs[job_id]
+                if process.is_alive():
+                    if job["time_limit"] is None or (
+                        time.perf_counter() - start_time < job["time_limit"] + kill_grace
+                    ):
+                        continue
+                    process.kill()
+                    process.join()
+                    status = "killed: time limit"
+                else:
+                    process.join()
+                    status = f"crashed: exit code {process.exitcode}"
+                while True:  # the messages sent before the process ended
+                    try:
+                        _handle(_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                del running[job_id]
+                record = records.pop(
+                    job_id,
+                    {
+                        "name": job["name"],
+                        "instance": job["instance"],
+                        "status": status,
+                        "total_time": time.perf_counter() - start_time,
+                    },
+                )
+                if result_sink is not None:
+                    result_sink.flush()
+                yield record
+    finally:
+        for process, _ in running.values():
+            process.kill()
+            process.join()
+
+
+def run(
+    jobs: List[Dict[str, Any]],
+    result_sink: Optional[ResultSink] = None,
+    output: str = "",
+    processes: int = 1,
+) -> List[Dict[str, Any]]:
+    """Runs the jobs (see iter_run) and writes their records into a JSON-lines file
+
+    Args:
+        jobs (List[Dict[str, Any]]): the jobs given by make_job
+        result_sink (Optional[ResultSink], optional): the sink receiving the controls of every job. Defaults to None.
+        output (str, optional): the path of a JSON-lines file for the records of the jobs. Defaults to "".
+        processes (int, optional): the number of jobs running at the same time. Defaults to 1.
+
+    Returns:
+        List[Dict[str, Any]]: the records of the jobs in the order of completion
+    """
+    records = list()
+    record_sink = JSONLinesSink(output, buffer_size=1) if output else None
+    try:
+        for record in iter_run(jobs, result_sink, processes):
+            records.append(record)
+            if record_sink is not None:
+                record_sink.append(record)
+            print(
+                f"{record['name']}: {record['status']}, {record['total_time']:.3f}s, "
+                f"{record.get('solutions')} solutions",
+                file=sys.stderr,
+            )
+    finally:
+        if record_sink is not None:
+            record_sink.close()
+        if result_sink is not None:
+            result_sink.close()
+    return records
@@ -0,0 +1,313 @@
+"""The lower level problem solved by an incremental SAT solver (requires pysat, `pip install optboolnet[sat]`)
+
+SATAttractorDetection encodes the transitions of a network along a cycle of a given length once,
+and a control is given by assumption literals, so the clauses learned for a candidate
+are kept for the next candidates. It can replace ExtendedAttractorDetectionIP
+as a lower level problem of BendersAttractorControl (see LLP_engine).
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from optboolnet.boolnet import Attractor, CNFBooleanNetwork, Control
+from optboolnet.config import SolverConfig
+
+_DEFAULT_SAT_SOLVER = "glucose4"
+
+
+class SATAttractorDetection:
+    """Finds an attractor of a given length under a control whose phenotype is not satisfied at some state
+    (a cycle of states as in AttractorDetectionIP, where the variables x[i,t] are Boolean variables)"""
+
+    def __init__(
+        self,
+        name: str,
+        bn: CNFBooleanNetwork,
+        length: int,
+        solver_config: SolverConfig,
+        sat_solver: str = _DEFAULT_SAT_SOLVER,
+    ) -> None:
+        """
+
+        Args:
+            name (str): the name of the problem
+            bn (CNFBooleanNetwork): CNF Boolean network with control settings
+            length (int): the length of the target attractor
+            solver_config (SolverConfig): the solver config, where only time_limit is used
+            sat_solver (str, optional): the name of a pysat solver. Defaults to "glucose4".
+        """
+        from pysat.solvers import Solver
+
+        self.name = name
+        self.bn = bn
+        self.length = length
+        self.solver_config = solver_config
+        self.sat_solver = sat_solver
+        self.time_limit: Optional[float] = solver_config.time_limit
+        """The time limit of the next solve (see update_options_time_limit)"""
+        self.solver = Solver(name=sat_solver)
+        self._num_vars = 0
+        self._num_clauses = 0
+        self._num_literals = 0
+        self.x: Dict[Tuple[str, int], int] = {
+            (i, t): self._new_var() for i in bn.keys() for t in range(1, length + 1)
+        }
+        """The literal of x[i,t] for all variables i and positions t"""
+        self.d: Dict[Tuple[str, int], int] = {
+            (j, k): self._new_var() for j in bn.controllable_vars for k in [0, 1]
+        }
+        """The literal of d[j,k] (j is controlled to be k) given as an assumption"""
+        self.const: Dict[Tuple[str, int], int] = {
+            (j, k): self._new_var() for j in bn.controllable_vars for k in [0, 1]
+        }
+        """The selector of x[j,t] == k for all t (used by strengthen)"""
+        self._violation = self._new_var()
+        """The selector of the clause that the phenotype is not satisfied at some state"""
+        self._y: Dict[Tuple[str, int, int], int] = dict()
+        self.assumptions: List[int] = [-_d for _d in self.d.values()]
+        """The literals of the current control"""
+        self.percolated_assumptions: List[int] = list()
+        """The literals of the values fixed by percolation (see fix_percolated_values)"""
+        self._true_vars: set = set()
+        self._is_violated = False
+        self._runtime: Optional[float] = None
+        self.results: Optional[bool] = None
+        """The result of the last solve (None if interrupted)"""
+        self._encode()
+
+    def prev(self, t: int):
+        if t == 1:
+            return self.length
+        else:
+            return t - 1
+
+    def _new_var(self) -> int:
+        self._num_vars += 1
+        return self._num_vars
+
+    def _add_clause(self, clause: List[int]):
+        self.solver.add_clause(clause)
+        self._num_clauses += 1
+        self._num_literals += len(clause)
+
+    def _encode(self):
+        x = self.x
+        for (i, c), clause in self.bn.iter_clauses():
+            for t in range(1, self.length + 1):
+                literals = [x[i_, t] for i_ in clause.pos_literals] + [
+                    -x[i_, t] for i_ in clause.neg_literals
+                ]
+                if len(literals) == 1:
+                    self._y[i, c, t] = literals[0]
+                    continue
+                y = self._new_var()  # y <-> OR(literals), false if no literal
+                self._add_clause([-y] + literals)
+                for literal in literals:
+                    self._add_clause([-literal, y])
+                self._y[i, c, t] = y
+
+        for i in self.bn.keys():
+            # the transition is relaxed if i is controlled
+            guard = [self.d[i, 0], self.d[i, 1]] if (i, 0) in self.d else []
+            num_clauses = len(self.bn.items_clause(i))
+            for t in range(1, self.length + 1):
+                y_list = [self._y[i, c, self.prev(t)] for c in range(num_clauses)]
+                for y in y_list:
+                    self._add_clause(guard + [-x[i, t], y])
+                self._add_clause(guard + [x[i, t]] + [-y for y in y_list])
+
+        for j in self.bn.controllable_vars:
+            self._add_clause([-self.d[j, 0], -self.d[j, 1]])
+            for t in range(1, self.length + 1):
+                self._add_clause([-self.d[j, 1], x[j, t]])
+                self._add_clause([-self.d[j, 0], -x[j, t]])
+                self._add_clause([-self.const[j, 1], x[j, t]])
+                self._add_clause([-self.const[j, 0], -x[j, t]])
+
+        self._add_clause(
+            [-self._violation]
+            + [-x[self.bn.phenotype, t] for t in range(1, self.length + 1)]
+        )
+
+    def get_model_size(self) -> Dict[str, int]:
+        """The size of the encoding
+
+        Returns:
+            Dict[str, int]: rows (the clauses), cols (the variables) and nnz (the literals of the clauses)
+        """
+        return {"rows": self._num_clauses, "cols": self._num_vars, "nnz": self._num_literals}
+
+    def fix_control(self, ctrl: Control):
+        """Fix the control as the assumptions of the next solves
+
+        Args:
+            ctrl (Control):
+        """
+        self.assumptions = list()
+        for j in self.bn.controllable_vars:
+            for k in [0, 1]:
+                self.assumptions.append(
+                    self.d[j, k] if ctrl.get(j, None) == k else -self.d[j, k]
+                )
+
+    def fix_percolated_values(self, values: Dict[str, int]):
+        """Fixes x[i,t] for all t to the values fixed by percolation (see CNFBooleanNetwork.percolate)
+        as the assumptions of the next solves
+
+        Args:
+            values (Dict[str, int]): the fixed values of the trap space of the current control
+        """
+        self.percolated_assumptions = [
+            self.x[i, t] if value == 1 else -self.x[i, t]
+            for i, value in values.items()
+            for t in range(1, self.length + 1)
+        ]
+
+    def update_options_time_limit(self, time_limit: Optional[float]):
+        self.time_limit = time_limit
+
+    def update_options_threads(self, threads: int):
+        """The SAT solvers run on a single thread"""
+
+    def is_time_limit_reached(self) -> bool:
+        """True if the last solve was interrupted (by the time limit or terminate)"""
+        return self.results is None
+
+    def reset(self, solver_config: SolverConfig):
+        """Applies a solver config for the next search (see optboolnet.template).
+        The learned clauses are kept"""
+        self.solver_config = solver_config
+        self.time_limit = solver_config.time_limit
+        self.assumptions = [-_d for _d in self.d.values()]
+        self.percolated_assumptions = list()
+        self.results = None
+
+    def terminate(self):
+        """Interrupts the solve in progress, which may be called from another thread"""
+        self.solver.interrupt()
+
+    def _solve(self, assumptions: List[int]) -> Optional[bool]:
+        timer = None
+        if self.time_limit is not None:
+            timer = threading.Timer(self.time_limit, self.solver.interrupt)
+            timer.start()
+        try:
+            result = self.solver.solve_limited(assumptions=assumptions, expect_interrupt=True)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.solver.clear_interrupt()
+        if result:
+            self._true_vars = set(
+                literal for literal in self.solver.get_model() if literal > 0
+            )
+        return result
+
+    def optimize(self, to_optimum: bool = True) -> bool:
+        """Finds an attractor, where one that violates the phenotype is preferred
+        (as the minimization of p in ExtendedAttractorDetectionIP)
+
+        Returns:
+            bool: True if an attractor is found
+        """
+        _st = time.perf_counter()
+        try:
+            assumptions = self.assumptions + self.percolated_assumptions
+            self.results = self._solve(assumptions + [self._violation])
+            self._is_violated = bool(self.results)
+            if self.results is False:  # every attractor satisfies the phenotype (if any)
+                self.results = self._solve(assumptions + [-self._violation])
+        finally:
+            self._runtime = time.perf_counter() - _st
+        return bool(self.results)
+
+    def get_solver_statistics(self) -> Dict[str, Optional[float]]:
+        return {"runtime": self._runtime, "node_count": None, "mip_gap": None}
+
+    def is_phenotype_violated(self) -> bool:
+        """True if the phenotype is not satisfied at some state of the last attractor"""
+        return self._is_violated
+
+    def _value(self, literal: int) -> int:
+        return int(literal in self._true_vars if literal > 0 else -literal not in self._true_vars)
+
+    def get_attractor(self) -> Attractor:
+        """Extract the states of the discovered attractors with no repetition
+
+        Returns:
+            Attractor: the compact representation of the attractor
+        """
+        T_range = range(1, self.length + 1)
+        unique_state_seq: List[List[int]] = list()
+        for t in T_range:
+            new_state = [self._value(self.x[i, t]) for i in self.bn.keys()]
+            if all(new_state != _state for _state in unique_state_seq):
+                unique_state_seq.append(new_state)
+            else:
+                break
+        J = self.bn.controllable_vars
+        x_1 = [self._value(self.x[j, 1]) for j in J]
+        alpha = [
+            all(self._value(self.x[j, 1]) == self._value(self.x[j, t]) for t in T_range)
+            for j in J
+        ]
+        beta = [
+            all(
+                (self._value(self.x[j, t]) == 1)
+                == all(
+                    self._value(self._y[j, c, self.prev(t)])
+                    for c in range(len(self.bn.items_clause(j)))
+                )
+                for t in T_range
+            )
+            for j in J
+        ]
+        return Attractor(self.bn, unique_state_seq, x_1, alpha, beta)
+
+    def strengthen(self, attr: Attractor) -> Optional[Attractor]:
+        """Finds a forbidden attractor whose logical Benders cut dominates the one of the given attractor
+
+        The cut of an attractor removes the controls under which it remains an attractor,
+        that is, j is not controlled (beta_j) or controlled to its constant value (alpha_j) for each controllable j.
+        A cycle of states that keeps the conditions of the given attractor is searched,
+        and the condition of each j is extended to both alpha_j and beta_j greedily
+        (an uncontrolled j first, which removes a term of the cut).
+
+        Args:
+            attr (Attractor): an attractor of the length that violates the phenotype
+
+        Returns:
+            Optional[Attractor]: the new attractor (None if no condition can be extended)
+        """
+        required: Dict[str, List[int]] = dict()
+        candidates: List[Tuple[str, List[List[int]]]] = list()
+        uncontrolled_candidates: List[Tuple[str, List[List[int]]]] = list()
+        for j, k, alpha_j, beta_j in zip(
+            self.bn.controllable_vars, attr.get_first_state(), attr.alpha, attr.beta
+        ):
+            k = int(k)
+            uncontrolled = [-self.d[j, 0], -self.d[j, 1]]
+            if beta_j and alpha_j:
+                required[j] = uncontrolled + [self.const[j, k]]
+            elif beta_j:
+                required[j] = uncontrolled
+                uncontrolled_candidates.append(
+                    (j, [uncontrolled + [self.const[j, k]], uncontrolled + [self.const[j, 1 - k]]])
+                )
+            else:
+                required[j] = [self.d[j, k]]
+                candidates.append((j, [uncontrolled + [self.const[j, k]]]))
+
+        strengthened = None
+        for j, options in uncontrolled_candidates + candidates:
+            _required = required[j]
+            for option in options:
+                required[j] = option
+                assumptions = [self._violation] + [
+                    literal for literals in required.values() for literal in literals
+                ]
+                if self._solve(assumptions):
+                    strengthened = self.get_attractor()
+                    break
+                required[j] = _required
+        return strengthened
@@ -0,0 +1,150 @@
+"""The schedules of the lengths of the lower level problems
+
+The states x[i,t] of a model of length L form a cycle (see AttractorDetectionIP.prev),
+so the model finds every attractor whose period divides L by repeating its states.
+Hence the lengths floor(L/2)+1, ..., L cover all periods up to L,
+and no length of this range can be dropped since its only multiple up to L is itself.
+The schedule 'divisor' builds about half of the models of 'all' (e.g., 8 instead of 15 for L=15),
+but the models left are the longest ones, so it is opt-in (see BendersConfig.LLP_length_schedule).
+AdaptiveLengthScheduler reorders the lengths during a search by their statistics.
+"""
+from typing import Dict, List, Set
+
+LENGTH_SCHEDULES = ["all", "divisor"]
+
+
+def period_weight(period: int) -> float:
+    """The expected share of the attractors of a period (up to a constant), where short ones are more common"""
+    return 1.0 / period
+
+
+def covered_periods(length: int) -> Set[int]:
+    """The periods of the attractors found by a model of the given length (the divisors of the length)"""
+    return set(p for p in range(1, length + 1) if length % p == 0)
+
+
+def covering_lengths(max_length: int) -> List[int]:
+    """The minimum set of lengths up to max_length that covers all periods up to max_length
+
+    Args:
+        max_length (int): the maximum period of attractors
+
+    Returns:
+        List[int]: the lengths in increasing order
+    """
+    return list(range(max_length // 2 + 1, max_length + 1))
+
+
+def order_by_hit_rate(lengths: List[int]) -> List[int]:
+    """Orders the lengths so that each length covers the largest weight of periods
+    not covered by the former ones (the shorter one first if tied)
+
+    Args:
+        lengths (List[int]): the lengths to order
+
+    Returns:
+        List[int]: the ordered lengths
+    """
+    remaining: Dict[int, Set[int]] = {length: covered_periods(length) for length in lengths}
+    covered: Set[int] = set()
+    ordered: List[int] = list()
+    while remaining:
+        length = max(
+            sorted(remaining),
+            key=lambda _l: sum(period_weight(p) for p in remaining[_l] - covered),
+        )
+        covered |= remaining.pop(length)
+        ordered.append(length)
+    return ordered
+
+
+def schedule_lengths(max_length: int, schedule: str = "all") -> List[int]:
+    """The lengths of the lower level problems to solve
+
+    Args:
+        max_length (int): the maximum period of attractors
+        schedule (str, optional): 'all' (every length from 1 to max_length) or
+            'divisor' (the covering lengths ordered by the expected hit rate). Defaults to "all".
+
+    Returns:
+        List[int]: the lengths in the order to solve
+    """
+    if schedule == "all":
+        return list(range(1, max_length + 1))
+    elif schedule == "divisor":
+        return order_by_hit_rate(covering_lengths(max_length))
+    else:
+        raise ValueError(
+            f"Unknown length schedule '{schedule}'. Try one of the following: {LENGTH_SCHEDULES}"
+        )
+
+
+class LengthStatistics:
+    """The statistics of the lower level problems of a length during a search"""
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self.attempts: int = 0
+        """The number of solves"""
+        self.hits: int = 0
+        """The number of solves that found a forbidden attractor (a cut)"""
+        self.total_time: float = 0.0
+        """The total solve time in seconds"""
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of the solves that found a cut, with a uniform prior (0.5 if not solved yet)"""
+        return (self.hits + 1) / (self.attempts + 2)
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.attempts if self.attempts > 0 else 0.0
+
+    @property
+    def score(self) -> float:
+        """The expected number of cuts per second (infinite if not solved yet)"""
+        if self.attempts == 0 or self.mean_time == 0.0:
+            return float("inf")
+        return self.hit_rate / self.mean_time
+
+    def to_dict(self) -> Dict:
+        return {
+            "length": self.length,
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "mean_time": self.mean_time,
+            "score": self.score,
+        }
+
+
+class AdaptiveLengthScheduler:
+    """Orders the lower level problems by the expected number of cuts per second.
+    The lower level problems of a candidate are solved until one finds a cut,
+    and the expected time to find a cut is minimized by the decreasing order of hit_rate / mean_time
+    (if the outcomes of the lengths are independent)"""
+
+    def __init__(self, lengths: List[int]) -> None:
+        """
+
+        Args:
+            lengths (List[int]): the lengths in the initial order, which is kept while not solved yet
+        """
+        self.stats: Dict[int, LengthStatistics] = {
+            length: LengthStatistics(length) for length in lengths
+        }
+
+    def record(self, length: int, solve_time: float, hit: bool):
+        """Records a solve of the lower level problem of a length"""
+        _stats = self.stats[length]
+        _stats.attempts += 1
+        _stats.hits += int(hit)
+        _stats.total_time += solve_time
+
+    def order(self, lengths: List[int]) -> List[int]:
+        """The lengths in the decreasing order of the score (stable for ties)"""
+        return sorted(lengths, key=lambda length: -self.stats[length].score)
+
+    def to_records(self) -> List[Dict]:
+        """The statistics of the lengths in the current order"""
+        return [self.stats[length].to_dict() for length in self.order(list(self.stats))]
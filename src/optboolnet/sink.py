@@ -0,0 +1,269 @@
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ResultSink:
+    """The base class of a streaming sink for the controls found by a control search.
+    Records are kept in a small buffer and written (and fsync-ed) on flush,
+    so that the solutions are available while the enumeration is still running.
+    """
+
+    extension: str = ""
+
+    def __init__(self, fname: str, buffer_size: int = 64) -> None:
+        """
+
+        Args:
+            fname (str): the path of the output file
+            buffer_size (int, optional): the number of records kept before an automatic flush. Defaults to 64.
+        """
+        self.fname = fname
+        self.buffer_size = buffer_size
+        self.count = 0
+        """The number of records appended so far"""
+        self._buffer: List[Dict[str, Any]] = list()
+        _dir = os.path.dirname(fname)
+        if _dir and not os.path.exists(_dir):
+            os.makedirs(_dir)
+
+    def append(self, record: Dict[str, Any]):
+        """Appends a record, which is written when the buffer is full
+
+        Args:
+            record (Dict[str, Any]): a JSON-serializable record
+        """
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records and synchronizes the file with the disk"""
+        if self._buffer:
+            self._write(self._buffer)
+            self._buffer = list()
+        self._sync()
+
+    def close(self):
+        self.flush()
+
+    @property
+    def closed(self) -> bool:
+        """True if the file of the sink is closed (a sink without a file is never closed)"""
+        return False
+
+    def reopen(self):
+        """Opens a closed sink again, where the new records are appended to the file
+        (e.g., the controls of the next search of the same object)"""
+        if self.closed:
+            self._open()
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write(self, records: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def _sync(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class JSONLinesSink(ResultSink):
+    """Writes one JSON object per line"""
+
+    extension = "jsonl"
+
+    def __init__(self, fname: str, buffer_size: int = 64) -> None:
+        super().__init__(fname, buffer_size)
+        self._open()
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def _open(self):
+        self._f = open(self.fname, "a")
+
+    def _write(self, records: List[Dict[str, Any]]):
+        self._f.write("".join(json.dumps(record) + "\n" for record in records))
+
+    def _sync(self):
+        if not self._f.closed:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self):
+        if not self._f.closed:
+            super().close()
+            self._f.close()
+
+
+class SQLiteSink(ResultSink):
+    """Writes records into the table 'solution' of a SQLite database.
+    Nested values (e.g., the control and the cut statistics) are stored as JSON strings."""
+
+    extension = "sqlite"
+    columns = ["experiment", "target_size", "control", "timestamp", "elapsed_time", "cuts"]
+
+    def __init__(self, fname: str, buffer_size: int = 64) -> None:
+        super().__init__(fname, buffer_size)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open()
+
+    @property
+    def closed(self) -> bool:
+        return self._conn is None
+
+    def _open(self):
+        self._conn = sqlite3.connect(self.fname)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS solution "
+            "(experiment TEXT, target_size INTEGER, control TEXT, "
+            "timestamp REAL, elapsed_time REAL, cuts TEXT)"
+        )
+        self._conn.commit()
+
+    def _write(self, records: List[Dict[str, Any]]):
+        self._conn.executemany(
+            f"INSERT INTO solution VALUES ({','.join('?' * len(self.columns))})",
+            [
+                tuple(
+                    json.dumps(record[_col])
+                    if isinstance(record[_col], dict)
+                    else record[_col]
+                    for _col in self.columns
+                )
+                for record in records
+            ],
+        )
+
+    def _sync(self):
+        # a commit of SQLite is durable (synchronous=FULL by default)
+        if self._conn is not None:
+            self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            super().close()
+            self._conn.close()
+            self._conn = None
+
+
+class ParquetSink(ResultSink):
+    """Writes a row group per flush into a Parquet file (requires pyarrow).
+    Nested values are stored as JSON strings."""
+
+    extension = "parquet"
+
+    def __init__(self, fname: str, buffer_size: int = 1024) -> None:
+        import pyarrow
+
+        super().__init__(fname, buffer_size)
+        self._pa = pyarrow
+        self._schema = pyarrow.schema(
+            [
+                ("experiment", pyarrow.string()),
+                ("target_size", pyarrow.int64()),
+                ("control", pyarrow.string()),
+                ("timestamp", pyarrow.float64()),
+                ("elapsed_time", pyarrow.float64()),
+                ("cuts", pyarrow.string()),
+            ]
+        )
+        self._f = open(fname, "wb")
+        self._writer = None
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def _open(self):
+        # a Parquet file cannot be appended, so the records written so far are written again
+        import pyarrow.parquet
+
+        table = pyarrow.parquet.read_table(self.fname) if os.path.getsize(self.fname) > 0 else None
+        self._f = open(self.fname, "wb")
+        self._writer = None
+        if table is not None:
+            self._writer = pyarrow.parquet.ParquetWriter(self._f, self._schema)
+            self._writer.write_table(table)
+
+    def _write(self, records: List[Dict[str, Any]]):
+        import pyarrow.parquet
+
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self._f, self._schema)
+        table = self._pa.Table.from_pylist(
+            [
+                {
+                    _key: json.dumps(_value) if isinstance(_value, dict) else _value
+                    for _key, _value in record.items()
+                }
+                for record in records
+            ],
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+
+    def _sync(self):
+        if not self._f.closed:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self):
+        if not self._f.closed:
+            super().close()
+            if self._writer is not None:
+                self._writer.close()
+            self._f.close()
+
+
+_SINK_CLASSES = {
+    _cls.extension: _cls for _cls in [JSONLinesSink, SQLiteSink, ParquetSink]
+}
+
+
+def make_result_sink(sink_format: str, fname: str) -> Optional[ResultSink]:
+    """Creates a sink of the given format
+
+    Args:
+        sink_format (str): one of 'jsonl', 'sqlite' and 'parquet' (no sink if empty)
+        fname (str): the path of the output file without the extension
+
+    Returns:
+        Optional[ResultSink]: the sink, or None if sink_format is empty
+    """
+    if sink_format == "":
+        return None
+    if sink_format not in _SINK_CLASSES:
+        raise ValueError(
+            f"Unknown sink format '{sink_format}'. Try one of the following: {list(_SINK_CLASSES)}"
+        )
+    return _SINK_CLASSES[sink_format](f"{fname}.{sink_format}")
+
+
+def make_control_record(
+    experiment: str,
+    target_size: int,
+    ctrl: Dict[str, int],
+    elapsed_time: float,
+    cuts: Dict[str, int],
+) -> Dict[str, Any]:
+    return {
+        "experiment": experiment,
+        "target_size": target_size,
+        "control": dict(ctrl),
+        "timestamp": time.time(),
+        "elapsed_time": elapsed_time,
+        "cuts": dict(cuts),
+    }
@@ -0,0 +1,108 @@
+"""The process-level cache of built models shared by the searches on the same network
+
+Building the models (mostly the stability conditions of the lower level problems)
+takes most of the setup time of a search, while a search only changes the bounds of
+the control variables and the lists of cuts. A search with use_model_cache returns its models
+to the cache when it finishes, and the next search on the same network takes them
+and resets them (see CoreIP.reset) instead of building new ones.
+A model is used by a single search at a time, so concurrent searches build their own models.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Hashable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from optboolnet.boolnet import CNFBooleanNetwork
+    from optboolnet.config import SolverConfig
+    from optboolnet.model import CoreIP
+
+_CACHE_SIZE = 32
+"""The number of models kept in the process-level cache"""
+
+
+def network_hash(bn: CNFBooleanNetwork) -> str:
+    """The hash of the clauses and the control settings of a network"""
+    data = {
+        "clause_table": bn.to_clause_table(),
+        "controllable_vars": list(bn.controllable_vars),
+        "uncontrollable_vars": list(bn.uncontrollable_vars),
+        "fixed_values": bn.fixed_values,
+        "phenotype": bn.phenotype,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+class ModelTemplateCache:
+    """The pool of built models keyed on (network hash, model class, length, solver name)"""
+
+    def __init__(self, max_size: int = _CACHE_SIZE) -> None:
+        self.max_size = max_size
+        """The number of models kept in the cache, where the least recently returned ones are dropped"""
+        self._pool: "OrderedDict[Hashable, List[CoreIP]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        bn: CNFBooleanNetwork,
+        cls: type,
+        length: Optional[int],
+        solver_config: SolverConfig,
+        **kwargs,
+    ) -> Tuple:
+        """The key of a model
+
+        Args:
+            bn (CNFBooleanNetwork): the network
+            cls (type): the class of the model
+            length (Optional[int]): the length of attractors (None if the model has no length)
+            solver_config (SolverConfig): the solver config, where only the solver name matters
+            kwargs: the other arguments of the constructor (e.g., formulation)
+        """
+        return (
+            network_hash(bn),
+            cls.__name__,
+            length,
+            solver_config.solver_name,
+            tuple(sorted(kwargs.items())),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(models) for models in self._pool.values())
+
+    def take(self, key: Hashable) -> Optional[CoreIP]:
+        """Removes a model from the cache and returns it (None if there is no model for the key).
+        The model should be reset before it is used"""
+        with self._lock:
+            models = self._pool.get(key)
+            if not models:
+                return None
+            problem = models.pop()
+            if not models:
+                del self._pool[key]
+            return problem
+
+    def put(self, key: Hashable, problem: CoreIP):
+        """Returns a model that is no longer used to the cache"""
+        with self._lock:
+            self._pool.setdefault(key, list()).append(problem)
+            self._pool.move_to_end(key)
+            _size = sum(len(models) for models in self._pool.values())
+            while _size > self.max_size:
+                _, models = self._pool.popitem(last=False)
+                _size -= len(models)
+
+    def clear(self):
+        with self._lock:
+            self._pool.clear()
+
+
+_MODEL_CACHE = ModelTemplateCache()
+
+
+def clear_model_cache():
+    """Clears the process-level cache of models"""
+    _MODEL_CACHE.clear()
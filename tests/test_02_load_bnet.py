@@ -1,7 +1,8 @@
 import pytest
 import os
 from optboolnet.instances import load_bn, load_bn_in_repo, iter_bn_in_repo
-from optboolnet.boolnet import Hypercube
+from optboolnet.boolnet import Hypercube, CNFBooleanNetwork, parse_cnf_formula
+from optboolnet.config import ControlConfig
 
 _FPATH = os.path.dirname(__file__)
 
@@ -46,6 +47,36 @@ def test_cnf_parsing():
         )
 
 
+def test_fast_cnf_parsing():
+    assert parse_cnf_formula("(a | !b) & c") == [(["a"], ["b"]), (["c"], [])]
+    assert parse_cnf_formula("a.1 | ~b:2 | a.1") == [(["a.1"], ["b:2"])]
+    assert parse_cnf_formula("1") == [([], [])]
+    assert parse_cnf_formula("false") == []
+    # not a flat CNF: parsed by boolean.py
+    for formula in ["a | b & c", "((a | b)) & c", "!(a & b)", "a and b", "a & true"]:
+        assert parse_cnf_formula(formula) is None
+
+    config = ControlConfig()
+    config.controllable_vars = ["a", "b", "c"]
+    config.uncontrollable_vars = ["p"]
+    config.fixed_values = dict()
+    config.phenotype = "p"
+    bn = CNFBooleanNetwork("a, (a | !b) & c\nb, ((c | !a))\nc, 1\np, a & (b)", config)
+    clause_sets = {
+        var_name: [
+            (sorted(clause.pos_literals), sorted(clause.neg_literals))
+            for clause in bn.items_clause(var_name)
+        ]
+        for var_name in bn.keys()
+    }
+    assert clause_sets == {
+        "a": [(["a"], ["b"]), (["c"], [])],
+        "b": [(["c"], ["a"])],
+        "c": [([], [])],
+        "p": [(["a"], []), (["b"], [])],
+    }
+    assert bn["a"] == bn.ba.parse("(a | !b) & c")
+
 def test_hypercube():
     bn = load_bn(f"{_FPATH}/test_instance")
     hc = Hypercube()
@@ -65,4 +96,5 @@ def test_hypercube():
 if __name__ == "__main__":
     test_load_bn()
     test_cnf_parsing()
+    test_fast_cnf_parsing()
     test_hypercube()
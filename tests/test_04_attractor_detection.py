@@ -46,6 +46,37 @@ def test_attractor_dection():
         assert attr_ip.p.value == 1
 
 
+def _count_attractor_states(bn, length, formulation):
+    attr_ip = AttractorDetectionIP(
+        "test_formulation",
+        bn,
+        length,
+        SolverConfig(**_solver_config),
+        formulation=formulation,
+    )
+    attr_ip.make_constr_stability_condition()
+    attr_ip.set_constr_target_size(0)
+    count = 0
+    while attr_ip.optimize(to_optimum=False) and count < 100:
+        attractor = attr_ip.get_attractor()
+        assert all(attractor.beta)  # no variable is controlled
+        attr_ip.add_no_good_x(attractor)
+        count += 1
+    return count, attr_ip.get_model_size()
+
+
+def test_compact_formulation():
+    for inst in ["S1", "M1"]:
+        bn = load_bn_in_repo(inst)
+        for length in [1, 2, 3]:
+            count, size = _count_attractor_states(bn, length, "standard")
+            compact_count, compact_size = _count_attractor_states(bn, length, "compact")
+            assert compact_count == count
+            assert compact_size["rows"] < size["rows"]
+            assert compact_size["cols"] < size["cols"]
+            assert compact_size["nnz"] < size["nnz"]
+
+
 def find_all_attractors():
     inst = "M1"
     bn = load_bn_in_repo(inst)
@@ -69,4 +100,5 @@ def find_all_attractors():
 
 if __name__ == "__main__":
     test_attractor_dection()
+    test_compact_formulation()
     find_all_attractors()
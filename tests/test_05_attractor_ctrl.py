@@ -134,7 +134,29 @@ def test_attractor_control():
         assert detected == 1  # (F,T,T), (F,T,F), (F,F,T)
 
 
+def test_attractor_control_profile():
+    bn = load_bn_in_repo("S2")
+    alg = BendersAttractorControl("S2", bn)
+    alg.get_control_strategies(
+        max_control_size=2,
+        max_length=4,
+        allow_empty_attractor=False,
+        solve_separation=True,
+        profile=True,
+        external_profiler="cprofile",
+    )
+    assert alg.solution_count == 9
+    assert set(alg.profiler.solver_stats) == set(
+        ["master", "separation", "LLP_1", "LLP_2", "LLP_3", "LLP_4"]
+    )
+    assert alg.profiler.counters[("iterations", "master")] > alg.solution_count
+    assert ("fix_control", "LLP_1") in alg.profiler.times
+    assert "LLP_3" in alg.profiler.summary()
+    assert "function calls" in alg.profiler.external_report()
+
+
 if __name__ == "__main__":
     test_fixed_point_inconsistency()
     test_fixed_point_control()
     test_attractor_control()
+    test_attractor_control_profile()
@@ -2,6 +2,7 @@ import pytest
 from optboolnet.config import SolverConfig
 from optboolnet.instances import load_bn_in_repo, iter_bn_in_repo
 from optboolnet.model import TrapSpaceDetectionIP
+from optboolnet.boolnet import Control, Hypercube
 import os, sys
 
 _solver_name = "gurobi_persistent"
@@ -47,5 +48,86 @@ def test_forbidden_trap_space_enumeration():
         assert len(forbidden_ts_ip.constrs_benders) == answer
 
 
+def _enumerate_forbidden_trap_spaces(bn, pool_size: int):
+    forbidden_ts_ip = TrapSpaceDetectionIP("Forbidden_TS_test", bn, _config)
+    forbidden_ts_ip.set_constr_target_size(0)
+    forbidden_ts_ip.fix_phenotype(0)
+    forbidden_ts_ip.set_objective_sparse_cut()
+    forbidden_ts_ip.set_solution_pool(pool_size)
+    ts_list = list()
+    while forbidden_ts_ip.optimize():
+        if pool_size > 0:
+            pool = forbidden_ts_ip.get_trap_space_pool()
+        else:
+            pool = [(forbidden_ts_ip.get_control(), forbidden_ts_ip.get_trap_space())]
+        for ctrl, ts in pool:
+            forbidden_ts_ip.add_trap_space_maximality_cut(ctrl, ts)
+            ts_list.append(set(ts.items()))
+    return ts_list
+
+
+def test_forbidden_trap_space_pool():
+    for inst, bn in iter_bn_in_repo(["small", "medium"]):
+        print(inst)
+        ts_list = _enumerate_forbidden_trap_spaces(bn, 0)
+        pool_ts_list = _enumerate_forbidden_trap_spaces(bn, 100)
+        # every trap space is within one found by the other
+        for ts in ts_list:
+            assert any(pool_ts <= ts for pool_ts in pool_ts_list)
+        for pool_ts in pool_ts_list:
+            assert any(ts <= pool_ts for ts in ts_list)
+
+
+def test_filter_forbidden_trap_space_cuts():
+    bn = load_bn_in_repo("S1")
+    model = TrapSpaceDetectionIP("Filter_test", bn, _config)
+    j0, j1 = bn.controllable_vars[:2]
+    u = bn.uncontrollable_vars[0]
+    weak = (Control({j0: 1}), Hypercube({j0: 1, j1: 0, u: 1}))
+    strong = (Control({j0: 1}), Hypercube({j0: 1}))
+    other = (Control({j1: 1}), Hypercube({j1: 1}))
+    # differs from strong only on an uncontrollable variable, which the cut ignores
+    weak_uncontrollable = (Control({j0: 1}), Hypercube({j0: 1, u: 0}))
+    trap_space_list = [weak, strong, other, strong, weak_uncontrollable]
+    assert model.filter_forbidden_trap_space_cuts(trap_space_list) == [strong, other]
+    # a smaller control with a trap space that agrees with the larger control
+    assert model.filter_forbidden_trap_space_cuts(
+        [(Control({j0: 1, j1: 0}), Hypercube({j0: 1, j1: 0})), (Control({j0: 1}), Hypercube({j1: 0}))]
+    ) == [(Control({j0: 1}), Hypercube({j1: 0}))]
+
+
+def test_incremental_separation():
+    bn = load_bn_in_repo("S1")
+    separation_ip = TrapSpaceDetectionIP("Separation_test", bn, _config)
+    separation_ip.fix_phenotype(0)
+    separation_ip.fix_phenotype(0)
+    assert len(separation_ip.constrs_phenotype) == 1
+    separation_ip.set_objective_sparse_cut()
+    separation_ip.warmstart = True
+
+    update_count = 0
+    _update_var = separation_ip.solver.update_var
+
+    def _count_update_var(var):
+        nonlocal update_count
+        update_count += 1
+        _update_var(var)
+
+    separation_ip.solver.update_var = _count_update_var
+    j_list = bn.controllable_vars
+    for ctrl in [Control({j_list[0]: 1}), Control({j_list[0]: 1, j_list[1]: 0})]:
+        separation_ip.add_constr_separation(ctrl)
+        count = update_count
+        result = separation_ip.optimize()
+        separation_ip.add_constr_separation(ctrl)  # the same candidate again
+        assert update_count == count
+        assert separation_ip.optimize() == result
+    separation_ip.fix_phenotype(1)
+    assert len(separation_ip.constrs_phenotype) == 1
+
+
 if __name__ == "__main__":
     test_forbidden_trap_space_enumeration()
+    test_forbidden_trap_space_pool()
+    test_filter_forbidden_trap_space_cuts()
+    test_incremental_separation()
@@ -20,9 +20,10 @@ def teardown_function(function):
     import logging
 
     logging.shutdown()
-    for suffix in ["build", "cut", "solve"]:
-        if os.path.exists(f"tests/log__{suffix}.txt"):
-            os.remove(f"tests/log__{suffix}.txt")
+    for suffix in ["build", "cut", "solve", "step"]:
+        for ext in ["txt", "csv"]:
+            if os.path.exists(f"tests/log__{suffix}.{ext}"):
+                os.remove(f"tests/log__{suffix}.{ext}")
 
 
 def test_logging_1():
@@ -48,5 +49,68 @@ def test_logging_1():
         assert len(_f.readlines()) > 2
 
 
+def test_logging_columnar():
+    _logging_config = LoggingConfig(
+        **{"fpath": os.path.dirname(__file__), "fname": "", "backend": "csv"}
+    )
+    _logging_config.buffer_size = 4
+    _benders_config_dict = {
+        "max_control_size": 1,
+        "max_length": 1,
+        "allow_empty_attractor": False,
+        "use_high_point_relaxation": True,
+        "total_time_limit": None,
+    }
+    bn = load_bn_in_repo("S1")
+    inst = "S1" * 64  # longer than a fixed-width name
+    alg = BendersFixPointControl(inst, bn, _logging_config)
+    alg.get_control_strategies(**_benders_config_dict)
+    with open(f"{os.path.dirname(__file__)}/log__cut.csv", "r") as _f:
+        lines = _f.readlines()
+    assert all(line.split(",")[1] == inst for line in lines[1:])
+    assert lines[0].strip() == ",".join(alg.logger.cut_log_columns)
+    assert len(lines) - 1 == sum(alg.cut_count.values())
+    with open(f"{os.path.dirname(__file__)}/log__solve.csv", "r") as _f:
+        lines = _f.readlines()
+    assert "BENDERS_MASTER" in "".join(lines)
+    assert all(line.split(",")[4] != "" for line in lines)  # no step in the solves
+    with open(f"{os.path.dirname(__file__)}/log__step.csv", "r") as _f:
+        lines = _f.readlines()
+    assert lines[0].strip() == ",".join(alg.logger.cut_log_columns[:4])
+    assert len(lines) - 1 == _benders_config_dict["max_control_size"] + 1
+
+
+def test_logging_parquet_of_two_searches(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _logging_config = LoggingConfig(
+        **{"fpath": str(tmp_path), "fname": "S1", "backend": "parquet"}
+    )
+    _logging_config.buffer_size = 4
+    _benders_config_dict = {
+        "max_control_size": 1,
+        "max_length": 1,
+        "allow_empty_attractor": False,
+        "use_high_point_relaxation": True,
+        "total_time_limit": None,
+    }
+    bn = load_bn_in_repo("S1")
+    alg = BendersFixPointControl("S1", bn, _logging_config)
+    alg.get_control_strategies(**_benders_config_dict)
+    num_solves = pq.read_table(f"{tmp_path}/log_S1_solve.parquet").num_rows
+    # the rows of the first search are kept by the second one
+    alg.get_control_strategies(**_benders_config_dict)
+    assert pq.read_table(f"{tmp_path}/log_S1_step.parquet").num_rows == 2 * 2
+    assert pq.read_table(f"{tmp_path}/log_S1_solve.parquet").num_rows > num_solves
+
+
+def test_logging_off_is_unwrapped():
+    bn = load_bn_in_repo("S1")
+    alg = BendersFixPointControl("S1", bn)
+    assert "_optimize" in alg.__dict__
+    assert not hasattr(alg._optimize, "__wrapped__")
+
+
 if __name__ == "__main__":
     test_logging_1()
+    test_logging_columnar()
+    test_logging_off_is_unwrapped()
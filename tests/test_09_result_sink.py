@@ -0,0 +1,105 @@
+import pytest
+import json, os, sqlite3
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.config import LoggingConfig
+from optboolnet.algorithm import BendersFixPointControl
+from optboolnet.sink import JSONLinesSink, SQLiteSink, ParquetSink
+
+_FPATH = os.path.dirname(__file__)
+
+_benders_config_dict = {
+    "max_control_size": 2,
+    "max_length": 1,
+    "allow_empty_attractor": False,
+    "solve_separation": False,
+    "preprocess_max_forbidden_trap_space": False,
+    "separation_heuristic": False,
+    "use_high_point_relaxation": True,
+    "total_time_limit": None,
+}
+
+
+def test_jsonl_sink(tmp_path):
+    bn = load_bn_in_repo("S2")
+    alg = BendersFixPointControl("S2", bn)
+    alg.result_sink = JSONLinesSink(f"{tmp_path}/sol.jsonl", buffer_size=1)
+    for ctrl in alg.iter_exhaustive_search(**_benders_config_dict):
+        # the record is on the disk as soon as the control is yielded
+        with open(f"{tmp_path}/sol.jsonl") as _f:
+            record = json.loads(_f.readlines()[-1])
+        assert record["control"] == dict(ctrl)
+        assert record["target_size"] == len(ctrl)
+    with open(f"{tmp_path}/sol.jsonl") as _f:
+        records = [json.loads(line) for line in _f]
+    assert len(records) == alg.solution_count == 2
+    assert all(sum(record["cuts"].values()) > 0 for record in records)
+
+
+def test_sqlite_sink_from_logging_config(tmp_path):
+    bn = load_bn_in_repo("S2")
+    _logging_config = LoggingConfig(
+        **{"fpath": str(tmp_path), "fname": "S2", "sink_format": "sqlite"}
+    )
+    alg = BendersFixPointControl("S2", bn, _logging_config)
+    assert isinstance(alg.result_sink, SQLiteSink)
+    alg.get_control_strategies(**_benders_config_dict)
+    with sqlite3.connect(f"{tmp_path}/sol_S2.sqlite") as _conn:
+        rows = _conn.execute("SELECT experiment, control FROM solution").fetchall()
+    assert len(rows) == alg.solution_count
+    assert all(len(json.loads(control)) > 0 for _, control in rows)
+
+
+@pytest.mark.parametrize("sink_format", ["jsonl", "sqlite"])
+def test_sink_of_two_searches(tmp_path, sink_format):
+    bn = load_bn_in_repo("S2")
+    _logging_config = LoggingConfig(
+        **{"fpath": str(tmp_path), "fname": "S2", "sink_format": sink_format}
+    )
+    alg = BendersFixPointControl("S2", bn, _logging_config)
+    # the sink closed by the first search is reopened by the second one
+    alg.get_control_strategies(**_benders_config_dict)
+    alg.get_control_strategies(**_benders_config_dict)
+    assert alg.result_sink.closed
+    if sink_format == "jsonl":
+        with open(f"{tmp_path}/sol_S2.jsonl") as _f:
+            num_records = len(_f.readlines())
+    else:
+        with sqlite3.connect(f"{tmp_path}/sol_S2.sqlite") as _conn:
+            num_records = len(_conn.execute("SELECT * FROM solution").fetchall())
+    assert num_records == 2 * alg.solution_count == 4
+
+
+def test_parquet_sink(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    with ParquetSink(f"{tmp_path}/sol.parquet", buffer_size=2) as sink:
+        for size in range(5):
+            sink.append(
+                {
+                    "experiment": "test",
+                    "target_size": size,
+                    "control": {"x": 1},
+                    "timestamp": 0.0,
+                    "elapsed_time": 0.0,
+                    "cuts": {},
+                }
+            )
+    assert pq.read_table(f"{tmp_path}/sol.parquet").num_rows == 5
+
+    # the rows written before are kept when the sink is reopened
+    sink.reopen()
+    with sink:
+        sink.append(
+            {
+                "experiment": "test",
+                "target_size": 5,
+                "control": {"x": 1},
+                "timestamp": 0.0,
+                "elapsed_time": 0.0,
+                "cuts": {},
+            }
+        )
+    assert pq.read_table(f"{tmp_path}/sol.parquet").num_rows == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,71 @@
+import pytest
+from optboolnet.bench import (
+    iter_jobs,
+    run_job,
+    compare_with_baseline,
+    job_key,
+    trap_space_pool_flag_sets,
+    summarize_trap_space_pool,
+)
+
+
+def test_iter_jobs():
+    jobs = list(
+        iter_jobs(
+            ["small"],
+            ["gurobi_persistent"],
+            [1, 2],
+            [{}, {"solve_separation": True}],
+            repeat=2,
+        )
+    )
+    assert len(jobs) == 4 * 2 * 2 * 2
+    assert len(set(job_key(job) for job in jobs)) == 4 * 2 * 2
+
+
+def test_run_job_and_baseline():
+    job = next(
+        iter_jobs(["small"], ["gurobi_persistent"], [2], [{}], max_length=4)
+    )
+    job["instance"] = "S2"
+    job["flags"] = {"allow_empty_attractor": False}
+    record = run_job(job)
+    assert record["status"] == "finished"
+    assert record["solutions"] == 9
+    assert record["iterations"] > 0
+    assert record["cuts"]["MINIMALITY"] == 9
+
+    assert compare_with_baseline([record], [record]) == []
+    slow_record = dict(record)
+    slow_record["solve_time"] = 10 * record["solve_time"] + 1.0
+    assert len(compare_with_baseline([slow_record], [record])) == 1
+    wrong_record = dict(record)
+    wrong_record["solutions"] = 0
+    assert len(compare_with_baseline([wrong_record], [record])) == 1
+
+
+def test_trap_space_pool_benchmark():
+    jobs = list(
+        iter_jobs(
+            [],
+            ["gurobi_persistent"],
+            [1],
+            trap_space_pool_flag_sets([0, 100]),
+            instances=["S1"],
+        )
+    )
+    records = [run_job(job) for job in jobs]
+    assert [record["status"] for record in records] == ["finished"] * 2
+    assert records[0]["solutions"] == records[1]["solutions"]
+    for record in records:
+        assert record["separation_time"] > 0
+        assert record["cuts"]["TRAP_SPACE_CUT"] > 0
+    lines = summarize_trap_space_pool(records)
+    assert len(lines) == 2
+    assert lines[0].startswith("S1 pool 0:") and lines[1].startswith("S1 pool 100:")
+
+
+if __name__ == "__main__":
+    test_iter_jobs()
+    test_run_job_and_baseline()
+    test_trap_space_pool_benchmark()
@@ -0,0 +1,53 @@
+import pytest
+import os
+import networkx as nx
+from optboolnet.instances import load_bn
+from optboolnet.instances.synthetic import generate_bnet, generate_bn, write_instance
+from optboolnet.config import SolverConfig
+from optboolnet.model import MasterControlIP
+
+
+def interaction_graph(bn):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(bn.keys())
+    for (i, _), clause in bn.iter_clauses():
+        for i_ in clause.pos_literals + clause.neg_literals:
+            graph.add_edge(i_, i)
+    return graph
+
+
+def test_reproducibility():
+    assert generate_bnet(100, seed=7)[0] == generate_bnet(100, seed=7)[0]
+    assert generate_bnet(100, seed=7)[0] != generate_bnet(100, seed=8)[0]
+
+
+@pytest.mark.parametrize("in_degree", ["poisson", "powerlaw", "fixed"])
+def test_structure(in_degree):
+    bn = generate_bn(
+        200, seed=1, num_sccs=4, in_degree=in_degree, clause_width=3, readout_ratio=0.1
+    )
+    assert len(bn) == 201
+    assert bn.phenotype == "p"
+    assert len(bn.uncontrollable_vars) == 21
+    assert all(
+        len(clause.pos_literals + clause.neg_literals) <= 3
+        for _, clause in bn.iter_clauses()
+    )
+    sccs = [
+        scc for scc in nx.strongly_connected_components(interaction_graph(bn))
+        if len(scc) > 1
+    ]
+    assert len(sccs) == 4
+
+
+def test_write_and_build(tmp_path):
+    write_instance(f"{tmp_path}/syn", 50, seed=3)
+    bn = load_bn(f"{tmp_path}/syn")
+    assert bn.get_summary()["num_vars"] == 51
+    master = MasterControlIP("0", bn, SolverConfig(solver_name="gurobi_persistent"))
+    master.set_constr_target_size(1)
+    assert master.optimize()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,75 @@
+import pytest
+import os
+import optboolnet.instances as instances
+from optboolnet.instances import load_bn, load_bn_in_repo, clear_cache, get_cache_dir
+
+_FPATH = os.path.dirname(__file__)
+
+
+def _assert_same_network(bn, other):
+    assert sorted(bn.keys()) == sorted(other.keys())
+    assert bn.to_clause_table() == other.to_clause_table()
+    assert bn.controllable_vars == other.controllable_vars
+    assert bn.uncontrollable_vars == other.uncontrollable_vars
+    assert bn.phenotype == other.phenotype
+    for var in bn.keys():
+        assert bn[var] == other[var]
+
+
+def test_process_cache(monkeypatch):
+    monkeypatch.setenv("OPTBOOLNET_CACHE_DIR", "")
+    clear_cache()
+    bn = load_bn_in_repo("S1", use_cache=True)
+    assert load_bn_in_repo("S1", use_cache=True) is bn
+    assert load_bn_in_repo("S1") is not bn
+    _assert_same_network(bn, load_bn_in_repo("S1"))
+
+
+def test_no_cache_by_default(monkeypatch):
+    monkeypatch.delenv("OPTBOOLNET_CACHE_DIR", raising=False)
+    clear_cache()
+    assert get_cache_dir() == ""
+    bn = load_bn_in_repo("S1")
+    assert load_bn_in_repo("S1") is not bn
+    assert not instances._BN_CACHE
+
+
+def test_disk_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPTBOOLNET_CACHE_DIR", str(tmp_path))
+    clear_cache()
+    for name in ["S1", "M1"]:
+        load_bn_in_repo(name, use_cache=True)
+    load_bn(f"{_FPATH}/test_instance", use_cache=True)
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".json")]) == 3
+
+    # a new process reads the pre-parsed networks from the disk
+    clear_cache()
+    for name in ["S1", "M1"]:
+        _assert_same_network(load_bn_in_repo(name, use_cache=True), load_bn_in_repo(name))
+    _assert_same_network(
+        load_bn(f"{_FPATH}/test_instance", use_cache=True),
+        load_bn(f"{_FPATH}/test_instance"),
+    )
+
+    # a corrupted cache file is ignored
+    clear_cache()
+    for fname in os.listdir(tmp_path):
+        with open(f"{tmp_path}/{fname}", "w") as _f:
+            _f.write("{")
+    _assert_same_network(load_bn_in_repo("S1", use_cache=True), load_bn_in_repo("S1"))
+
+    clear_cache(disk=True)
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".json")]
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setenv("OPTBOOLNET_CACHE_DIR", "")
+    monkeypatch.setattr(instances, "_CACHE_SIZE", 1)
+    clear_cache()
+    bn = load_bn_in_repo("S1", use_cache=True)
+    load_bn_in_repo("S2", use_cache=True)
+    assert load_bn_in_repo("S1", use_cache=True) is not bn
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
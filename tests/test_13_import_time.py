@@ -0,0 +1,45 @@
+import pytest
+import json, subprocess, sys
+
+_HEAVY_MODULES = ["pyomo", "colomoto", "boolean", "algorecell_types", "pandas"]
+
+_SCRIPT = """
+import json, sys, time
+_st = time.perf_counter()
+import optboolnet, optboolnet.config, optboolnet.instances, optboolnet.log
+import optboolnet.sink, optboolnet.profiling, optboolnet.bench
+light_time = time.perf_counter() - _st
+loaded = sorted({name.split(".")[0] for name in sys.modules})
+_st = time.perf_counter()
+optboolnet.CNFBooleanNetwork
+heavy_time = time.perf_counter() - _st
+loaded_later = sorted({name.split(".")[0] for name in sys.modules})
+print(json.dumps({"light_time": light_time, "heavy_time": heavy_time, "loaded": loaded, "loaded_later": loaded_later}))
+"""
+
+
+def test_import_is_lazy():
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT], capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    print(f"light imports: {result['light_time']:.3f}s, boolnet: {result['heavy_time']:.3f}s")
+    assert not set(_HEAVY_MODULES).intersection(result["loaded"])
+    # the heavy modules are loaded on the first access to a lazy name
+    assert "colomoto" in result["loaded_later"]
+
+
+def test_lazy_names():
+    import optboolnet
+
+    assert "CNFBooleanNetwork" in dir(optboolnet)
+    from optboolnet import CNFBooleanNetwork, Hypercube
+    from optboolnet.boolnet import CNFBooleanNetwork as _CNFBooleanNetwork
+
+    assert CNFBooleanNetwork is _CNFBooleanNetwork
+    with pytest.raises(AttributeError):
+        optboolnet.RANDOM_FAKE_NAME
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
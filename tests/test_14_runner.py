@@ -0,0 +1,67 @@
+import pytest
+import json, os
+from optboolnet.cli import main
+from optboolnet.config import TotalConfig, BendersConfig, SolverConfig
+from optboolnet.runner import make_job, iter_run, run_job
+
+_FPATH = os.path.dirname(__file__)
+
+
+def test_total_config():
+    config = TotalConfig.from_json(f"{_FPATH}/test_instance/benders_config.json")
+    assert isinstance(config.alg_config, BendersConfig)
+    assert isinstance(config.LLP_solver_config, SolverConfig)
+    assert config.alg_config.max_length == 15
+    assert config.LLP_solver_config.threads == 1
+    recovered_config = TotalConfig.from_dict(config.to_dict())
+    assert recovered_config.alg_config.__dict__ == config.alg_config.__dict__
+
+
+
+def test_default_alg_config():
+    config = TotalConfig.from_dict({"alg_config": {"allow_empty_attractor": False}})
+    kwargs = config.alg_config.to_kwargs()
+    assert kwargs["total_time_limit"] == 600
+    assert kwargs["max_control_size"] == 0 and kwargs["max_length"] == 1
+    assert not kwargs["allow_empty_attractor"]
+    assert "enforce" not in kwargs
+    # the fields omitted by the config take their default values
+    record = run_job(make_job("S2", config))
+    assert record["status"] == "finished"
+
+
+def test_cli_run(tmp_path):
+    with open(f"{tmp_path}/config.json", "w") as _f:
+        json.dump(
+            {
+                "alg_config": {
+                    "max_control_size": 2,
+                    "max_length": 4,
+                    "allow_empty_attractor": False,
+                },
+                "master_solver_config": {"threads": 1},
+                "LLP_solver_config": {"threads": 1},
+            },
+            _f,
+        )
+    argv = ["run", f"{tmp_path}/config.json", "--instances", "S2"]
+    argv += ["--processes", "2", "--output", f"{tmp_path}/result"]
+    assert main(argv + ["--time-limit", "600"]) == 0
+    with open(f"{tmp_path}/result_jobs.jsonl") as _f:
+        records = [json.loads(line) for line in _f]
+    assert [record["status"] for record in records] == ["finished"]
+    with open(f"{tmp_path}/result.jsonl") as _f:
+        controls = [json.loads(line) for line in _f]
+    assert len(controls) == records[0]["solutions"] == 9
+    assert all(control["experiment"] == "S2" for control in controls)
+
+
+def test_kill_on_time_limit():
+    config = TotalConfig.from_dict({"alg_config": {"max_control_size": 3, "max_length": 3}})
+    jobs = [make_job("syn_300_0", config, time_limit=0.5)]
+    records = list(iter_run(jobs, kill_grace=0.0))
+    assert records[0]["status"] == "killed: time limit"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,71 @@
+import pytest
+import asyncio, contextlib
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.algorithm import BendersAttractorControl
+
+_kwargs = {"allow_empty_attractor": False}
+
+
+def test_aiter():
+    async def _main():
+        ticks = 0
+
+        async def _tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(_tick())
+        alg = BendersAttractorControl("S2", load_bn_in_repo("S2"))
+        controls = [ctrl async for ctrl in alg.aiter(2, 4, max_pending=1, **_kwargs)]
+        ticker.cancel()
+        return controls, ticks
+
+    controls, ticks = asyncio.run(_main())
+    alg = BendersAttractorControl("S2", load_bn_in_repo("S2"))
+    assert controls == list(alg.iter_exhaustive_search(2, 4, **_kwargs))
+    assert len(controls) == 9
+    assert ticks > 0  # the event loop is not blocked by the solvers
+
+
+def test_aiter_cancel():
+    async def _main():
+        alg = BendersAttractorControl("S2", load_bn_in_repo("S2"))
+        async with contextlib.aclosing(alg.aiter(2, 4, max_pending=1, **_kwargs)) as _iter:
+            async for _ in _iter:
+                break
+        return alg
+
+    alg = asyncio.run(_main())
+    assert alg.is_cancelled
+    assert alg.solution_count < 9
+
+
+def test_cancel():
+    alg = BendersAttractorControl("S2", load_bn_in_repo("S2"))
+    controls = list()
+    for ctrl in alg.iter_exhaustive_search(2, 4, **_kwargs):
+        controls.append(ctrl)
+        alg.cancel()
+    assert len(controls) == 1
+    # the flag is reset by a new search
+    assert len(list(alg.iter_exhaustive_search(2, 4, **_kwargs))) == 9
+
+
+
+def test_aiter_cancel_immediately():
+    async def _main():
+        alg = BendersAttractorControl("S2", load_bn_in_repo("S2"))
+        _iter = alg.aiter(2, 4, **_kwargs)
+        alg.cancel()  # before the worker starts
+        assert [ctrl async for ctrl in _iter] == list()
+        return alg
+
+    alg = asyncio.run(_main())
+    assert alg.is_cancelled
+    assert alg.solution_count == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
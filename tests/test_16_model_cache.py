@@ -0,0 +1,58 @@
+import pytest
+from optboolnet.algorithm import BendersAttractorControl
+from optboolnet.config import SolverConfig
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.template import _MODEL_CACHE, clear_model_cache
+
+_solver_config = SolverConfig(threads=1)
+
+
+def _search(bn, **kwargs):
+    alg = BendersAttractorControl("test", bn)
+    controls = list(
+        alg.iter_exhaustive_search(
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            **kwargs,
+        )
+    )
+    return alg, sorted(sorted(ctrl.items()) for ctrl in controls)
+
+
+@pytest.mark.parametrize("solve_separation", [False, True])
+def test_model_cache(solve_separation):
+    clear_model_cache()
+    bn = load_bn_in_repo("S1")
+    kwargs = {
+        "max_length": 2,
+        "solve_separation": solve_separation,
+        "preprocess_max_forbidden_trap_space": solve_separation,
+    }
+    for max_control_size in [1, 2, 3]:
+        _, expected = _search(bn, max_control_size=max_control_size, **kwargs)
+        alg, result = _search(
+            bn, max_control_size=max_control_size, use_model_cache=True, **kwargs
+        )
+        assert result == expected
+        # the models are kept for the next search
+        assert len(_MODEL_CACHE) == 3 + solve_separation
+
+    _models = [alg.model_master, alg.model_separation] + alg.model_LLP_list
+    alg, _ = _search(bn, max_control_size=1, use_model_cache=True, **kwargs)
+    assert all(
+        model is _model
+        for model, _model in zip(
+            [alg.model_master, alg.model_separation] + alg.model_LLP_list, _models
+        )
+    )
+
+    # a longer search builds the missing LLP only
+    alg, _ = _search(
+        bn, max_control_size=1, use_model_cache=True, **dict(kwargs, max_length=3)
+    )
+    assert all(model is _model for model, _model in zip(alg.model_LLP_list, _models[2:]))
+    assert all(alg.model_LLP_list[2] is not _model for _model in _models)
+    assert len(_MODEL_CACHE) == 4 + solve_separation
+    clear_model_cache()
@@ -0,0 +1,128 @@
+import pytest
+import json, os, sys
+from optboolnet import Control
+from optboolnet.algorithm import BendersAttractorControl
+from optboolnet.config import SolverConfig
+from optboolnet.external import read_solution_file, write_solution_file
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.model import ExtendedAttractorDetectionIP, TrapSpaceDetectionIP
+from pyomo.opt import TerminationCondition
+
+
+def _make_LLP(bn, length, solver_config):
+    model = ExtendedAttractorDetectionIP(f"{length}", bn, length, solver_config)
+    model.fix_var(model.v, 0)
+    model.make_constr_stability_condition()
+    model.make_constr_phenotype_at_all_t()
+    model.set_phenotype_obj()
+    return model
+
+
+@pytest.mark.parametrize("solver_name", ["gurobi_persistent", "external:highs"])
+@pytest.mark.parametrize("file_format", ["mps", "lp"])
+def test_export(tmp_path, solver_name, file_format):
+    bn = load_bn_in_repo("S1")
+    model = _make_LLP(bn, 2, SolverConfig(solver_name=solver_name))
+    fname = f"{tmp_path}/model.{file_format}"
+    model.export(fname)
+    with open(fname, "r") as _f:
+        content = _f.read()
+    with open(f"{fname}.json", "r") as _f:
+        index = json.load(_f)
+    assert index["length"] == 2
+    j = bn.controllable_vars[0]
+    for name, component, idx in [
+        (f"x_{j}_2", "x", [j, 2]),
+        (f"d_{j}_1", "d", [j, 1]),
+        ("p", "p", None),
+    ]:
+        assert name in content
+        assert [name, component, idx] in index["variables"]
+    assert len(index["variables"]) == len(model.get_name_map())
+
+
+def test_load_solution(tmp_path):
+    bn = load_bn_in_repo("S1")
+    model = _make_LLP(bn, 2, SolverConfig())
+    ctrl = Control({bn.controllable_vars[0]: 1})
+    model.fix_control(ctrl)
+    assert model.optimize()
+    values = [
+        (name, var.value)
+        for name, var in model.get_name_map().items()
+        if var.value is not None
+    ]
+    write_solution_file(f"{tmp_path}/model.sol", TerminationCondition.optimal, values)
+    assert read_solution_file(f"{tmp_path}/model.sol")[0] == TerminationCondition.optimal
+
+    # the solution is read by another model of the same network
+    other = _make_LLP(bn, 2, SolverConfig())
+    assert other.load_solution(f"{tmp_path}/model.sol") == TerminationCondition.optimal
+    assert other.get_control() == model.get_control()
+    assert other.get_attractor().get_first_state() == model.get_attractor().get_first_state()
+
+    separation = TrapSpaceDetectionIP("0", bn, SolverConfig())
+    separation.fix_phenotype(0)
+    assert separation.optimize()
+    values = [
+        (name, var.value)
+        for name, var in separation.get_name_map().items()
+        if var.value is not None
+    ]
+    write_solution_file(f"{tmp_path}/separation.sol", TerminationCondition.optimal, values)
+    other = TrapSpaceDetectionIP("0", bn, SolverConfig())
+    other.load_solution(f"{tmp_path}/separation.sol")
+    assert other.get_trap_space() == separation.get_trap_space()
+
+
+def test_external_solver():
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for solver_name in ["gurobi_persistent", "external:highs"]:
+        _solver_config = SolverConfig(solver_name=solver_name, threads=1)
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            2,
+            1,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
+
+
+def test_keepfiles(tmp_path, caplog):
+    bn = load_bn_in_repo("S1")
+    model = _make_LLP(bn, 1, SolverConfig(solver_name="external:highs"))
+    model.solver.workdir = str(tmp_path)
+    model.solver.keepfiles = True
+    model.fix_control(Control(dict()))
+    with caplog.at_level("INFO", logger="optboolnet.external"):
+        model.optimize()
+    assert model.solver.keepfiles_dir in caplog.text
+    assert os.path.exists(f"{model.solver.keepfiles_dir}/model.mps")
+
+
+def test_time_limit_of_external_solver(tmp_path):
+    bn = load_bn_in_repo("S1")
+    model = _make_LLP(bn, 6, SolverConfig(solver_name="external:highs"))
+    model.update_options_time_limit(1e-3)
+    model.fix_control(Control(dict()))
+    assert not model.optimize()
+    assert model.is_time_limit_reached()
+
+    # an incumbent found before the time limit does not hide the status
+    values = [(name, 0.0) for name in model.get_name_map()]
+    write_solution_file(f"{tmp_path}/incumbent.sol", TerminationCondition.maxTimeLimit, values)
+    model.solver.command = [
+        sys.executable,
+        "-c",
+        "import shutil, sys; shutil.copy(sys.argv[1], sys.argv[2])",
+        f"{tmp_path}/incumbent.sol",
+        "{solution}",
+    ]
+    assert not model.optimize()
+    assert model.is_time_limit_reached()
+    assert model.has_incumbent()
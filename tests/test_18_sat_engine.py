@@ -0,0 +1,127 @@
+import pytest
+import random
+from optboolnet import Control
+from optboolnet.algorithm import BendersAttractorControl, _make_LLP
+from optboolnet.config import SolverConfig
+from optboolnet.exception import InvalidConfigError
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.model import ExtendedAttractorDetectionIP
+
+pytest.importorskip("pysat")
+from optboolnet.sat import SATAttractorDetection
+
+_solver_config = SolverConfig(threads=1)
+
+
+def _update(bn, ctrl, state):
+    values = dict(zip(bn.keys(), state))
+    return [
+        ctrl[i]
+        if i in ctrl
+        else int(
+            all(
+                any(values[i_] == 1 for i_ in clause.pos_literals)
+                or any(values[i_] == 0 for i_ in clause.neg_literals)
+                for clause in bn.items_clause(i)
+            )
+        )
+        for i in bn.keys()
+    ]
+
+
+@pytest.mark.parametrize("length", [1, 2, 3])
+def test_sat_LLP(length):
+    random.seed(0)
+    bn = load_bn_in_repo("M1")
+    mip = ExtendedAttractorDetectionIP(f"{length}", bn, length, _solver_config)
+    _make_LLP(mip)
+    sat = SATAttractorDetection(f"{length}", bn, length, _solver_config)
+    J = bn.controllable_vars
+    for _ in range(20):
+        ctrl = Control(
+            {j: random.randint(0, 1) for j in random.sample(J, random.randint(0, 3))}
+        )
+        mip.fix_control(ctrl)
+        sat.fix_control(ctrl)
+        assert mip.optimize() == sat.optimize()
+        if sat.results:
+            assert mip.is_phenotype_violated() == sat.is_phenotype_violated()
+            # the attractor is a cycle of the controlled network
+            state_seq = sat.get_attractor().value_list
+            for state, next_state in zip(state_seq, state_seq[1:] + state_seq[:1]):
+                assert next_state == _update(bn, ctrl, state)
+
+
+@pytest.mark.parametrize("LLP_engine", ["sat", "sat:minisat22"])
+def test_sat_engine(LLP_engine):
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for engine in ["mip", LLP_engine]:
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            2,
+            3,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            LLP_engine=engine,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
+
+    with pytest.raises(InvalidConfigError):
+        list(BendersAttractorControl("test", bn).iter_exhaustive_search(1, 1, LLP_engine="cp"))
+
+
+def test_strengthen():
+    random.seed(1)
+    bn = load_bn_in_repo("M1")
+    sat = SATAttractorDetection("2", bn, 2, _solver_config)
+    J = bn.controllable_vars
+    count = 0
+    for _ in range(50):
+        ctrl = Control(
+            {j: random.randint(0, 1) for j in random.sample(J, random.randint(0, 3))}
+        )
+        sat.fix_control(ctrl)
+        if not (sat.optimize() and sat.is_phenotype_violated()):
+            continue
+        attr = sat.get_attractor()
+        new_attr = sat.strengthen(attr)
+        if new_attr is None:
+            continue
+        count += 1
+        _idx = list(bn.keys()).index(bn.phenotype)
+        assert any(state[_idx] == 0 for state in new_attr.value_list)
+        # the controls that keep the attractor also keep the new one
+        for k, alpha_j, beta_j, _k, _alpha_j, _beta_j in zip(
+            attr.get_first_state(),
+            attr.alpha,
+            attr.beta,
+            new_attr.get_first_state(),
+            new_attr.alpha,
+            new_attr.beta,
+        ):
+            if alpha_j:
+                assert _alpha_j and _k == k
+            if beta_j:
+                assert _beta_j
+            assert _beta_j or _alpha_j
+        assert sum(new_attr.alpha) + sum(new_attr.beta) > sum(attr.alpha) + sum(attr.beta)
+    assert count > 0
+
+    results = list()
+    for strengthen_attractor_cuts in [False, True]:
+        alg = BendersAttractorControl("test", load_bn_in_repo("S1"))
+        controls = alg.iter_exhaustive_search(
+            2,
+            3,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            strengthen_attractor_cuts=strengthen_attractor_cuts,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
@@ -0,0 +1,83 @@
+import pytest
+from optboolnet.algorithm import BendersAttractorControl
+from optboolnet.config import LoggingConfig, SolverConfig
+from optboolnet.exception import InvalidConfigError
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.schedule import AdaptiveLengthScheduler, covered_periods, schedule_lengths
+
+_solver_config = SolverConfig(threads=1)
+
+
+@pytest.mark.parametrize("max_length", [1, 2, 5, 15])
+def test_schedule_lengths(max_length):
+    lengths = schedule_lengths(max_length, "divisor")
+    assert len(lengths) == max_length - max_length // 2
+    assert set().union(*(covered_periods(length) for length in lengths)) == set(
+        range(1, max_length + 1)
+    )
+    assert schedule_lengths(15, "divisor")[0] == 12
+    assert schedule_lengths(max_length) == list(range(1, max_length + 1))
+    with pytest.raises(ValueError):
+        schedule_lengths(max_length, "prime")
+
+
+@pytest.mark.parametrize("inst", ["S1", "S2", "S3", "S4"])
+def test_divisor_schedule(inst):
+    bn = load_bn_in_repo(inst)
+    results = list()
+    for schedule in ["all", "divisor"]:
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            2,
+            4,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            LLP_length_schedule=schedule,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert [model.length for model in alg.model_LLP_list] == [4, 3]
+    assert results[0] == results[1]
+
+    with pytest.raises(InvalidConfigError):
+        list(
+            BendersAttractorControl("test", bn).iter_exhaustive_search(
+                1, 1, LLP_length_schedule="prime"
+            )
+        )
+
+
+def test_adaptive_order(tmp_path):
+    scheduler = AdaptiveLengthScheduler([1, 2, 3])
+    assert scheduler.order([1, 2, 3]) == [1, 2, 3]
+    for _ in range(4):
+        scheduler.record(1, 0.1, False)
+        scheduler.record(2, 0.1, True)
+        scheduler.record(3, 0.01, False)
+    assert scheduler.order([1, 2, 3]) == [3, 2, 1]
+
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for adaptive_LLP_order in [False, True]:
+        alg = BendersAttractorControl(
+            "test", bn, LoggingConfig(fpath=str(tmp_path), fname="test")
+        )
+        controls = alg.iter_exhaustive_search(
+            2,
+            4,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            adaptive_LLP_order=adaptive_LLP_order,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
+    records = alg.length_scheduler.to_records()
+    assert sorted(record["length"] for record in records) == [1, 2, 3, 4]
+    assert sum(record["hits"] for record in records) > 0
+    with open(tmp_path / "length_stats_test.csv", "r") as _f:
+        lines = _f.read().splitlines()
+    assert lines[0].startswith("length,attempts,hits")
+    assert len(lines) == 5
@@ -0,0 +1,56 @@
+import pytest
+from optboolnet import Control
+from optboolnet.algorithm import BendersAttractorControl
+from optboolnet.config import SolverConfig
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.model import MasterControlIP
+
+_solver_config = SolverConfig(threads=1)
+
+
+def test_cut_pool():
+    bn = load_bn_in_repo("S1")
+    model = MasterControlIP("0", bn, _solver_config)
+    model.set_cut_pool(1)
+    j0, j1 = bn.controllable_vars[:2]
+    model.set_constr_target_size(1)
+    # the candidates other than j0=1 and j1=1
+    model.append_no_good_cut_d(Control({j0: 1}))
+    model.append_no_good_cut_d(Control({j1: 1}))
+    assert model.optimize()
+    # the cuts slack at the candidate are removed
+    assert len(model.cut_pool.inactive) == 2
+    assert all(not constr.active for _, constr in model.constrs_benders.items())
+
+    # the removed cuts are added back if violated
+    candidates = list()
+    while model.optimize():
+        ctrl = model.get_control()
+        assert ctrl not in candidates + [Control({j0: 1}), Control({j1: 1})]
+        candidates.append(ctrl)
+        model.append_no_good_cut_d(ctrl)
+    assert len(candidates) == 2 * len(bn.controllable_vars) - 2
+    assert model.cut_pool.num_reactivated > 0
+
+    model.set_cut_pool(0)
+    assert all(constr.active for _, constr in model.constrs_benders.items())
+
+
+@pytest.mark.parametrize("cut_pool_max_age", [1, 5])
+def test_cut_pool_search(cut_pool_max_age):
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for _cut_pool_max_age in [0, cut_pool_max_age]:
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            3,
+            2,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            cut_pool_max_age=_cut_pool_max_age,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
+    assert alg.model_master.cut_pool.num_purged > 0
@@ -0,0 +1,75 @@
+import pytest
+import random
+from optboolnet import Control
+from optboolnet.algorithm import BendersAttractorControl, _make_LLP
+from optboolnet.boolnet import CNFBooleanNetwork
+from optboolnet.config import ControlConfig, SolverConfig
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.model import ExtendedAttractorDetectionIP
+
+_solver_config = SolverConfig(threads=1)
+
+
+def test_percolate():
+    config = ControlConfig()
+    config.controllable_vars = ["a", "b", "c", "d"]
+    config.uncontrollable_vars = ["p"]
+    config.fixed_values = dict()
+    config.phenotype = "p"
+    bn = CNFBooleanNetwork(
+        "a, a\nb, !a\nc, (b | d) & !a\nd, d\np, c", config
+    )
+    assert bn.percolate() == {}
+    assert bn.percolate(Control({"a": 0})) == {"a": 0, "b": 1, "c": 1, "p": 1}
+    assert bn.percolate(Control({"a": 1})) == {"a": 1, "b": 0, "c": 0, "p": 0}
+    assert bn.percolate(Control({"d": 1})) == {"d": 1}
+
+
+def test_percolate_LLP():
+    random.seed(0)
+    bn = load_bn_in_repo("M1")
+    model = ExtendedAttractorDetectionIP("3", bn, 3, _solver_config)
+    _make_LLP(model)
+    J = bn.controllable_vars
+    for _ in range(20):
+        ctrl = Control(
+            {j: random.randint(0, 1) for j in random.sample(J, random.randint(0, 3))}
+        )
+        model.fix_control(ctrl)
+        model.fix_percolated_values(dict())
+        result = model.optimize()
+        is_violated = result and model.is_phenotype_violated()
+        # every attractor is in the trap space
+        trap_space = bn.percolate(ctrl)
+        if result:
+            attr = model.get_attractor()
+            for state in attr.value_list:
+                values = dict(zip(bn.keys(), state))
+                assert all(values[i] == value for i, value in trap_space.items())
+        if trap_space.get(bn.phenotype, None) == 1:
+            assert not is_violated
+        model.fix_percolated_values(
+            {i: value for i, value in trap_space.items() if i not in ctrl}
+        )
+        assert model.optimize() == result
+        assert (result and model.is_phenotype_violated()) == is_violated
+
+
+@pytest.mark.parametrize("LLP_engine", ["mip", "sat"])
+def test_percolation_search(LLP_engine):
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for use_percolation in [False, True]:
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            2,
+            2,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            use_percolation=use_percolation,
+            LLP_engine=LLP_engine,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
@@ -0,0 +1,57 @@
+import pytest
+import random
+from optboolnet import Control
+from optboolnet.algorithm import BendersAttractorControl, _make_LLP
+from optboolnet.config import SolverConfig
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.model import ExtendedAttractorDetectionIP, ReducedAttractorDetectionIP
+
+_solver_config = SolverConfig(threads=1)
+
+
+@pytest.mark.parametrize("formulation", ["standard", "compact"])
+def test_reduced_LLP(formulation):
+    random.seed(0)
+    bn = load_bn_in_repo("M1")
+    model = ExtendedAttractorDetectionIP("3", bn, 3, _solver_config, formulation=formulation)
+    reduced = ReducedAttractorDetectionIP("3", bn, 3, _solver_config, formulation=formulation)
+    _make_LLP(model)
+    _make_LLP(reduced)
+    size, reduced_size = model.get_model_size(), reduced.get_model_size()
+    assert reduced_size["cols"] < size["cols"]
+    assert reduced_size["nnz"] < size["nnz"]
+    J = bn.controllable_vars
+    for _ in range(20):
+        ctrl = Control(
+            {j: random.randint(0, 1) for j in random.sample(J, random.randint(0, 3))}
+        )
+        model.fix_control(ctrl)
+        reduced.fix_control(ctrl)
+        assert reduced.get_control() == ctrl
+        result = model.optimize()
+        assert reduced.optimize() == result
+        if result:
+            assert reduced.is_phenotype_violated() == model.is_phenotype_violated()
+            attr = reduced.get_attractor()
+            for state in attr.value_list:
+                values = dict(zip(bn.keys(), state))
+                assert all(values[j] == value for j, value in ctrl.items())
+
+
+def test_reduced_LLP_search():
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for reduced_LLP in [False, True]:
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            2,
+            2,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            reduced_LLP=reduced_LLP,
+            use_percolation=reduced_LLP,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+    assert results[0] == results[1]
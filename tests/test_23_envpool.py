@@ -0,0 +1,40 @@
+from optboolnet import Control
+from optboolnet.algorithm import _make_LLP
+from optboolnet.config import SolverConfig
+from optboolnet.envpool import close_solver_environments
+from optboolnet.instances import load_bn_in_repo
+from optboolnet.model import ExtendedAttractorDetectionIP, MasterControlIP
+
+_solver_config = SolverConfig(threads=1)
+
+
+def test_shared_environment():
+    bn = load_bn_in_repo("S1")
+    master = MasterControlIP("0", bn, _solver_config)
+    LLP_list = [
+        ExtendedAttractorDetectionIP(f"{length}", bn, length, _solver_config)
+        for length in range(1, 4)
+    ]
+    for model in LLP_list:
+        _make_LLP(model)
+
+    # closing a model keeps the environment of the others
+    LLP_list[0].close()
+    LLP_list[1].fix_control(Control(dict()))
+    assert LLP_list[1].optimize()
+    assert master.optimize()
+
+    # a new environment is started after the environment is closed
+    for model in [master] + LLP_list[1:]:
+        model.close()
+    close_solver_environments()
+    model = ExtendedAttractorDetectionIP("1", bn, 1, _solver_config)
+    _make_LLP(model)
+    model.fix_control(Control(dict()))
+    assert model.optimize()
+
+
+def test_non_gurobi_solver():
+    bn = load_bn_in_repo("S1")
+    model = MasterControlIP("0", bn, SolverConfig(solver_name="external:highs"))
+    model.close()
@@ -0,0 +1,60 @@
+import pytest
+from optboolnet.algorithm import BendersAttractorControl
+from optboolnet.budget import ThreadBudgetScheduler
+from optboolnet.config import SolverConfig
+from optboolnet.instances import load_bn_in_repo
+
+_solver_config = SolverConfig(threads=1)
+
+
+def test_thread_budget_scheduler():
+    scheduler = ThreadBudgetScheduler(8, num_workers=2)
+    assert scheduler.worker_threads == 4
+
+    # a small model is solved by a single thread until it becomes slow
+    threads = scheduler.acquire("master", 100)
+    assert threads == 1
+    scheduler.release("master", threads, 0.01)
+    assert scheduler.acquire("master") == 1
+    scheduler.release("master", 1, 0.3)
+    assert scheduler.acquire("master") == 2
+    scheduler.release("master", 2, 0.3)
+
+    # a large model gets more threads as its solve time grows
+    threads = scheduler.acquire("LLP_8", 100000)
+    assert threads == 2
+    scheduler.release("LLP_8", threads, 0.01)
+    assert scheduler.acquire("LLP_8") == 1
+    scheduler.release("LLP_8", 1, 1.0)
+    assert scheduler.acquire("LLP_8") == 4  # up to the budget of a worker
+    scheduler.release("LLP_8", 4, 1.0)
+    assert scheduler.in_use == 0
+
+    # the concurrent solves share the total budget
+    assert [scheduler.acquire("LLP_8") for _ in range(3)] == [4, 4, 1]
+    assert scheduler.in_use == 9
+
+    with pytest.raises(ValueError):
+        ThreadBudgetScheduler(0)
+
+
+def test_thread_budget_search():
+    bn = load_bn_in_repo("S1")
+    results = list()
+    for thread_budget in [0, 2]:
+        alg = BendersAttractorControl("test", bn)
+        controls = alg.iter_exhaustive_search(
+            2,
+            2,
+            master_solver_config=_solver_config,
+            LLP_solver_config=_solver_config,
+            separation_solver_config=_solver_config,
+            total_time_limit=None,
+            solve_separation=True,
+            thread_budget=thread_budget,
+        )
+        results.append(sorted(sorted(ctrl.items()) for ctrl in controls))
+        if thread_budget > 0:
+            assert alg.thread_scheduler.in_use == 0
+            assert "master" in alg.thread_scheduler.solve_times
+    assert results[0] == results[1]
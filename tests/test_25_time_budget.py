@@ -0,0 +1,94 @@
+import time
+import pytest
+from optboolnet.algorithm import BendersAttractorControl
+from optboolnet.budget import TimeBudget
+from optboolnet.config import SolverConfig
+from optboolnet.exception import InvalidConfigError
+from optboolnet.instances import load_bn_in_repo
+
+_solver_config = SolverConfig(threads=1)
+
+
+def test_time_budget():
+    budget = TimeBudget(0.5, growth=2.0, max_retries=3)
+    assert budget.time_limit("master") is None
+    assert budget.time_limit("LLP") == 0.5
+    budget.attempt = 2
+    assert budget.time_limit("LLP") == 2.0
+
+    # the remaining time is shared equally by the remaining target sizes
+    budget.start_target_size(1, 4, 40.0)
+    assert budget.attempt == 0
+    assert budget.size_deadline == pytest.approx(time.time() + 10.0, abs=1.0)
+    assert budget.can_retry
+    # every phase stops at the deadline of the target size
+    assert budget.time_limit("master") == pytest.approx(10.0, abs=1.0)
+    assert budget.time_limit("LLP") == 0.5
+    budget.start_target_size(4, 4, 0.0)
+    assert not budget.can_retry
+    budget.start_target_size(0, 4, None)
+    assert budget.can_retry
+
+    assert TimeBudget().time_limit("LLP") is None
+    with pytest.raises(ValueError):
+        TimeBudget(1.0, growth=0.5)
+
+
+class _SlowLLPControl(BendersAttractorControl):
+    """The lower level problems of target size 1 take a long time"""
+
+    def is_LLP_violated(self, ctrl):
+        if self.target_size == 1:
+            time.sleep(0.2)
+        return super().is_LLP_violated(ctrl)
+
+
+def _search(bn, max_control_size=2, cls=BendersAttractorControl, **kwargs):
+    alg = cls("test", bn)
+    controls = alg.iter_exhaustive_search(
+        max_control_size,
+        2,
+        master_solver_config=_solver_config,
+        LLP_solver_config=_solver_config,
+        separation_solver_config=_solver_config,
+        **{"total_time_limit": None, **kwargs},
+    )
+    return alg, sorted(sorted(ctrl.items()) for ctrl in controls)
+
+
+def test_unknown_controls():
+    bn = load_bn_in_repo("S1")
+    _, expected = _search(bn)
+
+    # the candidates whose lower level problems time out are not accepted
+    alg, controls = _search(bn, 1, LLP_time_limit=1e-5, LLP_max_retries=0)
+    assert all(ctrl in expected for ctrl in controls)
+    assert sum(len(unknown) for unknown in alg.unknown_dict.values()) > 0
+
+    # and they are verified by the retries with more time
+    alg, controls = _search(
+        bn, LLP_time_limit=1e-5, LLP_time_limit_growth=1e5, LLP_max_retries=2
+    )
+    assert controls == expected
+    assert alg.unknown_dict == dict()
+
+    # the controls that contain an unknown candidate are not proven to be minimal
+    alg, controls = _search(
+        bn, LLP_time_limit=1e-5, LLP_max_retries=0, use_percolation=True
+    )
+    assert all(ctrl in expected for ctrl in controls)
+    for _conditional_list in alg.conditional_dict.values():
+        assert all(alg.contains_unknown(ctrl) for ctrl in _conditional_list)
+
+    with pytest.raises(InvalidConfigError):
+        _search(bn, LLP_time_limit=1.0, LLP_max_retries=-1)
+
+
+def test_size_deadline():
+    bn = load_bn_in_repo("S1")
+    # a hard target size stops at its deadline and leaves the time to the next one
+    alg, controls = _search(bn, cls=_SlowLLPControl, total_time_limit=3.0)
+    assert alg.incomplete_target_sizes == [1]
+    assert 2 in alg.solution_dict
+    assert all(len(ctrl) == 1 for ctrl in controls)
+    assert len(alg.conditional_dict.get(2, list())) > 0